@@ -7,18 +7,21 @@ import argparse
 import subprocess
 from pathlib import Path
 
-from utils import _get_audio_duration, limitar_srt_10_palavras
-from video_maker.video_utils import mixar_audio_com_musica
+from utils import _get_audio_duration, ajustar_legenda_srt, limitar_srt_10_palavras
+from video_maker.audio_pipeline import LUFS_PADRAO, MARGEM_CORTE, processar_audio
+from video_maker.silencio import decodificar_pcm, detectar_silencios_pcm
+from video_maker.trilha_cache import obter_trilha
 
 sys.path.append(str(Path(__file__).parent))
 
 try:
     from read_config import carregar_config_canal
     from providers import create_tts_provider
+    from providers.base_audio import PedidoTTS
+    from providers.tts_chunked import sintetizar_em_trechos
     from crud.roteiro_manager import RoteiroManager    
     from crud.canal_manager import CanalManager
-    # ✅ NOVA IMPORTAÇÃO
-    from utils import otimizar_audio_e_legenda, vertical_horizontal
+    from utils import vertical_horizontal
 except ImportError as e:
     print(f"❌ Erro de importação: {e}")
     sys.exit(1)
@@ -28,7 +31,8 @@ class AudioSystem:
         self.roteiro_manager = RoteiroManager()        
         self.canal_manager = CanalManager()
 
-    def generate_audio(self, roteiro_id: int, provider: str = None) -> bool:        
+    def _preparar_audio(self, roteiro_id: int, provider: str = None):
+        """Carrega roteiro, canal e texto; None se faltar algo para gerar o áudio"""
         print(f"🎵 Gerando áudio para roteiro ID: {roteiro_id}")
         
         roteiro = self.roteiro_manager.buscar_por_id(roteiro_id)
@@ -40,7 +44,7 @@ class AudioSystem:
         canal = self.canal_manager.buscar_por_id(roteiro.canal_id)
         if not canal:
             print(f"❌ Canal com ID {roteiro.canal_id} não encontrado")
-            return False
+            return None
         
         config = carregar_config_canal(canal.config_path)
         provider = provider or config.get('TTS_PROVIDER', 'edge')
@@ -52,7 +56,7 @@ class AudioSystem:
         
         if not arquivo_json.exists():
             print(f"❌ Arquivo não encontrado: {arquivo_json}")
-            return False
+            return None
         
         if arquivo_json.exists():
             with open(arquivo_json, 'r', encoding='utf-8') as f:
@@ -67,7 +71,7 @@ class AudioSystem:
         
         if not text or len(text.strip()) < 10:
             print("❌ Texto muito curto ou vazio")
-            return False
+            return None
         
         # Gera áudio
         audio_file = pasta_video / f"{roteiro.id_video}.mp3"
@@ -77,24 +81,134 @@ class AudioSystem:
         resolucao = data.get('resolucao', config.get('RESOLUCAO', '1920x1080'))
         is_short = (vertical_horizontal(resolucao) == "vertical")
 
+        return {
+            'roteiro': roteiro, 'config': config, 'provider': provider, 'data': data,
+            'text': text, 'audio_file': audio_file, 'pasta_video': pasta_video,
+            'arquivo_json': arquivo_json, 'is_short': is_short,
+        }
+
+    def generate_audio(self, roteiro_id: int, provider: str = None) -> bool:        
+        job = self._preparar_audio(roteiro_id, provider)
+        if not job:
+            return False
+        provider, config, is_short = job['provider'], job['config'], job['is_short']
+
         tts = create_tts_provider(provider)
-        if provider == "gemini":
-            success = tts.sintetizar(text, audio_file, config)
+
+        def sintetizar(texto, caminho):
+            return tts.sintetizar(texto, Path(caminho), config, is_short)
+
+        # ✅ Texto longo: trechos por frase sintetizados em paralelo e juntados (áudio + SRT)
+        if config.get('TTS_EM_TRECHOS', True):
+            success = sintetizar_em_trechos(sintetizar, job['text'], job['audio_file'], config,
+                                            provider=provider, is_short=is_short)
         else:
-            success = tts.sintetizar(text, audio_file, config, is_short)
-        
+            success = sintetizar(job['text'], job['audio_file'])
+
+        return self._processar_apos_tts(job, success)
+
+    def generate_audio_many(self, roteiro_ids, provider: str = None) -> dict:
+        """
+        Áudio de vários roteiros: o TTS de todos roda concorrente num único event loop
+        (sintetizar_lote), depois cada um segue o pós-processamento de sempre.
+
+        Returns:
+            dict: {roteiro_id: sucesso}
+        """
+        resultados = {roteiro_id: False for roteiro_id in roteiro_ids}
+        grupos = {}
+        for roteiro_id in roteiro_ids:
+            try:
+                job = self._preparar_audio(roteiro_id, provider)
+            except Exception as e:
+                print(f"❌ Roteiro {roteiro_id} não pôde ser preparado: {e}")
+                continue
+            if job:
+                grupos.setdefault(job['provider'], []).append((roteiro_id, job))
+
+        for nome, jobs in grupos.items():
+            try:
+                tts = create_tts_provider(nome)
+            except Exception as e:
+                print(f"❌ TTS '{nome}' indisponível para {len(jobs)} roteiros: {e}")
+                continue
+            pedidos = [PedidoTTS(job['text'], job['audio_file'], job['is_short'], job['config'])
+                       for _, job in jobs]
+            print(f"🔊 TTS em lote: {len(pedidos)} roteiros ({nome})")
+            sucessos = tts.sintetizar_lote(pedidos, jobs[0][1]['config'])
+            for (roteiro_id, job), success in zip(jobs, sucessos):
+                try:
+                    resultados[roteiro_id] = self._processar_apos_tts(job, success)
+                except Exception as e:
+                    print(f"❌ Pós-processamento do roteiro {roteiro_id} falhou: {e}")
+        return resultados
+
+    def _processar_apos_tts(self, job: dict, success: bool) -> bool:
+        """Cortes, música, legenda e banco depois do TTS"""
+        roteiro, config, provider, data = job['roteiro'], job['config'], job['provider'], job['data']
+        audio_file, pasta_video, arquivo_json = job['audio_file'], job['pasta_video'], job['arquivo_json']
+        is_short = job['is_short']
+
         srt_file = None
         if provider == "edge" and config.get('EDGE_TTS_LEGENDAS', False):
             srt_file = Path(audio_file).with_suffix('.srt')
         
+        # ✅ Cortes (short), música e loudness num único ffmpeg a partir do áudio cru do TTS
+        cortes, pcm = [], None
+        margem = float(config.get('SILENCIO_MARGEM', MARGEM_CORTE))
         if success and audio_file.exists() and is_short:
             print("🎵 Otimizando áudio para short (cortando pausas longas)...")
-            audio_otimizado, srt_ajustado = otimizar_audio_e_legenda(str(audio_file), str(srt_file) if srt_file else None)
-                        # Usa o áudio otimizado se foi criado
-            if audio_otimizado != str(audio_file):
-                audio_file = Path(audio_otimizado)
-                if srt_ajustado:
-                    srt_file = Path(srt_ajustado)
+            # decodifica uma vez: o mesmo PCM serve para detectar e para cortar
+            pcm = decodificar_pcm(audio_file, audio_file.with_suffix('.pcm'))
+            cortes = detectar_silencios_pcm(
+                pcm,
+                limiar_db=float(config.get('SILENCIO_LIMIAR_DB', -40)),
+                minimo=float(config.get('SILENCIO_MINIMO', 0.5))
+            )
+            print(f"✂️  {len(cortes)} pausas longas para cortar" if cortes else "ℹ️  Nenhuma pausa longa encontrada para cortar")
+        elif success and audio_file.exists():
+            print("ℹ️  Otimização de áudio skipped (não é short)")
+
+        musica_path = config.get('MUSICA_SHORT') if is_short else config.get('MUSICA_LONG')
+        tem_musica = bool(musica_path and Path(musica_path).exists())
+        if not tem_musica:
+            print("ℹ️  Nenhuma música configurada ou arquivo não encontrado")
+        if pcm and not (cortes or tem_musica):
+            # sem corte nem mixagem o PCM não é lido de novo (com música ele vira a entrada)
+            pcm.apagar()
+            pcm = None
+
+        arquivo_mixado = audio_file
+        if success and audio_file.exists() and (cortes or tem_musica):
+            voz_cortada = audio_file.with_name(f"{audio_file.stem}_otimizado{audio_file.suffix}") if cortes else None
+            mixado = pasta_video / f"{roteiro.id_video}_com_musica.mp3" if tem_musica else None
+            print("🎵 Processando áudio (cortes + música + loudness) em um passo...")
+            try:
+                # trilha do canal decodificada uma vez e reaproveitada entre roteiros
+                trilha_lufs = config.get('TRILHA_LUFS')
+                trilha = obter_trilha(
+                    musica_path, ganho_db=-25,
+                    lufs_alvo=float(trilha_lufs) if trilha_lufs is not None else None
+                ) if tem_musica else None
+                processar_audio(
+                    audio_file, cortes=cortes, saida_voz=voz_cortada, saida_mix=mixado,
+                    trilha=trilha, lufs=float(config.get('AUDIO_LUFS', LUFS_PADRAO)),
+                    margem=margem, pcm=pcm
+                )
+            finally:
+                if pcm:
+                    pcm.apagar()
+
+            if voz_cortada:
+                audio_file = voz_cortada
+                if srt_file and srt_file.exists():
+                    # mesmo mapa de tempo dos cortes aplicados ao áudio
+                    srt_temp = srt_file.with_name(f"{srt_file.stem}_temp{srt_file.suffix}")
+                    ajustar_legenda_srt(srt_file, srt_temp, cortes, margem)
+                    srt_temp.replace(srt_file)
+                    print(f"✅ Legenda SRT ajustada aos cortes: {srt_file}")
+            arquivo_mixado = mixado or audio_file
+            print(f"✅ Áudio processado: {arquivo_mixado}")
 
         if srt_file and srt_file.exists():
             print("📝 Limitando SRT a 10 palavras por legenda...")
@@ -103,36 +217,6 @@ class AudioSystem:
                 srt_file = Path(srt_limitado)
                 print(f"✅ SRT limitado a 10 palavras: {srt_file}")
 
-        elif success and audio_file.exists() and not is_short:
-            print("ℹ️  Otimização de áudio skipped (não é short)")
-        
-        # ✅ CORRIGIDO: Mixar com música de fundo com nome correto
-        arquivo_mixado = pasta_video / f"{roteiro.id_video}_com_musica.mp3"
-        if is_short:
-            musica_path = config.get('MUSICA_SHORT')
-        else:
-            musica_path = config.get('MUSICA_LONG')
-        
-        if musica_path and Path(musica_path).exists():
-            print("🎵 Mixando áudio com música...")
-            
-            # Se já existe um arquivo mixado, remove antes de criar novo
-            if arquivo_mixado.exists():
-                arquivo_mixado.unlink()
-                
-            # Chama a função de mixagem
-            mixado_temp = mixar_audio_com_musica(audio_file, musica_path, ganho_musica=-25)
-            
-            # ✅ CORREÇÃO: Renomeia para o nome padrão se necessário
-            if mixado_temp != str(arquivo_mixado):
-                Path(mixado_temp).rename(arquivo_mixado)
-                print(f"✅ Áudio mixado renomeado para: {arquivo_mixado}")
-            else:
-                print(f"✅ Áudio mixado: {arquivo_mixado}")
-        else:
-            print("ℹ️  Nenhuma música configurada ou arquivo não encontrado")
-            arquivo_mixado = audio_file
-
         if success and audio_file.exists():
             self._update_apos_audio_sucesso(roteiro, data, str(audio_file), str(arquivo_mixado), provider, config, arquivo_json, srt_file, is_short)
             print(f"✅ Áudio gerado{' e otimizado' if is_short else ''}: {audio_file}")
@@ -21,7 +21,10 @@ celery_app.conf.update(
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600,
-    worker_pool='solo',
+    # cada render usa sua própria pasta de trabalho (render_context), então dá para
+    # rodar mais de um por máquina: CELERY_POOL=threads/prefork + CELERY_CONCURRENCY
+    worker_pool=os.getenv('CELERY_POOL', 'solo'),
+    worker_concurrency=int(os.getenv('CELERY_CONCURRENCY', '1')),
     broker_connection_retry_on_startup=True,
 )
 
@@ -9,4 +9,6 @@ sys.path.append(str(Path(__file__).parent))
 
 if __name__ == '__main__':
     # Use o comando do sistema para iniciar o Celery corretamente
-    os.system('celery -A tasks worker --loglevel=info --pool=solo')
\ No newline at end of file
+    pool = os.getenv('CELERY_POOL', 'solo')
+    concorrencia = os.getenv('CELERY_CONCURRENCY', '1')
+    os.system(f'celery -A tasks worker --loglevel=info --pool={pool} --concurrency={concorrencia}')
\ No newline at end of file
@@ -1,21 +1,98 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+CONCORRENCIA_LOTE = 4       # sínteses simultâneas no lote
+CONCORRENCIA_POR_VOZ = 2    # sínteses simultâneas da mesma voz
+INTERVALO_VOZ = 0.5         # segundos mínimos entre dois inícios com a mesma voz
+
+
+@dataclass
+class PedidoTTS:
+    """Um áudio do lote (config None = config do lote)"""
+    texto: str
+    output_path: Path
+    is_short: bool = False
+    config: Optional[Dict[str, Any]] = None
+
 
 class TTSProvider(ABC):
     """Interface base para provedores de TTS"""
-    
+
     @abstractmethod
     def sintetizar(self, texto: str, output_path: Path, config: Dict[str, Any],  is_short = bool) -> bool:
         """
         Sintetiza texto em áudio
-        
+
         Args:
             texto: Texto para sintetizar
             output_path: Caminho onde salvar o arquivo de áudio
             config: Configurações do canal
-            
+
         Returns:
             True se bem-sucedido, False caso contrário
         """
-        pass
\ No newline at end of file
+        pass
+
+    def voz(self, config: Dict[str, Any]) -> str:
+        """Identifica a voz usada com esta config (chave do limite por voz)"""
+        return type(self).__name__
+
+    async def sintetizar_async(self, texto: str, output_path: Path, config: Dict[str, Any],
+                               is_short: bool = False) -> bool:
+        """Versão assíncrona; o padrão roda o sintetizar síncrono numa thread"""
+        return await asyncio.to_thread(self.sintetizar, texto, Path(output_path), config, is_short)
+
+    async def sintetizar_many(self, pedidos: List[PedidoTTS], config: Dict[str, Any],
+                              concorrencia: int = None, por_voz: int = None,
+                              intervalo_voz: float = None) -> List[bool]:
+        """
+        Sintetiza vários áudios concorrentes no mesmo event loop.
+
+        Args:
+            concorrencia: limite global de sínteses simultâneas (TTS_CONCORRENCIA)
+            por_voz: limite de sínteses simultâneas por voz (TTS_CONCORRENCIA_POR_VOZ)
+            intervalo_voz: intervalo mínimo entre inícios com a mesma voz (TTS_INTERVALO_VOZ)
+
+        Returns:
+            list[bool]: resultado de cada pedido, na ordem recebida
+        """
+        concorrencia = int(concorrencia or config.get('TTS_CONCORRENCIA', CONCORRENCIA_LOTE))
+        por_voz = int(por_voz or config.get('TTS_CONCORRENCIA_POR_VOZ', CONCORRENCIA_POR_VOZ))
+        if intervalo_voz is None:
+            intervalo_voz = float(config.get('TTS_INTERVALO_VOZ', INTERVALO_VOZ))
+
+        global_sem = asyncio.Semaphore(max(1, concorrencia))
+        vozes = {}  # voz -> (semáforo, lock do intervalo, [último início])
+
+        async def _um(pedido: PedidoTTS) -> bool:
+            cfg = pedido.config or config
+            voz = self.voz(cfg)
+            if voz not in vozes:
+                vozes[voz] = (asyncio.Semaphore(max(1, por_voz)), asyncio.Lock(), [0.0])
+            sem_voz, lock, ultimo = vozes[voz]
+
+            async with global_sem, sem_voz:
+                async with lock:
+                    espera = ultimo[0] + intervalo_voz - time.monotonic()
+                    if espera > 0:
+                        await asyncio.sleep(espera)
+                    ultimo[0] = time.monotonic()
+                try:
+                    return bool(await self.sintetizar_async(pedido.texto, Path(pedido.output_path),
+                                                            cfg, pedido.is_short))
+                except Exception as e:
+                    print(f"❌ TTS de {Path(pedido.output_path).name}: {e}")
+                    return False
+
+        resultados = await asyncio.gather(*(_um(p) for p in pedidos))
+        ok = sum(resultados)
+        print(f"🔊 TTS em lote: {ok}/{len(pedidos)} áudios gerados")
+        return list(resultados)
+
+    def sintetizar_lote(self, pedidos: List[PedidoTTS], config: Dict[str, Any], **kwargs) -> List[bool]:
+        """Wrapper síncrono de sintetizar_many (um único event loop para o lote)"""
+        return asyncio.run(self.sintetizar_many(pedidos, config, **kwargs))
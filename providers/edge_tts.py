@@ -10,9 +10,23 @@ from video_maker.video_utils import ajustar_timestamps_srt, analisar_gaps_srt
 class EdgeTTSProvider(TTSProvider):
     """Provedor Microsoft Edge TTS - Gratuito e com suporte a legendas SRT"""
     
+    def voz(self, config: Dict[str, Any]) -> str:
+        return config.get('EDGE_TTS_VOICE', 'pt-BR-AntonioNeural')
+
     def sintetizar(self, texto: str, output_path: Path, config: Dict[str, Any], is_short = bool) -> bool:
+        """Wrapper síncrono (chamadas avulsas); lotes usam sintetizar_lote/sintetizar_many"""
+        try:
+            return asyncio.run(self.sintetizar_async(texto, output_path, config, is_short))
+        except RuntimeError as e:
+            # já dentro de um event loop: quem está nele deve usar sintetizar_async
+            print(f"❌ Erro no Edge TTS: {e}")
+            return False
+
+    async def sintetizar_async(self, texto: str, output_path: Path, config: Dict[str, Any],
+                               is_short: bool = False) -> bool:
         try:
-            voice = config.get('EDGE_TTS_VOICE', 'pt-BR-AntonioNeural')
+            output_path = Path(output_path)
+            voice = self.voz(config)
 
             if is_short:
                 rate = config.get('EDGE_TTS_RATE', '0%')
@@ -22,26 +36,16 @@ class EdgeTTSProvider(TTSProvider):
             pitch = config.get('EDGE_TTS_PITCH', '0Hz')
             gerar_legendas = config.get('EDGE_TTS_LEGENDAS', True)
             ajustar_timestamps = config.get('EDGE_TTS_AJUSTAR_TIMESTAMPS', True)  # Nova configuração
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
 
             if gerar_legendas:
                 srt_path = output_path.with_suffix('.srt')
-                success = loop.run_until_complete(
-                    self._gerar_audio_e_legendas(texto, output_path, srt_path, voice, rate, pitch)
-                )
+                success = await self._gerar_audio_e_legendas(texto, output_path, srt_path, voice, rate, pitch)
                 
-                # Ajustar timestamps se configurado
+                # Ajustar timestamps se configurado (síncrono: fora do event loop)
                 if success and ajustar_timestamps:
-                    self._ajustar_legendas_apos_geracao(srt_path)
+                    await asyncio.to_thread(self._ajustar_legendas_apos_geracao, srt_path)
             else:
-                success = loop.run_until_complete(
-                    self._gerar_apenas_audio(texto, output_path, voice, rate, pitch)
-                )
-            
-            loop.close()
+                success = await self._gerar_apenas_audio(texto, output_path, voice, rate, pitch)
             
             if success:
                 print(f"✅ Áudio Edge TTS gerado: {output_path}")
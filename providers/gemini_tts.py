@@ -3,7 +3,6 @@ import os
 import sys
 import base64
 import wave
-import subprocess
 import shutil
 from pathlib import Path
 from typing import Dict, Any
@@ -15,6 +14,7 @@ except ImportError:
     print("❌ Biblioteca do Gemini não encontrada. Instale com: pip install google-genai")
 
 from .base_audio import TTSProvider
+from video_maker.ffmpeg_runner import executar_ffmpeg
 
 class GeminiTTSProvider(TTSProvider):
     """Provedor Google Gemini TTS"""
@@ -24,10 +24,13 @@ class GeminiTTSProvider(TTSProvider):
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY não encontrada")
     
-    def sintetizar(self, texto: str, output_path: Path, config: Dict[str, Any]) -> bool:
-        """Sintetiza áudio usando Gemini TTS"""
+    def voz(self, config: Dict[str, Any]) -> str:
+        return config.get('GEMINI_TTS_VOICE', 'Algenib')
+
+    def sintetizar(self, texto: str, output_path: Path, config: Dict[str, Any], is_short: bool = False) -> bool:
+        """Sintetiza áudio usando Gemini TTS (is_short não muda nada aqui)"""
         try:
-            voz = config.get('GEMINI_TTS_VOICE', 'Algenib')
+            voz = self.voz(config)
             modelo = config.get('GEMINI_TTS_MODEL', 'gemini-2.5-flash-preview-tts')
             
             client = genai.Client(api_key=self.api_key)
@@ -93,10 +96,10 @@ class GeminiTTSProvider(TTSProvider):
         if not shutil.which("ffmpeg"):
             raise RuntimeError("FFmpeg não encontrado no PATH.")
         
-        result = subprocess.run([
+        result = executar_ffmpeg([
             "ffmpeg", "-y", "-i", wav_in,
             "-c:a", "libmp3lame", "-b:a", bitrate, mp3_out
-        ], capture_output=True, text=True)
+        ], rotulo="wav->mp3", execucao="audio", check=False)
         
         if result.returncode != 0:
             raise RuntimeError(f"FFmpeg error: {result.stderr}")
\ No newline at end of file
@@ -0,0 +1,204 @@
+"""
+TTS EM TRECHOS - texto longo dividido em frases, trechos sintetizados em paralelo
+
+Qualquer provider serve: o motor recebe uma função sintetizar(texto, caminho) -> bool.
+Os trechos são decodificados para PCM e concatenados amostra a amostra (um único encode
+MP3 no fim); cada legenda SRT de trecho é deslocada pela duração exata dos trechos
+anteriores. Trechos prontos ficam na pasta '<saida>_trechos' até o fim, então só os que
+falharam são refeitos, inclusive numa nova execução depois de uma falha.
+"""
+import contextvars
+import hashlib
+import json
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Any
+
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.silencio import decodificar_pcm
+
+CHARS_POR_TRECHO = 1200
+CONCORRENCIA = 4
+TENTATIVAS = 3
+TAXA_TTS = 24000  # taxa nativa do Edge e do Gemini: a concatenação não reamostra
+
+_FIM_DE_FRASE = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”»)])\s+")
+_TEMPO_SRT = re.compile(r"(\d+):(\d+):(\d+)[,.](\d+)")
+
+
+def dividir_em_trechos(texto: str, max_chars: int = CHARS_POR_TRECHO) -> list:
+    """
+    Agrupa frases inteiras em trechos de até max_chars (uma frase maior que o limite
+    vira um trecho sozinha, quebrada em vírgula/ponto e vírgula se possível).
+    """
+    frases = []
+    for paragrafo in texto.split("\n"):
+        for frase in _FIM_DE_FRASE.split(paragrafo.strip()):
+            frase = frase.strip()
+            if not frase:
+                continue
+            while len(frase) > max_chars:
+                corte = max(frase.rfind(", ", 0, max_chars), frase.rfind("; ", 0, max_chars))
+                if corte <= 0:
+                    corte = frase.rfind(" ", 0, max_chars)
+                if corte <= 0:
+                    break
+                frases.append(frase[:corte + 1].strip())
+                frase = frase[corte + 1:].strip()
+            frases.append(frase)
+
+    trechos, atual = [], ""
+    for frase in frases:
+        if atual and len(atual) + 1 + len(frase) > max_chars:
+            trechos.append(atual)
+            atual = frase
+        else:
+            atual = f"{atual} {frase}".strip()
+    if atual:
+        trechos.append(atual)
+    return trechos
+
+
+def _srt_para_ms(tempo: str) -> int:
+    h, m, s, ms = _TEMPO_SRT.search(tempo).groups()
+    return ((int(h) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0")[:3])
+
+
+def _ms_para_srt(ms: int) -> str:
+    s, ms = divmod(int(ms), 1000)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def _ler_srt(srt_path: Path) -> list:
+    """[(inicio_ms, fim_ms, texto)] de um SRT"""
+    legendas = []
+    for bloco in re.split(r"\n\s*\n", srt_path.read_text(encoding="utf-8").strip()):
+        linhas = bloco.strip().splitlines()
+        for i, linha in enumerate(linhas):
+            if "-->" in linha:
+                inicio, fim = (t.strip() for t in linha.split("-->"))
+                legendas.append((_srt_para_ms(inicio), _srt_para_ms(fim), "\n".join(linhas[i + 1:])))
+                break
+    return legendas
+
+
+def juntar_legendas(srts: list, offsets: list, saida: Path) -> Path:
+    """Concatena SRTs de trechos deslocando cada um pelo início do seu trecho no áudio"""
+    blocos = []
+    for srt, offset in zip(srts, offsets):
+        deslocamento = round(offset * 1000)
+        for inicio, fim, texto in _ler_srt(srt):
+            blocos.append(f"{len(blocos) + 1}\n{_ms_para_srt(inicio + deslocamento)} --> "
+                          f"{_ms_para_srt(fim + deslocamento)}\n{texto}")
+    saida.write_text("\n\n".join(blocos) + "\n", encoding="utf-8")
+    return saida
+
+
+def sintetizar_em_trechos(sintetizar: Callable[[str, Path], bool], texto: str, output_path: Path,
+                          config: Dict[str, Any], chars_por_trecho: int = None,
+                          concorrencia: int = None, tentativas: int = None,
+                          provider: str = "", is_short: bool = False) -> bool:
+    """
+    Sintetiza o texto em trechos paralelos e grava um único áudio (e SRT, se houver).
+
+    Args:
+        sintetizar: função(texto, caminho_mp3) -> bool do provider (o SRT do trecho,
+            quando existe, fica em caminho_mp3.with_suffix('.srt'))
+        config: configuração do canal; entra na identificação dos trechos já prontos
+            e define os padrões TTS_CHARS_POR_TRECHO, TTS_CONCORRENCIA e TTS_TENTATIVAS
+        provider / is_short: também identificam os trechos (outra voz ou velocidade
+            não reaproveita trechos de uma execução anterior)
+
+    Returns:
+        True se todos os trechos foram sintetizados e o áudio final foi gravado
+    """
+    output_path = Path(output_path)
+    chars_por_trecho = int(chars_por_trecho or config.get('TTS_CHARS_POR_TRECHO', CHARS_POR_TRECHO))
+    concorrencia = int(concorrencia or config.get('TTS_CONCORRENCIA', CONCORRENCIA))
+    tentativas = int(tentativas or config.get('TTS_TENTATIVAS', TENTATIVAS))
+
+    trechos = dividir_em_trechos(texto, chars_por_trecho)
+    if len(trechos) <= 1:
+        return sintetizar(texto, output_path)
+
+    pasta = output_path.parent / f"{output_path.stem}_trechos"
+    pasta.mkdir(parents=True, exist_ok=True)
+    assinatura = json.dumps({"config": config, "provider": provider, "is_short": bool(is_short)},
+                            sort_keys=True, default=str)
+
+    def _arquivo(i, trecho):
+        h = hashlib.sha1(f"{assinatura}\n{trecho}".encode("utf-8")).hexdigest()[:12]
+        return pasta / f"trecho_{i:03d}_{h}.mp3"
+
+    arquivos = [_arquivo(i, t) for i, t in enumerate(trechos)]
+    pendentes = [i for i, a in enumerate(arquivos) if not (a.exists() and a.stat().st_size > 0)]
+    print(f"🧩 TTS em {len(trechos)} trechos ({len(trechos) - len(pendentes)} já prontos), "
+          f"{concorrencia} em paralelo")
+
+    def _sintetizar(i):
+        try:
+            ok = sintetizar(trechos[i], arquivos[i])
+        except Exception as e:
+            print(f"⚠️ Trecho {i}: {e}")
+            ok = False
+        if not ok:
+            arquivos[i].unlink(missing_ok=True)
+        return ok and arquivos[i].exists()
+
+    for tentativa in range(1, max(1, tentativas) + 1):
+        if not pendentes:
+            break
+        with ThreadPoolExecutor(max_workers=max(1, concorrencia), thread_name_prefix="tts") as pool:
+            # contexto copiado aqui (thread do job): métricas, progresso e pasta_temp chegam aos trechos
+            futuros = [pool.submit(contextvars.copy_context().run, _sintetizar, i) for i in pendentes]
+            resultados = [f.result() for f in futuros]
+        pendentes = [i for i, ok in zip(pendentes, resultados) if not ok]
+        if pendentes and tentativa < tentativas:
+            print(f"🔁 {len(pendentes)} trechos falharam, tentando de novo...")
+            time.sleep(2 * tentativa)
+
+    if pendentes:
+        print(f"❌ TTS: trechos {pendentes} falharam após {tentativas} tentativas "
+              f"(os prontos ficam em {pasta})")
+        return False
+
+    # concatena em PCM (exato na amostra) e encoda o MP3 uma única vez
+    pcms = [decodificar_pcm(a, a.with_suffix(".pcm"), taxa=TAXA_TTS) for a in arquivos]
+    offsets, acumulado = [], 0.0
+    for pcm in pcms:
+        offsets.append(acumulado)
+        acumulado += pcm.duracao
+    completo = pasta / "completo.pcm"
+    with open(completo, "wb") as destino:
+        for pcm in pcms:
+            with open(pcm.path, "rb") as origem:
+                shutil.copyfileobj(origem, destino, 1 << 20)
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(TAXA_TTS), "-ac", "1", "-i", str(completo),
+        "-c:a", "libmp3lame", "-b:a", "192k",
+        str(output_path)
+    ]
+    executar_ffmpeg(cmd, duracao=acumulado, rotulo="juntar trechos tts", execucao="audio")
+
+    srts = [a.with_suffix(".srt") for a in arquivos]
+    srt_saida = output_path.with_suffix(".srt")
+    if all(s.exists() for s in srts):
+        juntar_legendas(srts, offsets, srt_saida)
+        print(f"✅ Legendas de {len(srts)} trechos juntadas: {srt_saida}")
+    else:
+        # SRT de uma execução anterior não corresponde a este áudio
+        if srt_saida.exists():
+            srt_saida.unlink()
+        if any(s.exists() for s in srts):
+            print(f"⚠️ Legendas faltando em parte dos trechos: {srt_saida.name} não foi gerado")
+
+    shutil.rmtree(pasta, ignore_errors=True)
+    print(f"✅ Áudio de {len(trechos)} trechos: {output_path} ({acumulado:.1f}s)")
+    return True
@@ -34,7 +34,9 @@ def generate_audio_task(self, video_id):
         print(f"🎵 Gerando áudio para vídeo: {video_id}")
         
         audio_system = AudioSystem()
-        success = audio_system.generate_audio(video_id)
+        from video_maker.ffmpeg_runner import metricas_do_job
+        with metricas_do_job(f"audio_{video_id}"):
+            success = audio_system.generate_audio(video_id)
         
         if success:
             self.update_state(
@@ -94,9 +96,53 @@ def generate_video_task(self, video_id):
         )
         
         print(f"🎬 Gerando vídeo para: {video_id}")
-        
+
+        # Progresso real do ffmpeg (tempo encodado, velocidade, ETA) no estado da task
+        from video_maker.ffmpeg_runner import metricas_do_job, ouvir_progresso
+        # Pesos por etapa: clipes, concat e áudio andam 10-40% (um ponto por passo
+        # concluído); só o encode final (ou seus segmentos paralelos) vai de 40 a 95%
+        etapas_finais = ("final", "passo único", "encode", "imagem estática")
+        etapas_segmentadas = ("bloco ", "trecho ")
+        atual = 10
+        segmentos = {}
+
+        def _progresso(evento):
+            nonlocal atual
+            percentual = evento.percentual
+            rotulo = evento.rotulo or ""
+            if rotulo.startswith(etapas_segmentadas):
+                # rótulo "bloco i/N": segmentos que ainda não começaram contam como 0%
+                _, _, total = rotulo.partition("/")
+                if percentual is not None and total.isdigit():
+                    segmentos[rotulo] = percentual
+                    media = sum(segmentos.values()) / max(int(total), len(segmentos))
+                    atual = max(atual, 40 + int(media * 0.55))
+            elif rotulo.startswith(etapas_finais):
+                if percentual is not None:
+                    atual = max(atual, 40 + int(percentual * 0.55))
+            elif evento.concluido:
+                atual = max(atual, min(40, atual + 1))  # não volta entre etapas
+            status = f"Renderizando {evento.rotulo}".strip()
+            if percentual is not None:
+                status += f": {percentual:.0f}%"
+            self.update_state(
+                state='PROGRESS',
+                meta={
+                    'current': atual,
+                    'total': 100,
+                    'status': status,
+                    'video_id': video_id,
+                    'etapa': evento.rotulo,
+                    'velocidade': evento.velocidade,
+                    'fps': evento.fps,
+                    'tempo_encodado': evento.tempo,
+                    'eta_segundos': evento.eta
+                }
+            )
+
         video_gen = VideoGenerator()
-        success = video_gen.gerar_video(video_id)
+        with ouvir_progresso(_progresso), metricas_do_job(f"video_{video_id}"):
+            success = video_gen.gerar_video(video_id)
         
         if success:
             self.update_state(
@@ -5,6 +5,9 @@ Cria multiplos videos para um canal existente usando as classes internas.
 Uso:
   python tools/batch_create_videos.py --canal "Terror" --count 10 --tipo short --provider claude
   python tools/batch_create_videos.py --canal "Terror" --count 5 --tipo long --duracao 4
+
+Os roteiros sao gerados primeiro; depois o audio de todos sai num unico lote, com o TTS
+concorrente num so event loop (AudioSystem.generate_audio_many).
 """
 
 import argparse
@@ -33,12 +36,12 @@ def carregar_temas(pasta_canal: Path) -> List[str]:
     return []
 
 
-def criar_video(canal_nome: str, provider: Optional[str], tipo: str, duracao: Optional[int], tema: Optional[str]) -> bool:
+def criar_roteiro(canal_nome: str, provider: Optional[str], tipo: str, duracao: Optional[int], tema: Optional[str]) -> Optional[int]:
     db = DatabaseManager()
     canal = db.canais.buscar_por_nome(canal_nome)
     if not canal:
         print(f"[ERRO] Canal '{canal_nome}' nao encontrado no banco.")
-        return False
+        return None
 
     config = carregar_config_canal(str(Path(canal.config_path) / "config.py"))
     gen = TextGenerator()
@@ -54,24 +57,16 @@ def criar_video(canal_nome: str, provider: Optional[str], tipo: str, duracao: Op
     roteiro = gen.gerar_roteiro(canal.config_path, tema, provider, tipo, duracao)
     if not roteiro:
         print("[ERRO] geracao de roteiro falhou.")
-        return False
+        return None
 
     salvo = gen.salvar_roteiro_completo(roteiro, config, tipo)
     roteiro_id = salvo.get('db_result', {}).get('id_banco')
     if not roteiro_id:
         print(f"[ERRO] nao consegui obter id do roteiro salvo: {salvo}")
-        return False
+        return None
 
     print(f"[OK] Roteiro salvo id={roteiro_id} id_video={salvo.get('id_roteiro')}")
-
-    audio_ok = AudioSystem().generate_audio(int(roteiro_id))
-    print(f"[AUDIO] {'ok' if audio_ok else 'falhou'}")
-    if not audio_ok:
-        return False
-
-    #video_ok = VideoGenerator().gerar_video(int(roteiro_id))
-    #print(f"[VIDEO] {'ok' if video_ok else 'falhou'}")
-    #return bool(video_ok)
+    return int(roteiro_id)
 
 
 def main():
@@ -84,18 +79,32 @@ def main():
     p.add_argument("--tema", help="Tema fixo; se nao informado, escolhe aleatorio de temas.txt")
     args = p.parse_args()
 
-    ok = 0
+    roteiro_ids = []
     for i in range(1, args.count + 1):
         print(f"\n===== [{i}/{args.count}] =====")
         try:
-            if criar_video(args.canal, args.provider, args.tipo, args.duracao, args.tema):
-                ok += 1
+            roteiro_id = criar_roteiro(args.canal, args.provider, args.tipo, args.duracao, args.tema)
+            if roteiro_id:
+                roteiro_ids.append(roteiro_id)
         except KeyboardInterrupt:
             print("[STOP] cancelado pelo usuario")
             break
         except Exception as e:
             print(f"[ERRO] {e}")
 
+    ok = 0
+    if roteiro_ids:
+        print(f"\n===== [AUDIO] {len(roteiro_ids)} roteiros em lote =====")
+        try:
+            resultados = AudioSystem().generate_audio_many(roteiro_ids)
+        except KeyboardInterrupt:
+            print("[STOP] cancelado pelo usuario")
+            resultados = {}
+        for roteiro_id in roteiro_ids:
+            audio_ok = resultados.get(roteiro_id, False)
+            print(f"[AUDIO] roteiro {roteiro_id}: {'ok' if audio_ok else 'falhou'}")
+            ok += bool(audio_ok)
+
     print(f"\n[RESUMO] {ok}/{args.count} videos gerados com sucesso")
 
 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Compara presets/CRF do libx264 (velocidade de encode x tamanho) num vídeo de amostra,
+para calibrar os perfis final/preview de video_maker/encoder_profiles.py.
+
+Uso:
+  python tools/bench_encoders.py
+  python tools/bench_encoders.py --entrada amostra.mp4 --presets fast medium slow --crfs 18 21 23
+  python tools/bench_encoders.py --hardware
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from video_maker.encoder_profiles import encoders_funcionais  # noqa: E402
+
+
+def encodar(entrada, duracao: float, opcoes: list, saida: Path) -> float:
+    """Encoda a amostra e devolve os segundos gastos"""
+    if entrada:
+        origem = ["-i", str(entrada)]
+    else:
+        origem = ["-f", "lavfi", "-i", "testsrc2=size=1280x720:rate=30"]
+    cmd = ["ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+           *origem, "-t", str(duracao), "-an", *opcoes, "-pix_fmt", "yuv420p", str(saida)]
+    inicio = time.perf_counter()
+    subprocess.run(cmd, check=True)
+    return time.perf_counter() - inicio
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark de presets/CRF do libx264")
+    p.add_argument("--entrada", help="Vídeo de amostra (default: testsrc2 sintético 720p30)")
+    p.add_argument("--duracao", type=float, default=10.0, help="Segundos encodados (default: 10)")
+    p.add_argument("--presets", nargs="+", default=["veryfast", "fast", "medium", "slow"])
+    p.add_argument("--crfs", nargs="+", type=int, default=[18, 21, 23])
+    p.add_argument("--hardware", action="store_true", help="Também mostra os encoders de hardware que funcionam")
+    args = p.parse_args()
+
+    if args.hardware:
+        for encoder, ok in encoders_funcionais().items():
+            print(f"{encoder:<20} {'ok' if ok else 'indisponível'}")
+        print()
+
+    print(f"{'preset':<10} {'crf':>4} {'fps':>8} {'MB':>8} {'Mbit/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for preset in args.presets:
+            for crf in args.crfs:
+                saida = Path(tmp) / f"{preset}_{crf}.mp4"
+                segundos = encodar(args.entrada, args.duracao,
+                                   ["-c:v", "libx264", "-preset", preset, "-crf", str(crf)], saida)
+                tamanho = saida.stat().st_size
+                fps = args.duracao * 30 / segundos
+                mbps = tamanho * 8 / args.duracao / 1_000_000
+                print(f"{preset:<10} {crf:>4} {fps:>8.1f} {tamanho / 1024 / 1024:>8.2f} {mbps:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark dos efeitos de parallax (depth_3d e vertigo): frames/s do loop
+antigo (aloca mapas a cada frame) contra o loop com buffers reutilizados.
+
+Só mede a geração de frames (sem encoder) sobre uma imagem sintética ou real
+e um mapa de profundidade sintético.
+
+Uso:
+  python tools/bench_parallax.py
+  python tools/bench_parallax.py --largura 1280 --altura 720 --frames 90
+  python tools/bench_parallax.py --imagem ./imagens/capa.png
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from video_maker.efeitos.depth_3d import gerar_frames_depth_3d  # type: ignore
+from video_maker.efeitos.efeito_vertigo import gerar_frames_vertigo  # type: ignore
+
+
+def referencia_depth_3d(img, depth_map, frames, fps=30):
+    """Loop original do depth_3d (antes dos buffers reutilizados)"""
+    h, w, _ = img.shape
+    focus_x, focus_y = w * 0.5, h * 0.5
+    max_zoom = 1.12
+    map_y, map_x = np.indices((h, w), dtype=np.float32)
+    f_zoom, f_shift, f_pan = 0.12, 0.33, 0.18
+    base = min(w, h)
+    amp_px = max(12, int(0.02 * base))
+    pan_x_amp = max(8, int(0.015 * w))
+    pan_y_amp = max(4, int(0.008 * h))
+    fade_frames = int(0.35 * fps)
+
+    for i in range(frames):
+        t_sec = i / fps
+        fade_in = 1.0 if i >= fade_frames else 0.5 * (1 - np.cos(np.pi * (i / max(1, fade_frames))))
+        fade_out = 1.0 if (frames - 1 - i) >= fade_frames else 0.5 * (1 - np.cos(np.pi * ((frames - 1 - i) / max(1, fade_frames))))
+        env = min(fade_in, fade_out)
+        zoom = 1.0 + (max_zoom - 1.0) * (0.5 + 0.5 * np.sin(2 * np.pi * f_zoom * t_sec)) * env
+        shift = (amp_px * (0.75 + 0.25 * np.sin(2 * np.pi * f_shift * t_sec))) * (1 - depth_map) * env
+        cx = focus_x + pan_x_amp * np.sin(2 * np.pi * f_pan * t_sec)
+        cy = focus_y + pan_y_amp * np.cos(2 * np.pi * f_pan * t_sec)
+        map_x_zoom = (map_x - cx) / zoom + cx + shift
+        map_y_zoom = (map_y - cy) / zoom + cy
+        yield cv2.remap(img, map_x_zoom.astype(np.float32), map_y_zoom.astype(np.float32),
+                        interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
+
+
+def referencia_vertigo(img, depth, n, focus_x=0.5, focus_y=0.5):
+    """Loop original do vertigo (antes dos buffers reutilizados)"""
+    h, w, _ = img.shape
+    cx, cy = w * focus_x, h * focus_y
+    focus_d = float(depth[int(np.clip(cy, 0, h-1)), int(np.clip(cx, 0, w-1))])
+    yy, xx = np.indices((h, w), dtype=np.float32)
+    dolly_max, zoom_out_max, r_protec, cap_rel, parallax_gain = 12.0, 0.06, 0.16, 0.012, 0.85
+    dxn = (xx - cx) / w
+    dyn = (yy - cy) / h
+    radial = np.sqrt(dxn*dxn + dyn*dyn)
+    falloff = np.clip((radial - r_protec) / (1.0 - r_protec), 0.0, 1.0) ** 1.7
+    gx = cv2.Sobel(depth, cv2.CV_32F, 1, 0, ksize=3)
+    gy = cv2.Sobel(depth, cv2.CV_32F, 0, 1, ksize=3)
+    gmag = cv2.magnitude(gx, gy)
+    gmag = gmag / (gmag.max() + 1e-6)
+    mask = falloff * np.exp(-6.0 * gmag)
+    base = np.clip((depth - focus_d), -0.15, 0.15) * parallax_gain
+
+    for i in range(n):
+        t = i / max(1, n-1)
+        ease = t*t*(3 - 2*t)
+        dolly = dolly_max * ease
+        zoom = 1.0 - zoom_out_max * ease
+        shift_scale = dolly * base * mask
+        shift_x = np.clip(dxn * shift_scale * w, -cap_rel*w, cap_rel*w)
+        shift_y = np.clip(dyn * shift_scale * h, -cap_rel*h, cap_rel*h)
+        map_x = (xx + shift_x - cx) / zoom + cx
+        map_y = (yy + shift_y - cy) / zoom + cy
+        warped = cv2.remap(img, map_x.astype(np.float32), map_y.astype(np.float32),
+                           interpolation=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT_101)
+        yield cv2.addWeighted(warped, 0.92, img, 0.08, 0.0)
+
+
+def carregar_entrada(imagem, largura, altura):
+    if imagem:
+        img = cv2.imread(imagem)
+        if img is None:
+            raise SystemExit(f"[ERRO] Imagem nao encontrada: {imagem}")
+    else:
+        rng = np.random.default_rng(0)
+        img = rng.integers(0, 256, (altura, largura, 3), dtype=np.uint8)
+        img = cv2.GaussianBlur(img, (0, 0), 3)
+
+    h, w, _ = img.shape
+    # profundidade sintética: gradiente vertical + "objeto" radial no centro
+    yy, xx = np.indices((h, w), dtype=np.float32)
+    radial = np.sqrt(((xx - w / 2) / w) ** 2 + ((yy - h / 2) / h) ** 2)
+    depth = 0.6 * (yy / h) + 0.4 * np.clip(1.0 - 3.0 * radial, 0.0, 1.0)
+    depth = cv2.GaussianBlur(depth.astype(np.float32), (15, 15), 0)
+    return img, depth
+
+
+def medir(gerador, frames):
+    """Consome o gerador e retorna (frames/s, último frame)"""
+    inicio = time.perf_counter()
+    ultimo = None
+    for frame in gerador:
+        ultimo = frame
+    return frames / (time.perf_counter() - inicio), ultimo
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark dos loops de parallax")
+    p.add_argument("--imagem", help="Imagem de entrada (default: sintética)")
+    p.add_argument("--largura", type=int, default=1080, help="Largura da imagem sintética")
+    p.add_argument("--altura", type=int, default=1920, help="Altura da imagem sintética")
+    p.add_argument("--frames", type=int, default=60, help="Frames por medição")
+    args = p.parse_args()
+
+    img, depth = carregar_entrada(args.imagem, args.largura, args.altura)
+    h, w, _ = img.shape
+    n = args.frames
+    print(f"Imagem {w}x{h}, {n} frames por medição (threads OpenCV: {cv2.getNumThreads()})\n")
+
+    casos = [
+        ("depth_3d", lambda: referencia_depth_3d(img, depth, n),
+         lambda fixos: gerar_frames_depth_3d(img, depth, n, mapas_fixos=fixos)),
+        ("vertigo", lambda: referencia_vertigo(img, depth, n),
+         lambda fixos: gerar_frames_vertigo(img, depth, n, mapas_fixos=fixos)),
+    ]
+
+    print(f"{'efeito':<10} {'antes':>10} {'float':>10} {'ponto fixo':>12} {'ganho':>8} {'dif. máx':>9}")
+    for nome, antes, depois in casos:
+        fps_antes, ref = medir(antes(), n)
+        fps_float, novo_float = medir(depois(False), n)
+        fps_fixo, _ = medir(depois(True), n)
+        # mapas float devem reproduzir o loop antigo (diferença só de arredondamento)
+        dif = int(np.abs(ref.astype(np.int16) - novo_float.astype(np.int16)).max())
+        print(f"{nome:<10} {fps_antes:>8.1f}/s {fps_float:>8.1f}/s {fps_fixo:>10.1f}/s "
+              f"{fps_fixo / fps_antes:>7.2f}x {dif:>9}")
+
+
+if __name__ == "__main__":
+    main()
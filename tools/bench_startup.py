@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Mede o tempo de inicialização (import a frio) dos pontos de entrada e quais
+módulos pesados cada um carrega. Cada medição roda num processo Python novo.
+
+Uso:
+  python tools/bench_startup.py
+  python tools/bench_startup.py --repeticoes 5 --modulos video tasks
+  python tools/bench_startup.py --template short_sequencial
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PONTOS_DE_ENTRADA = ["video", "audio", "tasks", "app"]
+MODULOS_PESADOS = ["torch", "transformers", "cv2", "numpy", "PIL"]
+
+# Executado no processo filho: importa o alvo e devolve tempo, RSS e módulos pesados
+_SONDA = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+inicio = time.perf_counter()
+erro = None
+try:
+    {codigo}
+except BaseException as e:
+    erro = f"{{type(e).__name__}}: {{e}}"
+segundos = time.perf_counter() - inicio
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+except ImportError:  # Windows
+    rss_mb = None
+print(json.dumps({{
+    "segundos": segundos,
+    "rss_mb": rss_mb,
+    "pesados": [m for m in {pesados!r} if m in sys.modules],
+    "erro": erro,
+}}))
+"""
+
+
+def medir(codigo: str, repeticoes: int) -> dict:
+    """Roda o código em processos novos e agrega as medições"""
+    script = _SONDA.format(root=str(ROOT), codigo=codigo, pesados=MODULOS_PESADOS)
+    medidas = []
+    for _ in range(repeticoes):
+        # saída do próprio módulo (prints de import) vai para o stderr do filho
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=ROOT,
+            capture_output=True, text=True
+        )
+        linhas = [l for l in result.stdout.splitlines() if l.startswith("{")]
+        if not linhas:
+            return {"erro": (result.stderr or "sem saída").strip().splitlines()[-1]}
+        medidas.append(json.loads(linhas[-1]))
+
+    ultima = medidas[-1]
+    tempos = [m["segundos"] for m in medidas]
+    return {
+        "mediana": statistics.median(tempos),
+        "minimo": min(tempos),
+        "rss_mb": ultima["rss_mb"],
+        "pesados": ultima["pesados"],
+        "erro": ultima["erro"],
+    }
+
+
+def imprimir(nome: str, r: dict):
+    if "mediana" not in r:
+        print(f"{nome:<28} ERRO: {r['erro']}")
+        return
+    rss = f"{r['rss_mb']:.0f} MB" if r["rss_mb"] is not None else "n/d"
+    pesados = ", ".join(r["pesados"]) or "-"
+    print(f"{nome:<28} {r['mediana'] * 1000:>8.0f} ms {r['minimo'] * 1000:>8.0f} ms {rss:>9}  {pesados}")
+    if r["erro"]:
+        print(f"{'':<28} ⚠️ {r['erro']}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark de inicialização dos pontos de entrada")
+    p.add_argument("--modulos", nargs="+", default=PONTOS_DE_ENTRADA, help="Módulos a importar")
+    p.add_argument("--repeticoes", type=int, default=3, help="Processos por medição (default: 3)")
+    p.add_argument("--template", action="append", default=[], help="Também mede obter_template(NOME)")
+    args = p.parse_args()
+
+    print(f"{'alvo':<28} {'mediana':>11} {'mínimo':>11} {'RSS máx':>9}  módulos pesados")
+    for modulo in args.modulos:
+        imprimir(f"import {modulo}", medir(f"import {modulo}", args.repeticoes))
+
+    imprimir("video_maker.video_engine",
+             medir("import video_maker.video_engine", args.repeticoes))
+
+    for nome in args.template:
+        codigo = f"from video_maker.video_engine import obter_template; obter_template({nome!r})"
+        imprimir(f"template {nome}", medir(codigo, args.repeticoes))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 from pathlib import Path
 import json, re
 from typing import Any, Dict
-import subprocess
 import tempfile  # ✅ ADICIONAR ESTA LINHA
 import os
 
 import pysrt
 
+from video_maker.audio_pipeline import detectar_silencios
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.media_info import obter_media_info
+
 # tokenização de "palavra" robusta (acentos + hífen/contração)
 _WORD = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9]+(?:[-''][A-Za-zÀ-ÖØ-öø-ÿ0-9]+)?", re.UNICODE)
 
@@ -31,11 +34,10 @@ def truncate_words(s: str, n: int) -> str:
 def _get_audio_duration(audio_path: str) -> int:
     """Obtém a duração do áudio em segundos"""
     try:
-        result = subprocess.run([
-            "ffprobe", "-v", "error", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", audio_path
-        ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        return int(float(result.stdout.strip()))
+        info = obter_media_info(audio_path)
+        if info is None:
+            raise ValueError(f"ffprobe não conseguiu ler {audio_path}")
+        return int(info.duracao)
     except Exception as e:
         print(f"⚠️ Erro ao obter duração do áudio: {e}")
         return 0
@@ -320,7 +322,7 @@ def seconds_to_srt(seconds):
     ms = int((seconds - int(seconds)) * 1000)
     return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
-def ajustar_legenda_srt(srt_original, srt_ajustado, cortes):
+def ajustar_legenda_srt(srt_original, srt_ajustado, cortes, margem=0.1):
     """Ajusta timestamps do SRT baseado nos cortes aplicados - VERSÃO CORRIGIDA"""
     try:
         with open(srt_original, 'r', encoding='utf-8') as f:
@@ -346,8 +348,8 @@ def ajustar_legenda_srt(srt_original, srt_ajustado, cortes):
                     # ✅ CORREÇÃO: Calcula offset total acumulado de todos os cortes anteriores
                     offset_total = 0
                     for corte in cortes:
-                        corte_start = corte['start'] + 0.1
-                        corte_end = corte['end'] - 0.1
+                        corte_start = corte['start'] + margem
+                        corte_end = corte['end'] - margem
                         duracao_cortada = corte_end - corte_start
                         
                         # Se o corte aconteceu ANTES do início desta legenda, aplica offset
@@ -408,26 +410,7 @@ def otimizar_audio_e_legenda(audio_path: str, srt_path: str = None) -> tuple:
         
         # 1. Detectar silêncios
         print("🔍 Detectando pausas longas no áudio...")
-        cmd_detect = [
-            'ffmpeg',
-            '-i', str(audio_file),
-            '-af', 'silencedetect=noise=-40dB:d=0.5',
-            '-f', 'null',
-            '-'
-        ]
-        
-        result = subprocess.run(cmd_detect, capture_output=True, text=True)
-        silencios = []
-        lines = result.stderr.split('\n')
-        
-        for i, line in enumerate(lines):
-            if 'silence_start:' in line:
-                start = float(line.split('silence_start:')[1].strip())
-            elif 'silence_end:' in line and '|' in line:
-                end = float(line.split('silence_end:')[1].split('|')[0].strip())
-                duration = end - start
-                if duration > 0.5:  # Só pausas longas
-                    silencios.append({'start': start, 'end': end, 'duration': duration})
+        silencios = detectar_silencios(audio_file)
         
         if not silencios:
             print("ℹ️  Nenhuma pausa longa encontrada para cortar")
@@ -469,7 +452,7 @@ def otimizar_audio_e_legenda(audio_path: str, srt_path: str = None) -> tuple:
                 str(audio_otimizado)
             ]
             
-            subprocess.run(cmd_cortar, check=True, capture_output=True)
+            executar_ffmpeg(cmd_cortar, rotulo="cortar pausas", execucao="copia")
         
         print(f"✅ Áudio otimizado: {audio_otimizado}")
         
@@ -62,8 +62,10 @@ class VideoGenerator:
             print(f"🎯 Tipo: {tipo_video}, Template: {template_name}")
 
             arquivo_saida = Path(config['PASTA_VIDEOS']) / f"{roteiro.id_video}.mp4"            
-            # Executa template
-            resultado = self._executar_template(template_name, arquivo_audio, config, roteiro, str(arquivo_saida))
+            # Executa template numa pasta de trabalho exclusiva (apagada ao final)
+            from video_maker.render_context import contexto_render
+            with contexto_render(f"roteiro_{roteiro.id}", base=config.get('PASTA_SCRATCH')):
+                resultado = self._executar_template(template_name, arquivo_audio, config, roteiro, str(arquivo_saida))
 
             if resultado and resultado.exists():
                 # ✅ CORREÇÃO: Obter duração real do vídeo gerado
@@ -139,12 +141,11 @@ class VideoGenerator:
     def _get_video_duration(self, video_path: Path) -> int:
         """Obtém a duração do vídeo em segundos usando ffprobe"""
         try:
-            import subprocess
-            result = subprocess.run([
-                "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1", str(video_path)
-            ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-            return int(float(result.stdout.strip()))
+            from video_maker.media_info import obter_media_info
+            info = obter_media_info(video_path)
+            if info is None:
+                raise ValueError(f"ffprobe não conseguiu ler {video_path}")
+            return int(info.duracao)
         except Exception as e:
             print(f"⚠️ Erro ao obter duração do vídeo: {e}")
             # Fallback: usar duração do áudio se disponível
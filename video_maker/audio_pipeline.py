@@ -0,0 +1,133 @@
+"""
+PIPELINE DE ÁUDIO - corte de pausas, mixagem com música e loudness num único ffmpeg
+
+Antes: silencedetect, concat para cortar as pausas (MP3 -> MP3) e outro encode para
+mixar a música (MP3 -> MP3). Agora a narração crua do TTS é decodificada uma vez (o PCM
+da detecção de pausas é reaproveitado), as pausas saem com atrim/concat, a música entra
+com amix (já decodificada, ver trilha_cache) e o loudnorm fecha o grafo; cada arquivo
+de saída é a primeira (e única) geração MP3 depois do TTS.
+
+Os cortes seguem o formato de sempre ({'start', 'end', 'duration'}, com 'margem' de
+pausa mantida em cada lado), então a legenda é remapeada com ajustar_legenda_srt.
+"""
+from pathlib import Path
+
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.silencio import decodificar_pcm, detectar_silencios_pcm
+from video_maker.trilha_cache import obter_trilha
+
+MARGEM_CORTE = 0.1      # segundos de pausa mantidos antes e depois de cada corte
+LUFS_PADRAO = -14.0     # alvo de loudness integrado (YouTube)
+
+
+def detectar_silencios(audio_path, ruido_db: float = -40, minimo: float = 0.5) -> list:
+    """
+    Pausas longas da narração (RMS sobre o PCM decodificado, ver silencio.py).
+    Quem também vai cortar o áudio deve usar decodificar_pcm + detectar_silencios_pcm
+    e passar o PCM para processar_audio, evitando a segunda decodificação.
+
+    Returns:
+        list[dict]: {'start', 'end', 'duration'} em segundos, em ordem
+    """
+    pcm = decodificar_pcm(audio_path)
+    try:
+        return detectar_silencios_pcm(pcm, limiar_db=ruido_db, minimo=minimo)
+    finally:
+        pcm.apagar()
+
+
+def trechos_mantidos(cortes, margem: float = MARGEM_CORTE) -> list:
+    """
+    Trechos do áudio que sobram depois dos cortes.
+
+    Returns:
+        list[(inicio, fim)]: fim None = até o final do áudio
+    """
+    trechos, posicao = [], 0.0
+    for corte in cortes:
+        corte_ini = corte["start"] + margem
+        corte_fim = corte["end"] - margem
+        if corte_fim <= corte_ini:
+            continue
+        if posicao < corte_ini:
+            trechos.append((posicao, corte_ini))
+        posicao = max(posicao, corte_fim)
+    trechos.append((posicao, None))
+    return trechos
+
+
+def filtro_audio(cortes=(), musica: bool = False, lufs: float = LUFS_PADRAO,
+                 saida_voz: bool = False, saida_mix: bool = True,
+                 margem: float = MARGEM_CORTE) -> str:
+    """
+    filter_complex do pipeline. Entradas: 0 = narração, 1 = trilha do cache (ganho já
+    aplicado, em loop pela entrada; ver trilha_cache).
+    Saídas: [voz] (narração cortada) e/ou [mix] (com música e loudnorm).
+    """
+    partes = []
+    narracao = "voz" if saida_voz and not saida_mix else "narracao"
+    trechos = trechos_mantidos(cortes, margem) if cortes else []
+    if len(trechos) > 1:
+        # atrim é exato na amostra (aselect cortaria em fronteira de frame MP3)
+        for i, (ini, fim) in enumerate(trechos):
+            limite = f":end={fim:.3f}" if fim is not None else ""
+            partes.append(f"[0:a]atrim=start={ini:.3f}{limite},asetpts=PTS-STARTPTS[t{i}]")
+        entradas = "".join(f"[t{i}]" for i in range(len(trechos)))
+        partes.append(f"{entradas}concat=n={len(trechos)}:v=0:a=1[{narracao}]")
+    else:
+        partes.append(f"[0:a]anull[{narracao}]")
+
+    if not saida_mix:
+        return ";".join(partes)
+    if saida_voz:
+        partes.append(f"[{narracao}]asplit=2[voz][narracao_mix]")
+        narracao = "narracao_mix"
+
+    normalizar = f"loudnorm=I={lufs}:TP=-1.5:LRA=11"
+    if musica:
+        partes.append(f"[{narracao}][1:a]amix=inputs=2:duration=first:dropout_transition=2,{normalizar}[mix]")
+    else:
+        partes.append(f"[{narracao}]{normalizar}[mix]")
+    return ";".join(partes)
+
+
+def processar_audio(audio_path, cortes=(), saida_voz=None, saida_mix=None, musica_path=None,
+                    ganho_musica: float = -25, lufs: float = LUFS_PADRAO, margem: float = MARGEM_CORTE,
+                    pcm=None, trilha=None):
+    """
+    Corta as pausas, mixa a música e normaliza o loudness num único ffmpeg.
+
+    Args:
+        audio_path: narração crua do TTS
+        cortes: pausas a remover (detectar_silencios); vazio = sem cortes
+        saida_voz: MP3 só com a narração cortada (opcional)
+        saida_mix: MP3 final, com música (se houver) e loudnorm (opcional)
+        musica_path: música de fundo, em loop até o fim da narração (via trilha_cache)
+        trilha: TrilhaDecodificada já obtida (dispensa musica_path/ganho_musica)
+        pcm: PcmDecodificado da mesma narração (já usado na detecção); lido no lugar do MP3
+
+    Returns:
+        tuple: (saida_voz, saida_mix) como Path ou None
+    """
+    if not saida_voz and not saida_mix:
+        raise ValueError("processar_audio precisa de ao menos uma saída")
+    audio_path = Path(audio_path)
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Áudio não encontrado: {audio_path}")
+    if saida_mix and musica_path and trilha is None:
+        trilha = obter_trilha(musica_path, ganho_musica)
+    musica = bool(saida_mix and trilha)
+
+    entrada = pcm.args_entrada() if pcm else ["-i", str(audio_path)]
+    cmd = ["ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error", *entrada]
+    if musica:
+        cmd += trilha.args_entrada()
+    cmd += ["-filter_complex", filtro_audio(cortes, musica, lufs, bool(saida_voz), bool(saida_mix), margem)]
+    if saida_voz:
+        cmd += ["-map", "[voz]", "-c:a", "libmp3lame", "-b:a", "192k", str(saida_voz)]
+    if saida_mix:
+        # loudnorm reamostra para 192kHz internamente
+        cmd += ["-map", "[mix]", "-c:a", "libmp3lame", "-b:a", "192k", "-ar", "48000", str(saida_mix)]
+
+    executar_ffmpeg(cmd, rotulo="pipeline de áudio", execucao="audio")
+    return (Path(saida_voz) if saida_voz else None, Path(saida_mix) if saida_mix else None)
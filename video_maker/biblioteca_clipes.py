@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+BIBLIOTECA DE CLIPES NORMALIZADOS - cada clipe da biblioteca é convertido uma vez para
+o formato canônico (H.264 1280x720, 30fps, GOP fixo, yuv420p, sem áudio) e registrado
+num índice. Clipes no mesmo formato podem ser concatenados com '-c copy'.
+
+Uso:
+  python -m video_maker.biblioteca_clipes "canais/religioso/assets/videos"
+  python -m video_maker.biblioteca_clipes "canais/religioso/assets/videos" --saida D:/normalizados --cpu 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.media_info import obter_duracao
+from video_maker.render_paralelo import args_threads, renderizar_clipes
+from video_maker.video_utils import listar_videos
+
+PASTA_PADRAO = "_normalizados"
+ARQUIVO_INDICE = "indice.json"
+
+# Formato canônico (mudar qualquer valor força a re-normalização da biblioteca)
+FORMATO = {
+    "codec": "libx264", "profile": "high", "level": "4.0",
+    "preset": "medium", "crf": 18,
+    "largura": 1280, "altura": 720, "fps": 30,
+    "gop": 60,  # keyframe a cada 2s, sem keyframes por troca de cena
+    "pix_fmt": "yuv420p", "timescale": 90000,
+}
+
+
+def pasta_normalizada(videos_dir, saida=None) -> Path:
+    """Pasta dos clipes normalizados (padrão: VIDEOS_DIR/_normalizados)"""
+    return Path(saida) if saida else Path(videos_dir) / PASTA_PADRAO
+
+
+def _ler_indice(pasta: Path) -> dict:
+    arquivo = pasta / ARQUIVO_INDICE
+    if arquivo.exists():
+        try:
+            indice = json.loads(arquivo.read_text(encoding="utf-8"))
+            if indice.get("formato") == FORMATO:
+                return indice
+            print("♻️ Formato canônico mudou: biblioteca será re-normalizada")
+        except ValueError:
+            print(f"⚠️ Índice inválido em {arquivo}, recriando")
+    return {"formato": FORMATO, "clipes": {}}
+
+
+def _gravar_indice(pasta: Path, indice: dict):
+    arquivo = pasta / ARQUIVO_INDICE
+    temp = arquivo.with_suffix(".tmp")
+    temp.write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temp, arquivo)
+
+
+def _nome_normalizado(origem: Path) -> str:
+    """'cena.mov' -> 'cena_mov.mp4' (origens com mesmo nome e extensões diferentes não colidem)"""
+    return f"{origem.stem}_{origem.suffix.lstrip('.').lower()}.mp4"
+
+
+def normalizar_clipe(origem: Path, destino: Path) -> Path:
+    """Converte um clipe para o formato canônico (escrita atômica)"""
+    f = FORMATO
+    w, h = f["largura"], f["altura"]
+    temp = destino.with_name(destino.stem + ".tmp" + destino.suffix)
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+        "-i", str(origem),
+        "-vf", (
+            f"scale={w}:{h}:force_original_aspect_ratio=decrease:flags=lanczos,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2:color=black,setsar=1,fps={f['fps']}"
+        ),
+        "-an",
+        "-c:v", f["codec"], "-profile:v", f["profile"], "-level", f["level"],
+        "-preset", f["preset"], "-crf", str(f["crf"]),
+        "-g", str(f["gop"]), "-keyint_min", str(f["gop"]), "-sc_threshold", "0",
+        "-pix_fmt", f["pix_fmt"],
+        "-video_track_timescale", str(f["timescale"]),
+        *args_threads(),
+        "-movflags", "+faststart",
+        str(temp)
+    ]
+    try:
+        executar_ffmpeg(cmd, rotulo=f"normalizar {origem.name}", execucao="efeito")
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        temp.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg falhou em {origem.name}: {(e.stderr or '')[-500:]}")
+    os.replace(temp, destino)
+    return destino
+
+
+def ingerir_biblioteca(videos_dir, saida=None, orcamento_cpu=None) -> dict:
+    """
+    Normaliza os clipes novos ou alterados e atualiza o índice.
+
+    Returns:
+        dict: índice {"formato": ..., "clipes": {nome_origem: {...}}}
+    """
+    videos_dir = Path(videos_dir)
+    pasta = pasta_normalizada(videos_dir, saida)
+    pasta.mkdir(parents=True, exist_ok=True)
+    indice = _ler_indice(pasta)
+    clipes = indice["clipes"]
+
+    origens = [Path(v) for v in listar_videos(videos_dir)]
+    nomes = {o.name for o in origens}
+
+    # remove entradas cujo clipe de origem saiu da biblioteca
+    for nome in [n for n in clipes if n not in nomes]:
+        (pasta / clipes.pop(nome)["arquivo"]).unlink(missing_ok=True)
+
+    pendentes = []
+    for origem in origens:
+        st = origem.stat()
+        entrada = clipes.get(origem.name)
+        if (entrada and entrada["origem_tamanho"] == st.st_size
+                and entrada["origem_mtime_ns"] == st.st_mtime_ns
+                and (pasta / entrada["arquivo"]).exists()):
+            continue
+        pendentes.append((origem, st))
+
+    print(f"📚 Biblioteca: {len(origens)} clipes, {len(pendentes)} a normalizar → {pasta}")
+
+    tarefas = [
+        (origem.name, lambda origem=origem: normalizar_clipe(origem, pasta / _nome_normalizado(origem)))
+        for origem, _ in pendentes
+    ]
+    resultados = renderizar_clipes(tarefas, orcamento_cpu=orcamento_cpu)
+
+    for (origem, st), (destino, erro) in zip(pendentes, resultados):
+        if erro is not None:
+            print(f"   ❌ {origem.name}: {erro}")
+            continue
+        duracao = obter_duracao(destino)
+        if duracao <= 0:
+            print(f"   ❌ {origem.name}: clipe normalizado ilegível")
+            continue
+        clipes[origem.name] = {
+            "arquivo": destino.name,
+            "duracao": duracao,
+            "origem_tamanho": st.st_size,
+            "origem_mtime_ns": st.st_mtime_ns,
+        }
+        print(f"   ✅ {origem.name} ({duracao:.1f}s)")
+
+    _gravar_indice(pasta, indice)
+    return indice
+
+
+def carregar_biblioteca(videos_dir, saida=None):
+    """
+    Clipes normalizados disponíveis para o render.
+
+    Returns:
+        list[(Path, duracao)] ou None se a biblioteca nunca foi ingerida
+        (ou foi ingerida num formato diferente do atual)
+    """
+    pasta = pasta_normalizada(videos_dir, saida)
+    if not (pasta / ARQUIVO_INDICE).exists():
+        return None
+    indice = _ler_indice(pasta)
+    clipes = [
+        (pasta / c["arquivo"], float(c["duracao"]))
+        for c in indice["clipes"].values()
+        if (pasta / c["arquivo"]).exists()
+    ]
+    return clipes or None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Normaliza a biblioteca de clipes para concat sem re-encode")
+    ap.add_argument("videos_dir", help="Pasta com os clipes de origem (VIDEOS_DIR do canal)")
+    ap.add_argument("--saida", help=f"Pasta dos clipes normalizados (default: VIDEOS_DIR/{PASTA_PADRAO})")
+    ap.add_argument("--cpu", type=int, help="Núcleos disponíveis (default: RENDER_CPU_BUDGET ou todos)")
+    args = ap.parse_args()
+
+    if not Path(args.videos_dir).exists():
+        print(f"[ERRO] Pasta nao encontrada: {args.videos_dir}")
+        sys.exit(1)
+
+    indice = ingerir_biblioteca(args.videos_dir, args.saida, args.cpu)
+    total = sum(c["duracao"] for c in indice["clipes"].values())
+    print(f"🎉 {len(indice['clipes'])} clipes normalizados ({total / 60:.1f} min)")
+
+
+if __name__ == "__main__":
+    main()
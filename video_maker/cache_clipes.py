@@ -0,0 +1,71 @@
+"""
+CACHE DE CLIPES DE EFEITO - evita re-renderizar o mesmo (imagem, efeito, duração, encoder)
+"""
+import os
+from pathlib import Path
+
+from video_maker.cache_disco import CACHE_DIR, CacheDisco, chave_cache, copiar_ou_linkar, hash_arquivo
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.render_context import pasta_temp
+
+# Incrementar sempre que os filtros dos efeitos mudarem (o perfil de encode já entra na chave)
+VERSAO_CLIPES = 3
+
+_limite_gb = float(os.getenv("CACHE_CLIPES_MAX_GB", "20"))
+_cache = CacheDisco(CACHE_DIR / "clipes", int(_limite_gb * 1024 ** 3), INTERMEDIARIO.extensao)
+
+def _resultado(caminho):
+    class Sucesso: filename = str(caminho)
+    return Sucesso()
+
+def chave_clipe(nome_efeito: str, imagem_path, duracao: float, **params) -> str:
+    """Chave do clipe: hash da imagem + efeito + parâmetros + perfil de intermediários"""
+    return chave_cache(
+        VERSAO_CLIPES,
+        hash_arquivo(imagem_path),
+        nome_efeito,
+        round(float(duracao), 3),
+        INTERMEDIARIO.chave(),
+        params,
+    )
+
+def clipe_em_cache(nome_efeito: str, imagem_path, duracao: float, renderizar, destino=None, **params):
+    """
+    Retorna um clipe do cache ou renderiza e guarda.
+
+    Args:
+        renderizar: função sem argumentos que gera o clipe (retorna objeto com .filename ou caminho)
+        destino: caminho onde o clipe deve ficar (opcional; por padrão a pasta_temp() do job)
+        params: parâmetros extras que diferenciam o clipe (resolução, fps...)
+
+    Returns:
+        Objeto com atributo filename, ou None se a renderização falhou
+    """
+    try:
+        chave = chave_clipe(nome_efeito, imagem_path, duracao, **params)
+    except OSError as e:
+        print(f"⚠️ Cache de clipes indisponível para {imagem_path}: {e}")
+        return _normalizar_retorno(renderizar())
+
+    if destino is None:
+        destino = pasta_temp() / f"cache_{nome_efeito}_{chave[:16]}{INTERMEDIARIO.extensao}"
+
+    em_cache = _cache.obter(chave)
+    if em_cache:
+        print(f"   ♻️ Clipe em cache: {nome_efeito} ({Path(imagem_path).name})")
+        return _resultado(copiar_ou_linkar(em_cache, destino))
+
+    resultado = _normalizar_retorno(renderizar())
+    if resultado and Path(resultado.filename).exists():
+        try:
+            _cache.guardar(chave, resultado.filename)
+        except OSError as e:
+            print(f"⚠️ Não foi possível guardar clipe no cache: {e}")
+    return resultado
+
+def _normalizar_retorno(retorno):
+    if retorno is None:
+        return None
+    if hasattr(retorno, 'filename'):
+        return retorno
+    return _resultado(retorno)
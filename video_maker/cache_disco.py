@@ -0,0 +1,119 @@
+"""
+CACHE EM DISCO ENDEREÇADO POR CONTEÚDO - COMPARTILHÁVEL ENTRE EFEITOS E TEMPLATES
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+# Raiz padrão de todos os caches persistentes (sobrescrevível por variável de ambiente)
+CACHE_DIR = Path(os.getenv("CREATOR_CACHE_DIR", "./renders/cache"))
+
+_hash_memo = {}
+_hash_lock = threading.Lock()
+
+def hash_arquivo(path) -> str:
+    """Hash SHA-256 do conteúdo do arquivo, memorizado por caminho + tamanho + mtime"""
+    path = Path(path).resolve()
+    st = path.stat()
+    memo_key = (str(path), st.st_size, st.st_mtime_ns)
+
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            return _hash_memo[memo_key]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    digest = h.hexdigest()
+
+    with _hash_lock:
+        _hash_memo[memo_key] = digest
+    return digest
+
+def chave_cache(*partes) -> str:
+    """Gera uma chave estável a partir de partes serializáveis em JSON"""
+    bruto = json.dumps(partes, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(bruto.encode("utf-8")).hexdigest()
+
+def copiar_ou_linkar(src, dst):
+    """Cria hardlink quando possível (mesmo disco), senão copia"""
+    src, dst = Path(src), Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+class CacheDisco:
+    """
+    Cache de arquivos em diretório com limite de tamanho e remoção LRU.
+    O mtime de cada entrada marca o último acesso.
+    """
+
+    def __init__(self, diretorio, limite_bytes: int, extensao: str = ".mp4"):
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = int(limite_bytes)
+        self.extensao = extensao
+        self._lock = threading.Lock()
+
+    def caminho(self, chave: str) -> Path:
+        return self.diretorio / f"{chave}{self.extensao}"
+
+    def obter(self, chave: str):
+        """Retorna o caminho da entrada (marcando o acesso) ou None"""
+        path = self.caminho(chave)
+        if not path.exists():
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    def guardar(self, chave: str, origem, mover: bool = False) -> Path:
+        """Guarda uma cópia de 'origem' no cache de forma atômica"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        destino = self.caminho(chave)
+        temp = self.diretorio / f".{chave}.{uuid.uuid4().hex}.tmp"
+        if mover:
+            shutil.move(str(origem), str(temp))
+        else:
+            shutil.copy2(str(origem), str(temp))
+        os.replace(temp, destino)
+        os.utime(destino, None)
+        self.aplicar_limite()
+        return destino
+
+    def aplicar_limite(self):
+        """Remove as entradas menos usadas até caber no limite de tamanho"""
+        with self._lock:
+            entradas = []
+            total = 0
+            for p in self.diretorio.glob(f"*{self.extensao}"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entradas.append((st.st_mtime, st.st_size, p))
+                total += st.st_size
+
+            if total <= self.limite_bytes:
+                return
+
+            entradas.sort(key=lambda e: e[0])
+            for _, tamanho, p in entradas:
+                if total <= self.limite_bytes:
+                    break
+                try:
+                    p.unlink()
+                    total -= tamanho
+                except OSError:
+                    pass
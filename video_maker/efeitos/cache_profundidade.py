@@ -0,0 +1,74 @@
+# efeitos/cache_profundidade.py
+import os, tempfile, numpy as np
+
+from video_maker.cache_disco import CACHE_DIR, CacheDisco, chave_cache, hash_arquivo
+
+# Identificador do modelo de profundidade (entra na chave do cache)
+MODELO_ID = "Intel/dpt-hybrid-midas"
+
+_limite_mb = float(os.getenv("CACHE_PROFUNDIDADE_MAX_MB", "2048"))
+_cache = CacheDisco(CACHE_DIR / "profundidade", int(_limite_mb * 1024 ** 2), ".npy")
+
+
+def _chave(img_path):
+    return chave_cache(hash_arquivo(img_path), MODELO_ID)
+
+
+def _ler(path):
+    return np.load(path).astype(np.float32)
+
+
+def _guardar(chave, depth):
+    """Guarda o mapa em float16 (metade do espaço, precisão de sobra para parallax)"""
+    _cache.diretorio.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(suffix=".npy", dir=_cache.diretorio)
+    os.close(fd)
+    try:
+        np.save(temp, depth.astype(np.float16))
+        _cache.guardar(chave, temp, mover=True)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def obter_profundidades(img_paths):
+    """
+    Resolve o mapa de profundidade de cada imagem pelo cache (hash do conteúdo + modelo).
+    Só as imagens ausentes vão para o modelo, em lote.
+
+    Returns:
+        list[np.ndarray]: mapas float32 em [0, 1], na ordem de img_paths
+    """
+    img_paths = [str(p) for p in img_paths]
+    chaves = [_chave(p) for p in img_paths]
+    mapas = [None] * len(img_paths)
+
+    faltando = {}
+    for i, chave in enumerate(chaves):
+        path = _cache.obter(chave)
+        if path is not None:
+            try:
+                mapas[i] = _ler(path)
+                continue
+            except (OSError, ValueError):
+                pass
+        faltando.setdefault(chave, []).append(i)
+
+    if faltando:
+        # import tardio: acertos no cache não precisam carregar torch/transformers
+        from video_maker.efeitos.estimador_profundidade import estimar_profundidades
+
+        ordem = list(faltando.keys())
+        estimados = estimar_profundidades([img_paths[faltando[c][0]] for c in ordem])
+        for chave, depth in zip(ordem, estimados):
+            _guardar(chave, depth)
+            for i in faltando[chave]:
+                mapas[i] = depth
+
+    print(f"🗺️ Profundidade: {len(img_paths) - sum(len(v) for v in faltando.values())}/{len(img_paths)} do cache")
+    return mapas
+
+
+def obter_profundidade(img_path):
+    """Mapa de profundidade de uma imagem (cache ou modelo)"""
+    return obter_profundidades([img_path])[0]
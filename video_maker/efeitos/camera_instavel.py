@@ -1,28 +1,45 @@
 # efeitos/efeito_camera_instavel.py
-import os, subprocess
-from pathlib import Path
+import os
 
-def criar_video_camera_instavel(img_path, temp=5):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
-    nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_instavel.mp4")
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads
+from video_maker.render_context import pasta_temp
+
+def filtro_camera_instavel(entrada="0:v", saida=None, prefixo=""):
+    """
+    Trecho de filter_complex do efeito (vertical 720x1280).
 
+    Args:
+        entrada: label do stream de imagem
+        saida: label do resultado (None = saída sem label, para uso isolado)
+        prefixo: prefixo dos labels internos (permite vários efeitos no mesmo grafo)
+    """
+    p = prefixo
     # Pipeline:
     # 1) Trabalha em canvas maior (900x1600) para margem de movimento
     # 2) CROP animado (shake) -> 720x1280
     # 3) Fundo borrado + vinheta arredondada
     filtro = (
-        "[0:v]"
+        f"[{entrada}]"
         "scale=900:-1:force_original_aspect_ratio=decrease,"
-        "pad=900:1600:(900-iw)/2:(1600-ih)/2,split=2[big][big2];"
-        "[big]"
+        f"pad=900:1600:(900-iw)/2:(1600-ih)/2,split=2[{p}big][{p}big2];"
+        f"[{p}big]"
         "crop=720:1280:"
         "x='(in_w-720)/2 + 60*sin(t*2)':"
         "y='(in_h-1280)/2 + 40*cos(t*1.6)',"
-        "scale=720:1280[sharp];"
-        "[big2]scale=720:1280,gblur=sigma=32[blur];"
-        "[blur][sharp]overlay=(W-w)/2:(H-h)/2,vignette=PI/3:eval=frame"
+        f"scale=720:1280[{p}sharp];"
+        f"[{p}big2]scale=720:1280,gblur=sigma=32[{p}blur];"
+        f"[{p}blur][{p}sharp]overlay=(W-w)/2:(H-h)/2,vignette=PI/3:eval=frame"
     )
+    return filtro + (f"[{saida}]" if saida else "")
+
+def criar_video_camera_instavel(img_path, temp=5):
+    pasta = pasta_temp()
+    nome_base = os.path.splitext(os.path.basename(img_path))[0]
+    saida = os.path.join(pasta, f"{nome_base}_camera_instavel{INTERMEDIARIO.extensao}")
+
+    filtro = filtro_camera_instavel()
 
     cmd = [
         "ffmpeg","-nostdin","-y","-hide_banner","-loglevel","error",
@@ -30,19 +47,19 @@ def criar_video_camera_instavel(img_path, temp=5):
         "-t", str(temp),
         "-filter_complex", filtro,
         "-r","60",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="camera_instavel", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
 
 def criar_video_camera_instavel_horizontal(img_path, temp=5):
     """Versão horizontal 16:9 para vídeos longos"""
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_instavel_horizontal.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_camera_instavel_horizontal{INTERMEDIARIO.extensao}")
 
     # Pipeline para formato 16:9 (1280x720)
     filtro = (
@@ -64,10 +81,10 @@ def criar_video_camera_instavel_horizontal(img_path, temp=5):
         "-t", str(temp),
         "-filter_complex", filtro,
         "-r","60",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="camera_instavel", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
\ No newline at end of file
@@ -1,83 +1,78 @@
 # efeitos/depth_3d.py
-import os, torch, cv2, numpy as np
-from pathlib import Path
-from PIL import Image
-from transformers import DPTImageProcessor, DPTForDepthEstimation
+import os, math, cv2, numpy as np
+
+from video_maker.efeitos.cache_profundidade import obter_profundidade
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.frame_sink import FfmpegFrameSink
+from video_maker.efeitos.parallax_base import MARGEM_PADRAO, preparar_fonte, grade_saida, reduzir_para_saida
+from video_maker.render_context import pasta_temp
 
 
 def carregar_modelo_local():
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    base_dir = Path("./models/models--Intel--dpt-hybrid-midas")
-
-    # tenta localizar o snapshot local
-    snapshot_dir = base_dir / "snapshots"
-    if snapshot_dir.exists():
-        snapshots = list(snapshot_dir.glob("*"))
-        if snapshots:
-            model_dir = snapshots[0]
-            print(f"✅ Usando modelo local ({model_dir.name}).")
-            processor = DPTImageProcessor.from_pretrained(str(model_dir), local_files_only=True)
-            model = DPTForDepthEstimation.from_pretrained(str(model_dir), local_files_only=True).to(device)
-            model.eval()
-            return processor, model, device
-
-    # se não achar, baixa da internet
-    print("📥 Baixando modelo da internet...")
-    Path("./models").mkdir(parents=True, exist_ok=True)
-    processor = DPTImageProcessor.from_pretrained("Intel/dpt-hybrid-midas", cache_dir="./models")
-    model = DPTForDepthEstimation.from_pretrained("Intel/dpt-hybrid-midas", cache_dir="./models").to(device)
-    model.eval()    
-    return processor, model, device
-
-
-def criar_video_depth_3d(img_path, temp=5):
-    # Cria TODOS os diretórios necessários ANTES de usar
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
-    Path('./outs/').mkdir(parents=True, exist_ok=True)  # ← ESTA LINHA ESTAVA FALTANDO
+    """Compatibilidade: devolve o modelo já carregado no processo"""
+    from video_maker.efeitos.estimador_profundidade import obter_estimador
+    estimador = obter_estimador()
+    return estimador.processor, estimador.model, estimador.device
+
+
+def criar_video_depth_3d(img_path, temp=5, depth=None, largura=None, altura=None, margem=MARGEM_PADRAO):
+    """
+    depth: mapa de profundidade float32 [0, 1] já resolvido (ex.: via obter_profundidades
+    em lote para todas as imagens do render). Se None, busca no cache de profundidade.
+    largura/altura: resolução do vídeo; a imagem é reduzida uma vez para (saída * margem)
+    e o remap roda na resolução de saída. Sem elas, usa a resolução da imagem.
+    """
+    pasta = pasta_temp()
     
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_depth.mp4")
-    depth_path = os.path.join('./outs/', f"{nome_base}_depth.png")
-
-    # modelo
-    processor, model, device = carregar_modelo_local()
-
-    # gera mapa de profundidade
-    image = Image.open(img_path).convert("RGB")
-    inputs = processor(images=image, return_tensors="pt").to(device)
-    
-    with torch.no_grad():
-        outputs = model(**inputs)
-        depth = outputs.predicted_depth[0].cpu().numpy()
+    saida = os.path.join(pasta, f"{nome_base}_depth{INTERMEDIARIO.extensao}")
 
-    depth = (depth - depth.min()) / (depth.max() - depth.min())
-    depth_uint8 = (depth * 255).astype(np.uint8)
-    
-    # Agora o diretório existe, então pode salvar
-    Image.fromarray(depth_uint8).save(depth_path)
-    print(f"✅ Mapa de profundidade salvo em: {depth_path}")
+    # mapa de profundidade (cache por hash da imagem; modelo só em caso de falta)
+    if depth is None:
+        depth = obter_profundidade(img_path)
 
     # render parallax
     img = cv2.imread(img_path)
     if img is None:
         raise ValueError(f"Erro ao carregar imagem: {img_path}")
         
-    h, w, _ = img.shape
-    depth_map = cv2.imread(depth_path, cv2.IMREAD_GRAYSCALE)
-    if depth_map is None:
-        raise ValueError(f"Erro ao carregar mapa de profundidade: {depth_path}")
-        
-    depth_map = depth_map.astype(np.float32) / 255.0
-    depth_map = cv2.resize(depth_map, (w, h))
+    img, depth_map, (w, h) = preparar_fonte(img, depth, largura, altura, margem)
     depth_map = cv2.GaussianBlur(depth_map, (15, 15), 0)
 
+    fps = 30
+    frames = int(temp * fps)
+
+    # Encoder H.264 final via ffmpeg (sem intermediário mp4v)
+    with FfmpegFrameSink(saida, w, h, fps) as out:
+        for frame in gerar_frames_depth_3d(img, depth_map, frames, fps, tamanho=(w, h)):
+            out.write(frame)
+    print(f"✅ Vídeo 3D salvo em: {saida}")
+
+    class Sucesso: 
+        filename = saida
+        
+    return Sucesso()
+
+
+def gerar_frames_depth_3d(img, depth_map, frames, fps=30, mapas_fixos=True, tamanho=None):
+    """
+    Gera os frames do parallax 3D sem alocar memória por frame.
+
+    Todos os buffers (mapas, frame de saída) são criados uma vez e reutilizados:
+    o frame entregue é sobrescrito na iteração seguinte (consumir antes de avançar).
+
+    Args:
+        img: imagem BGR uint8 (h, w, 3)
+        depth_map: profundidade float32 (h, w) em [0, 1], já suavizada
+        tamanho: (largura, altura) dos frames; a geometria do movimento é a da imagem,
+            amostrada numa grade do tamanho de saída (padrão: tamanho da imagem)
+        mapas_fixos: converte os mapas para ponto fixo (CV_16SC2) antes do remap,
+            que é bem mais rápido que o remap com mapas float (precisão de 1/32 px)
+    """
+    h, w, _ = img.shape
+    saida_w, saida_h = tamanho or (w, h)
     focus_x, focus_y = w * 0.5, h * 0.5
-    frames, amp, max_zoom, fps = int(temp * 30), 25, 1.12, 30
-    map_y, map_x = np.indices((h, w), dtype=np.float32)
-    
-    # Configuração do video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(saida, fourcc, fps, (w, h))
+    max_zoom = 1.12
 
     # Frequências em Hz (ciclos por segundo) para manter movimento consistente
     # independente da duração total do clipe.
@@ -95,41 +90,57 @@ def criar_video_depth_3d(img_path, temp=5):
     fade_secs = 0.35
     fade_frames = int(fade_secs * fps)
 
+    # Constantes por pixel, calculadas uma vez
+    depth_saida = reduzir_para_saida(depth_map, saida_w, saida_h)
+    inv_depth = np.subtract(1.0, depth_saida, dtype=np.float32)   # mais próximo = move mais
+    col_x, lin_y = grade_saida(w, h, saida_w, saida_h)
+
+    # Buffers reutilizados em todos os frames
+    map_x = np.empty((saida_h, saida_w), dtype=np.float32)
+    map_y = np.empty((saida_h, saida_w), dtype=np.float32)
+    linha_x = np.empty(saida_w, dtype=np.float32)
+    coluna_y = np.empty((saida_h, 1), dtype=np.float32)
+    frame = np.empty((saida_h, saida_w, 3), dtype=np.uint8)
+    if mapas_fixos:
+        mapa1 = np.empty((saida_h, saida_w, 2), dtype=np.int16)
+        mapa2 = np.empty((saida_h, saida_w), dtype=np.uint16)
+
     for i in range(frames):
         # tempo absoluto em segundos (não normalizado pela duração)
         t_sec = i / fps
 
         # janela suave de entrada/saída (cosine fade)
-        fade_in = 1.0 if i >= fade_frames else 0.5 * (1 - np.cos(np.pi * (i / max(1, fade_frames))))
-        fade_out = 1.0 if (frames - 1 - i) >= fade_frames else 0.5 * (1 - np.cos(np.pi * ((frames - 1 - i) / max(1, fade_frames))))
+        fade_in = 1.0 if i >= fade_frames else 0.5 * (1 - math.cos(math.pi * (i / max(1, fade_frames))))
+        fade_out = 1.0 if (frames - 1 - i) >= fade_frames else 0.5 * (1 - math.cos(math.pi * ((frames - 1 - i) / max(1, fade_frames))))
         env = min(fade_in, fade_out)
 
         # zoom oscila lentamente entre 1.0 e max_zoom
-        zoom = 1.0 + (max_zoom - 1.0) * (0.5 + 0.5 * np.sin(2 * np.pi * f_zoom * t_sec)) * env
+        zoom = 1.0 + (max_zoom - 1.0) * (0.5 + 0.5 * math.sin(2 * math.pi * f_zoom * t_sec)) * env
 
         # deslocamento de parallax periódico (profundidades mais próximas movem mais)
-        shift = (amp_px * (0.75 + 0.25 * np.sin(2 * np.pi * f_shift * t_sec))) * (1 - depth_map) * env
+        shift = (amp_px * (0.75 + 0.25 * math.sin(2 * math.pi * f_shift * t_sec))) * env
 
         # leve pan em X/Y para dar sensação de câmera
-        cx = focus_x + pan_x_amp * np.sin(2 * np.pi * f_pan * t_sec)
-        cy = focus_y + pan_y_amp * np.cos(2 * np.pi * f_pan * t_sec)
-        
-        map_x_zoom = (map_x - cx) / zoom + cx + shift
-        map_y_zoom = (map_y - cy) / zoom + cy
-        
-        warped = cv2.remap(
-            img,
-            map_x_zoom.astype(np.float32),
-            map_y_zoom.astype(np.float32),
-            interpolation=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_REFLECT
-        )
-        out.write(warped)
-    
-    out.release()
-    print(f"✅ Vídeo 3D salvo em: {saida}")
-
-    class Sucesso: 
-        filename = saida
-        
-    return Sucesso()
+        cx = focus_x + pan_x_amp * math.sin(2 * math.pi * f_pan * t_sec)
+        cy = focus_y + pan_y_amp * math.cos(2 * math.pi * f_pan * t_sec)
+
+        # map_x = (x - cx) / zoom + cx + shift * (1 - depth)
+        # map_y = (y - cy) / zoom + cy   (só depende da linha: calcula 1D e propaga)
+        escala = 1.0 / zoom
+        np.multiply(col_x, escala, out=linha_x)
+        linha_x += cx * (1.0 - escala)
+        np.multiply(inv_depth, shift, out=map_x)
+        map_x += linha_x
+
+        np.multiply(lin_y, escala, out=coluna_y)
+        coluna_y += cy * (1.0 - escala)
+        map_y[...] = coluna_y
+
+        if mapas_fixos:
+            cv2.convertMaps(map_x, map_y, cv2.CV_16SC2, dstmap1=mapa1, dstmap2=mapa2)
+            cv2.remap(img, mapa1, mapa2, interpolation=cv2.INTER_LINEAR,
+                      borderMode=cv2.BORDER_REFLECT, dst=frame)
+        else:
+            cv2.remap(img, map_x, map_y, interpolation=cv2.INTER_LINEAR,
+                      borderMode=cv2.BORDER_REFLECT, dst=frame)
+        yield frame
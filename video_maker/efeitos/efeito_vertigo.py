@@ -1,27 +1,71 @@
 # efeitos/efeito_vertigo.py
 import os, cv2, numpy as np
-from pathlib import Path
 
-def criar_video_vertigo_depth(img_path, temp=3, depth_path=None, fps=60, focus_x=0.5, focus_y=0.5):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+from video_maker.efeitos.cache_profundidade import obter_profundidade
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.frame_sink import FfmpegFrameSink
+from video_maker.efeitos.parallax_base import MARGEM_PADRAO, preparar_fonte, grade_saida, reduzir_para_saida
+from video_maker.render_context import pasta_temp
+
+def criar_video_vertigo_depth(img_path, temp=3, depth_path=None, fps=60, focus_x=0.5, focus_y=0.5, depth=None,
+                              largura=None, altura=None, margem=MARGEM_PADRAO):
+    """
+    Profundidade: 'depth' (float32 [0, 1]) > 'depth_path' (PNG em tons de cinza) >
+    cache de profundidade por hash da imagem.
+    largura/altura: resolução do vídeo (remap na resolução de saída, fonte reduzida
+    uma vez para saída * margem). Sem elas, usa a resolução da imagem.
+    """
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_vertigo.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_vertigo{INTERMEDIARIO.extensao}")
 
     img = cv2.imread(img_path)
-    h, w, _ = img.shape
-
-    depth = cv2.imread(depth_path, 0).astype(np.float32) / 255.0
-    depth = cv2.resize(depth, (w, h))
+    if img is None:
+        raise ValueError(f"Erro ao carregar imagem: {img_path}")
+
+    if depth is None:
+        if depth_path:
+            depth = cv2.imread(depth_path, 0).astype(np.float32) / 255.0
+        else:
+            depth = obter_profundidade(img_path)
+    img, depth, (w, h) = preparar_fonte(img, depth, largura, altura, margem)
     # suavização robusta (menos “vidro quebrado”)
     depth = cv2.bilateralFilter(depth, d=9, sigmaColor=0.15, sigmaSpace=7)
     depth = cv2.GaussianBlur(depth, (9, 9), 0)
 
+    n = int(temp * fps)
+    with FfmpegFrameSink(saida, w, h, fps) as out:
+        for frame in gerar_frames_vertigo(img, depth, n, focus_x, focus_y, tamanho=(w, h)):
+            out.write(frame)
+
+    class Sucesso: filename = saida
+    return Sucesso()
+
+
+def gerar_frames_vertigo(img, depth, n, focus_x=0.5, focus_y=0.5, mapas_fixos=True, tamanho=None):
+    """
+    Gera os frames do vertigo sem alocar memória por frame.
+
+    As máscaras são calculadas uma vez; mapas e frame de saída são buffers
+    reutilizados (o frame entregue é sobrescrito na iteração seguinte).
+
+    Args:
+        img: imagem BGR uint8 (h, w, 3)
+        depth: profundidade float32 (h, w) em [0, 1], já suavizada
+        mapas_fixos: remap com mapas em ponto fixo (CV_16SC2), mais rápido que float
+        tamanho: (largura, altura) dos frames, amostrados da imagem (padrão: tamanho da imagem)
+    """
+    h, w, _ = img.shape
+    saida_w, saida_h = tamanho or (w, h)
     cx, cy = w * focus_x, h * focus_y
     focus_d = float(depth[int(np.clip(cy, 0, h-1)), int(np.clip(cx, 0, w-1))])
 
-    n = int(temp * fps)
-    out = cv2.VideoWriter(saida, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
-    yy, xx = np.indices((h, w), dtype=np.float32)
+    # coordenadas (na imagem) de cada pixel de saída; máscaras na resolução de saída
+    col_x, lin_y = grade_saida(w, h, saida_w, saida_h)
+    xx = np.broadcast_to(col_x, (saida_h, saida_w))
+    yy = np.broadcast_to(lin_y, (saida_h, saida_w))
+    depth = reduzir_para_saida(depth, saida_w, saida_h)
+    img_saida = reduzir_para_saida(img, saida_w, saida_h)
 
     # parâmetros conservadores
     dolly_max     = 12.0   # intensidade de parallax total
@@ -46,6 +90,21 @@ def criar_video_vertigo_depth(img_path, temp=3, depth_path=None, fps=60, focus_x
 
     base = np.clip((depth - focus_d), -0.15, 0.15) * parallax_gain
 
+    # deslocamento por unidade de dolly: shift = clip(dolly * desloc, ±cap)
+    desloc_x = (dxn * base * mask * w).astype(np.float32)
+    desloc_y = (dyn * base * mask * h).astype(np.float32)
+    cap_x, cap_y = cap_rel * w, cap_rel * h
+    del dxn, dyn, radial, falloff, gx, gy, gmag, edge_suppress, mask, base
+
+    # Buffers reutilizados em todos os frames
+    map_x = np.empty((saida_h, saida_w), dtype=np.float32)
+    map_y = np.empty((saida_h, saida_w), dtype=np.float32)
+    warped = np.empty_like(img_saida)
+    blended = np.empty_like(img_saida)
+    if mapas_fixos:
+        mapa1 = np.empty((saida_h, saida_w, 2), dtype=np.int16)
+        mapa2 = np.empty((saida_h, saida_w), dtype=np.uint16)
+
     for i in range(n):
         t = i / max(1, n-1)
         ease = t*t*(3 - 2*t)  # smoothstep
@@ -53,27 +112,27 @@ def criar_video_vertigo_depth(img_path, temp=3, depth_path=None, fps=60, focus_x
         dolly = dolly_max * ease
         zoom  = 1.0 - zoom_out_max * ease
 
-        shift_scale = dolly * base * mask
-        shift_x = np.clip(dxn * shift_scale * w, -cap_rel*w, cap_rel*w)
-        shift_y = np.clip(dyn * shift_scale * h, -cap_rel*h, cap_rel*h)
-
-        map_x = xx + shift_x
-        map_y = yy + shift_y
-
-        map_x = (map_x - cx) / zoom + cx
-        map_y = (map_y - cy) / zoom + cy
-
-        warped = cv2.remap(
-            img,
-            map_x.astype(np.float32),
-            map_y.astype(np.float32),
-            interpolation=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_REFLECT_101
-        )
+        # map = (pos + clip(dolly * desloc) - c) / zoom + c
+        escala = 1.0 / zoom
+        np.multiply(desloc_x, dolly, out=map_x)
+        np.clip(map_x, -cap_x, cap_x, out=map_x)
+        map_x += xx
+        map_x *= escala
+        map_x += cx * (1.0 - escala)
+
+        np.multiply(desloc_y, dolly, out=map_y)
+        np.clip(map_y, -cap_y, cap_y, out=map_y)
+        map_y += yy
+        map_y *= escala
+        map_y += cy * (1.0 - escala)
+
+        if mapas_fixos:
+            cv2.convertMaps(map_x, map_y, cv2.CV_16SC2, dstmap1=mapa1, dstmap2=mapa2)
+            cv2.remap(img, mapa1, mapa2, interpolation=cv2.INTER_LINEAR,
+                      borderMode=cv2.BORDER_REFLECT_101, dst=warped)
+        else:
+            cv2.remap(img, map_x, map_y, interpolation=cv2.INTER_LINEAR,
+                      borderMode=cv2.BORDER_REFLECT_101, dst=warped)
         # leve mistura com o original para “amarrar” microartefatos
-        blended = cv2.addWeighted(warped, 0.92, img, 0.08, 0.0)
-        out.write(blended)
-
-    out.release()
-    class Sucesso: filename = saida
-    return Sucesso()
+        cv2.addWeighted(warped, 0.92, img_saida, 0.08, 0.0, dst=blended)
+        yield blended
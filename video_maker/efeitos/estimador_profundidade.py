@@ -0,0 +1,93 @@
+# efeitos/estimador_profundidade.py
+import os, threading, torch, numpy as np
+from pathlib import Path
+from PIL import Image
+from transformers import DPTImageProcessor, DPTForDepthEstimation
+
+from video_maker.efeitos.cache_profundidade import MODELO_ID
+
+_estimador = None
+_estimador_lock = threading.Lock()
+
+
+class EstimadorProfundidade:
+    """Modelo DPT carregado uma única vez por processo, com inferência em lote"""
+
+    def __init__(self, threads=None, tamanho_lote=None):
+        # threads intra-op do torch (0 = padrão do torch)
+        threads = int(threads or os.getenv("DEPTH_TORCH_THREADS", "0"))
+        if threads > 0:
+            torch.set_num_threads(threads)
+
+        self.tamanho_lote = int(tamanho_lote or os.getenv("DEPTH_BATCH", "8"))
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.processor, self.model = self._carregar()
+        self._inferencia_lock = threading.Lock()
+
+    def _carregar(self):
+        base_dir = Path("./models/models--Intel--dpt-hybrid-midas")
+
+        # tenta localizar o snapshot local
+        snapshot_dir = base_dir / "snapshots"
+        if snapshot_dir.exists():
+            snapshots = list(snapshot_dir.glob("*"))
+            if snapshots:
+                model_dir = snapshots[0]
+                print(f"✅ Usando modelo local ({model_dir.name}).")
+                processor = DPTImageProcessor.from_pretrained(str(model_dir), local_files_only=True)
+                model = DPTForDepthEstimation.from_pretrained(str(model_dir), local_files_only=True).to(self.device)
+                model.eval()
+                return processor, model
+
+        # se não achar, baixa da internet
+        print("📥 Baixando modelo da internet...")
+        Path("./models").mkdir(parents=True, exist_ok=True)
+        processor = DPTImageProcessor.from_pretrained(MODELO_ID, cache_dir="./models")
+        model = DPTForDepthEstimation.from_pretrained(MODELO_ID, cache_dir="./models").to(self.device)
+        model.eval()
+        return processor, model
+
+    def estimar(self, img_paths):
+        """
+        Estima profundidade para várias imagens em lotes
+
+        Returns:
+            list[np.ndarray]: mapas float32 normalizados em [0, 1] (resolução do modelo)
+        """
+        mapas = []
+        for i in range(0, len(img_paths), self.tamanho_lote):
+            lote = img_paths[i:i + self.tamanho_lote]
+            imagens = [Image.open(p).convert("RGB") for p in lote]
+
+            # tamanho fixo para permitir empilhar imagens de proporções diferentes
+            inputs = self.processor(images=imagens, keep_aspect_ratio=False, return_tensors="pt").to(self.device)
+
+            with self._inferencia_lock, torch.inference_mode():
+                depth = self.model(**inputs).predicted_depth.float().cpu().numpy()
+
+            for d in depth:
+                d = d.astype(np.float32)
+                d_min, d_max = float(d.min()), float(d.max())
+                mapas.append((d - d_min) / max(d_max - d_min, 1e-6))
+        return mapas
+
+
+def obter_estimador():
+    """Retorna o estimador do processo, carregando o modelo na primeira chamada"""
+    global _estimador
+    if _estimador is None:
+        with _estimador_lock:
+            if _estimador is None:
+                _estimador = EstimadorProfundidade()
+    return _estimador
+
+
+def estimar_profundidades(img_paths):
+    """Estima a profundidade de todas as imagens de um render em poucos forward passes"""
+    img_paths = [str(p) for p in img_paths]
+    return obter_estimador().estimar(img_paths) if img_paths else []
+
+
+def estimar_profundidade(img_path):
+    """Estima a profundidade de uma única imagem"""
+    return estimar_profundidades([img_path])[0]
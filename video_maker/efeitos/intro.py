@@ -1,11 +1,15 @@
 # efeitos/efeito_hook_visual.py
-import os, subprocess
+import os
 from pathlib import Path
 from efeitos.zoom_pulse import criar_video_pulse
 from efeitos.camera_instavel import criar_video_camera_instavel
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_context import pasta_temp
 
 def criar_video_hook_visual(img1, img2, temp_total=3.0):
-    Path("./outs").mkdir(parents=True, exist_ok=True)
+    outs = pasta_temp() / "outs"
+    outs.mkdir(parents=True, exist_ok=True)
     seg = 0.75  # 0,75s por efeito
 
     c1 = criar_video_pulse(img1, seg).filename
@@ -16,29 +20,28 @@ def criar_video_hook_visual(img1, img2, temp_total=3.0):
     # normaliza FPS/parametros pra concat (60 fps, yuv420p, libx264)
     norm = []
     for idx, clip in enumerate([c1, c2, c3, c4], 1):
-        outn = os.path.splitext(clip)[0] + f"_norm.mp4"
-        subprocess.run([
+        outn = os.path.splitext(clip)[0] + f"_norm{INTERMEDIARIO.extensao}"
+        executar_ffmpeg([
             "ffmpeg","-nostdin","-y","-hide_banner","-loglevel","error",
             "-i", clip, "-r","60", "-vf","format=yuv420p",
-            "-c:v","libx264","-preset","veryfast","-crf","21",
-            "-pix_fmt","yuv420p", outn
-        ], check=True)
+            *INTERMEDIARIO.args(), outn
+        ], duracao=seg, rotulo="hook_norm", execucao="efeito")
         norm.append(outn)
 
     # concatena os 4 segmentos
-    lista = os.path.join("outs", "hook_concat.txt")
+    lista = os.path.join(outs, "hook_concat.txt")
     with open(lista, "w", encoding="utf-8") as f:
         for n in norm:
             f.write(f"file '{os.path.abspath(n)}'\n")
 
-    base = f"hook_{Path(img1).stem}_{Path(img2).stem}.mp4"
-    saida = os.path.join("outs", base)
+    base = f"hook_{Path(img1).stem}_{Path(img2).stem}{INTERMEDIARIO.extensao}"
+    saida = os.path.join(outs, base)
 
-    subprocess.run([
+    executar_ffmpeg([
         "ffmpeg","-nostdin","-y","-hide_banner","-loglevel","error",
         "-f","concat","-safe","0","-i", lista,
         "-c","copy", saida
-    ], check=True)
+    ], rotulo="hook_concat", execucao="copia")
 
     class Sucesso: filename = saida
     return Sucesso()
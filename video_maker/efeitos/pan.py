@@ -1,24 +1,41 @@
 # efeitos/pan.py
-import os, subprocess
-from pathlib import Path
+import os
 
-def criar_video_pan(img_path: str, temp: float):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
-    nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_pan.mp4")
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads
+from video_maker.render_context import pasta_temp
+
+def filtro_pan(temp: float, entrada="0:v", saida=None, prefixo=""):
+    """
+    Trecho de filter_complex do efeito (vertical 720x1280).
+
+    Args:
+        entrada: label do stream de imagem
+        saida: label do resultado (None = saída sem label, para uso isolado)
+        prefixo: prefixo dos labels internos (permite vários efeitos no mesmo grafo)
+    """
+    p = prefixo
     total_frames = int(temp * 60)
     filtro = (
-        f"[0:v]"
+        f"[{entrada}]"
         "scale=720:-1:force_original_aspect_ratio=decrease,"
         "pad=720:1280:(720-iw)/2:(1280-ih)/2,"
-        "split=2[bg][src];"
-        "[bg]gblur=sigma=32[blur];"
-        f"[src]zoompan=z='pow(1.01, on)':"
+        f"split=2[{p}bg][{p}src];"
+        f"[{p}bg]gblur=sigma=32[{p}blur];"
+        f"[{p}src]zoompan=z='pow(1.01, on)':"
         f"x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':"
-        f"d={total_frames}:s=720x1280:fps=60[sharp];"
-        "[blur][sharp]overlay=(W-w)/2:(H-h)/2,"
+        f"d={total_frames}:s=720x1280:fps=60[{p}sharp];"
+        f"[{p}blur][{p}sharp]overlay=(W-w)/2:(H-h)/2,"
         "vignette=PI/3:eval=frame"
     )
+    return filtro + (f"[{saida}]" if saida else "")
+
+def criar_video_pan(img_path: str, temp: float):
+    pasta = pasta_temp()
+    nome_base = os.path.splitext(os.path.basename(img_path))[0]
+    saida = os.path.join(pasta, f"{nome_base}_camera_pan{INTERMEDIARIO.extensao}")
+    filtro = filtro_pan(temp)
 
     cmd = [
         "ffmpeg","-nostdin","-y","-hide_banner","-loglevel","error",
@@ -26,19 +43,19 @@ def criar_video_pan(img_path: str, temp: float):
         "-t", str(temp),
         "-filter_complex", filtro,
         "-r","60",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="pan", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
 
 def criar_video_pan_horizontal(img_path: str, temp: float):
     """Versão horizontal 16:9 para vídeos longos"""
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_pan_horizontal.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_camera_pan_horizontal{INTERMEDIARIO.extensao}")
 
     filtro = (
         "[0:v]"
@@ -60,10 +77,10 @@ def criar_video_pan_horizontal(img_path: str, temp: float):
         "-t", str(temp),
         "-filter_complex", filtro,
         "-r","60",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="pan", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
\ No newline at end of file
@@ -1,13 +1,17 @@
 # efeitos/panoramica_vertical.py
-import os, subprocess
-from pathlib import Path
+import os
+
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads
+from video_maker.render_context import pasta_temp
 
 def criar_video_panoramica_vertical(img_path, temp=5):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
 
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
     nome_limpo = nome_base.replace('(', '').replace(')', '').replace(' ', '_')
-    saida = os.path.join('./renders/temp/', f'{nome_limpo}_panoramica_vertical.mp4')
+    saida = os.path.join(pasta, f'{nome_limpo}_panoramica_vertical{INTERMEDIARIO.extensao}')
     
     filtro = "zoompan=z=1.5:x='iw/2-(iw/zoom/2)':y='if(lte(on,25),0,on)':d=1:s=720x1280:fps=30"
     cmd = [
@@ -16,21 +20,21 @@ def criar_video_panoramica_vertical(img_path, temp=5):
         "-t", str(temp),
         "-vf", filtro,
         "-r","30",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="panoramica", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
 
 def criar_video_panoramica_horizontal(img_path, temp=5):
     """Versão horizontal 16:9 para vídeos longos"""
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
 
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
     nome_limpo = nome_base.replace('(', '').replace(')', '').replace(' ', '_')
-    saida = os.path.join('./renders/temp/', f'{nome_limpo}_panoramica_horizontal.mp4')
+    saida = os.path.join(pasta, f'{nome_limpo}_panoramica_horizontal{INTERMEDIARIO.extensao}')
     
     # Panorâmica horizontal: movimento no eixo X
     filtro = "zoompan=z=1.5:x='if(lte(on,25),0,on)':y='ih/2-(ih/zoom/2)':d=1:s=1280x720:fps=30"
@@ -40,10 +44,10 @@ def criar_video_panoramica_horizontal(img_path, temp=5):
         "-t", str(temp),
         "-vf", filtro,
         "-r","30",
-        "-c:v","libx264","-preset","veryfast","-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, duracao=temp, rotulo="panoramica", execucao="efeito")
     class Sucesso: filename = saida
     return Sucesso()
\ No newline at end of file
@@ -0,0 +1,58 @@
+# efeitos/parallax_base.py
+import cv2, numpy as np
+
+# Folga de resolução da fonte em relação à saída: o zoom dos efeitos (até ~12%)
+# continua amostrando pixels reais em vez de interpolar a imagem ampliada.
+MARGEM_PADRAO = 1.15
+
+
+def preparar_fonte(img, depth, largura=None, altura=None, margem=MARGEM_PADRAO):
+    """
+    Redimensiona imagem e profundidade uma única vez para a resolução de trabalho.
+
+    A imagem é ajustada por cobertura (corte central na proporção da saída) para
+    (largura * margem, altura * margem). Sem largura/altura, mantém a resolução original.
+
+    Returns:
+        (img, depth, (largura, altura)): fonte redimensionada, profundidade float32
+        na resolução da fonte e tamanho final dos frames
+    """
+    h, w, _ = img.shape
+    depth = np.asarray(depth, dtype=np.float32)
+    if not largura or not altura:
+        return img, cv2.resize(depth, (w, h)), (w, h)
+
+    largura, altura = int(largura), int(altura)
+    fonte_w = max(largura, int(round(largura * margem)))
+    fonte_h = max(altura, int(round(altura * margem)))
+
+    # escala de cobertura + corte central
+    escala = max(fonte_w / w, fonte_h / h)
+    novo_w, novo_h = max(fonte_w, int(round(w * escala))), max(fonte_h, int(round(h * escala)))
+    interp = cv2.INTER_AREA if escala < 1 else cv2.INTER_CUBIC
+    x0, y0 = (novo_w - fonte_w) // 2, (novo_h - fonte_h) // 2
+
+    img = cv2.resize(img, (novo_w, novo_h), interpolation=interp)[y0:y0 + fonte_h, x0:x0 + fonte_w]
+    depth = cv2.resize(depth, (novo_w, novo_h))[y0:y0 + fonte_h, x0:x0 + fonte_w]
+    return np.ascontiguousarray(img), np.ascontiguousarray(depth), (largura, altura)
+
+
+def grade_saida(fonte_w, fonte_h, largura, altura):
+    """
+    Coordenadas (na fonte) dos centros dos pixels da saída.
+
+    Returns:
+        (xs, ys): float32 com formas (largura,) e (altura, 1)
+    """
+    kx, ky = fonte_w / largura, fonte_h / altura
+    xs = ((np.arange(largura, dtype=np.float32) + 0.5) * kx - 0.5).astype(np.float32)
+    ys = ((np.arange(altura, dtype=np.float32) + 0.5) * ky - 0.5).astype(np.float32)
+    return xs, ys[:, None]
+
+
+def reduzir_para_saida(mapa, largura, altura):
+    """Leva um mapa/imagem da fonte para a resolução de saída (sem cópia se já estiver)"""
+    h, w = mapa.shape[:2]
+    if (w, h) == (largura, altura):
+        return mapa
+    return cv2.resize(mapa, (largura, altura), interpolation=cv2.INTER_AREA)
@@ -1,17 +1,34 @@
-import os, subprocess
-from pathlib import Path
+import os
 
-def criar_video_zoom_invertido(img_path, temp=5):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
-    nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_zoom.mp4")
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads
+from video_maker.render_context import pasta_temp
 
+def filtro_zoom_invertido(entrada="0:v", saida=None, prefixo=""):
+    """
+    Trecho de filter_complex do efeito (vertical 720x1280).
+
+    Args:
+        entrada: label do stream de imagem
+        saida: label do resultado (None = saída sem label, para uso isolado)
+        prefixo: sem labels internos; mantido pela mesma assinatura dos outros efeitos
+    """
     # Zoom invertido (afasta aos poucos)
     filtro = (
+        f"[{entrada}]"
         "scale=iw*2.4:ih*2.4,"
         "zoompan=z='2.4-0.008*on':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':"
         "d=1:s=720x1280:fps=60,format=yuv420p"
     )
+    return filtro + (f"[{saida}]" if saida else "")
+
+def criar_video_zoom_invertido(img_path, temp=5):
+    pasta = pasta_temp()
+    nome_base = os.path.splitext(os.path.basename(img_path))[0]
+    saida = os.path.join(pasta, f"{nome_base}_zoom{INTERMEDIARIO.extensao}")
+
+    filtro = filtro_zoom_invertido()
 
     comando = [
         "ffmpeg","-y",
@@ -20,26 +37,24 @@ def criar_video_zoom_invertido(img_path, temp=5):
         "-filter_complex", filtro,
         "-t", str(temp),
         "-r","60",
-        "-c:v","libx264",
-        "-preset","veryfast",
-        "-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         str(saida)
     ]
-    result = subprocess.run(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    result = executar_ffmpeg(comando, duracao=temp, rotulo="zoom_invertido", execucao="efeito", check=False)
     if result.returncode == 0:
         class Sucesso:
             filename = saida
         return Sucesso()
     else:
-        print(f"❌ Erro ao processar {img_path}:\n{result.stderr.decode()}")
+        print(f"❌ Erro ao processar {img_path}:\n{result.stderr}")
         return None
 
 def criar_video_zoom_invertido_horizontal(img_path, temp=5):
     """Versão horizontal 16:9 para vídeos longos"""
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_zoom_horizontal.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_zoom_horizontal{INTERMEDIARIO.extensao}")
 
     # Zoom invertido (afasta aos poucos) - formato 16:9
     filtro = (
@@ -55,17 +70,15 @@ def criar_video_zoom_invertido_horizontal(img_path, temp=5):
         "-filter_complex", filtro,
         "-t", str(temp),
         "-r","60",
-        "-c:v","libx264",
-        "-preset","veryfast",
-        "-crf","21",
-        "-pix_fmt","yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         str(saida)
     ]
-    result = subprocess.run(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    result = executar_ffmpeg(comando, duracao=temp, rotulo="zoom_invertido", execucao="efeito", check=False)
     if result.returncode == 0:
         class Sucesso:
             filename = saida
         return Sucesso()
     else:
-        print(f"❌ Erro ao processar {img_path}:\n{result.stderr.decode()}")
+        print(f"❌ Erro ao processar {img_path}:\n{result.stderr}")
         return None
\ No newline at end of file
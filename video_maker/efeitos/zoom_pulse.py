@@ -1,11 +1,15 @@
 # efeitos/efeito_pulse.py
 import os, subprocess
-from pathlib import Path
+
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads
+from video_maker.render_context import pasta_temp
 
 def criar_video_pulse(img_path, temp=3, fps=30):
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_pulse.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_camera_pulse{INTERMEDIARIO.extensao}")
 
     # Filtro corrigido - usando 'on' corretamente
     filtro = (
@@ -25,13 +29,13 @@ def criar_video_pulse(img_path, temp=3, fps=30):
         "-t", str(temp),
         "-vf", filtro,
         "-r", str(fps),
-        "-c:v", "libx264", "-preset", "veryfast", "-crf", "21",
-        "-pix_fmt", "yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
     
     try:
-        subprocess.run(cmd, check=True)
+        executar_ffmpeg(cmd, duracao=temp, rotulo="zoom_pulse", execucao="efeito")
         class Sucesso: filename = saida
         return Sucesso()
     except subprocess.CalledProcessError as e:
@@ -40,9 +44,9 @@ def criar_video_pulse(img_path, temp=3, fps=30):
 
 def criar_video_pulse_horizontal(img_path, temp=3, fps=30):
     """Versão horizontal 16:9 para vídeos longos"""
-    Path('./renders/temp/').mkdir(parents=True, exist_ok=True)
+    pasta = pasta_temp()
     nome_base = os.path.splitext(os.path.basename(img_path))[0]
-    saida = os.path.join('./renders/temp/', f"{nome_base}_camera_pulse_horizontal.mp4")
+    saida = os.path.join(pasta, f"{nome_base}_camera_pulse_horizontal{INTERMEDIARIO.extensao}")
 
     # Filtro para formato 16:9
     filtro = (
@@ -62,13 +66,13 @@ def criar_video_pulse_horizontal(img_path, temp=3, fps=30):
         "-t", str(temp),
         "-vf", filtro,
         "-r", str(fps),
-        "-c:v", "libx264", "-preset", "veryfast", "-crf", "21",
-        "-pix_fmt", "yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         saida
     ]
     
     try:
-        subprocess.run(cmd, check=True)
+        executar_ffmpeg(cmd, duracao=temp, rotulo="zoom_pulse", execucao="efeito")
         class Sucesso: filename = saida
         return Sucesso()
     except subprocess.CalledProcessError as e:
@@ -0,0 +1,142 @@
+"""
+ENCODE SEGMENTADO - divide a linha do tempo do vídeo final em trechos alinhados a
+keyframe, encoda os trechos em paralelo (um ffmpeg por trecho, cada um com sua legenda
+deslocada), junta com concat em cópia e mixa o áudio uma única vez.
+
+Um libx264 sozinho num vídeo de 20-30 min não ocupa uma máquina com muitos núcleos;
+N trechos de ~4 threads cada ocupam.
+"""
+import math
+import shutil
+from pathlib import Path
+
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads, orcamento_cpu_padrao, renderizar_clipes
+from video_maker.subtitle_tools import recortar_ass
+
+THREADS_POR_SEGMENTO = 4
+DURACAO_MINIMA_SEGMENTO = 60.0  # trechos menores não compensam o custo fixo de cada ffmpeg
+GOP_SEGUNDOS = 2
+
+
+def segmentos_padrao(duracao: float, orcamento_cpu=None) -> int:
+    """Quantos trechos usar (1 = encode normal, sem segmentar)"""
+    nucleos = orcamento_cpu_padrao(orcamento_cpu)
+    return max(1, min(nucleos // THREADS_POR_SEGMENTO, int(duracao // DURACAO_MINIMA_SEGMENTO)))
+
+
+def dividir_linha_do_tempo(duracao: float, segmentos: int, fps: int = 30) -> list:
+    """
+    Bordas dos trechos em múltiplos do GOP (todo trecho começa num keyframe da grade).
+
+    Returns:
+        list[(inicio_s, fim_s, frames)]
+    """
+    total = int(math.ceil(duracao * fps))
+    passo = GOP_SEGUNDOS * fps
+    bordas = {0, total}
+    for k in range(1, segmentos):
+        borda = int(round(k * total / segmentos / passo)) * passo
+        if 0 < borda < total:
+            bordas.add(borda)
+    bordas = sorted(bordas)
+    return [(a / fps, b / fps, b - a) for a, b in zip(bordas, bordas[1:])]
+
+
+def entrada_com_seek(args_entrada: list):
+    """Entrada de trecho para fontes com seek (ex.: lista do concat demuxer de clipes)"""
+    def _entrada(inicio, fim, pasta):
+        return ["-ss", f"{inicio:.3f}", "-t", f"{fim - inicio:.3f}", *args_entrada]
+    return _entrada
+
+
+def encodar_segmentado(entrada_segmento, duracao: float, saida, fps: int = 30, ass_path=None,
+                       audio_path=None, perfil_video=None, segmentos=None, orcamento_cpu=None,
+                       opcoes_video=()) -> Path:
+    """
+    Encoda o vídeo em trechos paralelos e junta sem re-encode.
+
+    Args:
+        entrada_segmento: funcao(inicio, fim, pasta) -> argumentos de entrada do ffmpeg para
+            o trecho, com timestamps começando em 0 (caminhos absolutos)
+        ass_path: legenda queimada (recortada e deslocada para cada trecho)
+        audio_path: se informado, mixado (aac 192k) no concat final
+        segmentos: número de trechos (padrão: segmentos_padrao)
+        opcoes_video: opções extras do encoder (ex.: -tune stillimage)
+
+    Returns:
+        Path do vídeo. Levanta RuntimeError se algum trecho ou o concat falhar.
+    """
+    saida = Path(saida)
+    perfil_video = perfil_video or FINAL
+    segmentos = segmentos or segmentos_padrao(duracao, orcamento_cpu)
+    trechos = dividir_linha_do_tempo(duracao, segmentos, fps)
+
+    pasta = saida.parent / f"{saida.stem}_segmentos"
+    pasta.mkdir(parents=True, exist_ok=True)
+    print(f"🧩 Encode segmentado: {len(trechos)} trechos de ~{duracao / len(trechos):.0f}s")
+
+    def _encodar(i, inicio, fim, frames):
+        arquivo = pasta / f"seg_{i:03d}{perfil_video.extensao}"
+        filtros = []
+        if ass_path:
+            legenda = pasta / f"seg_{i:03d}.ass"
+            recortar_ass(ass_path, legenda, inicio, fim)
+            filtros.append(f"ass={legenda.name}")
+        filtros += [f"fps={fps}", "setsar=1"]
+        cmd = [
+            "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+            *entrada_segmento(inicio, fim, pasta),
+            "-an",
+            "-vf", ",".join(filtros),
+            *perfil_video.args(), *opcoes_video,
+            "-force_key_frames", f"expr:gte(t,n_forced*{GOP_SEGUNDOS})",
+            *args_threads(),
+            "-frames:v", str(frames),
+            arquivo.name
+        ]
+        result = executar_ffmpeg(cmd, duracao=fim - inicio, rotulo=f"trecho {i + 1}/{len(trechos)}", cwd=pasta, check=False)
+        if result.returncode != 0 or not arquivo.exists():
+            raise RuntimeError(f"trecho {i} ({inicio:.1f}-{fim:.1f}s): {result.stderr[-500:]}")
+        return arquivo
+
+    tarefas = [
+        (i, lambda i=i, t=t: _encodar(i, *t))
+        for i, t in enumerate(trechos)
+    ]
+    resultados = renderizar_clipes(tarefas, orcamento_cpu=orcamento_cpu, max_paralelo=len(trechos))
+    erros = [erro for _, erro in resultados if erro is not None]
+    if erros:
+        raise RuntimeError(f"Encode segmentado falhou: {erros[0]}")
+
+    concatenar_trechos([arquivo for arquivo, _ in resultados], saida, audio_path)
+    shutil.rmtree(pasta, ignore_errors=True)
+    return saida
+
+
+def concatenar_trechos(arquivos, saida, audio_path=None) -> Path:
+    """
+    Junta trechos encodados com os mesmos parâmetros (concat em cópia) e, se informado,
+    mixa o áudio (aac 192k) no mesmo passo.
+    """
+    saida = Path(saida)
+    arquivos = [Path(a).resolve() for a in arquivos]
+    lista = saida.parent / f"{saida.stem}_trechos.txt"
+    with open(lista, "w", encoding="utf-8") as f:
+        for arquivo in arquivos:
+            caminho = arquivo.as_posix().replace("'", "'\\''")
+            f.write(f"file '{caminho}'\n")
+
+    cmd = ["ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+           "-f", "concat", "-safe", "0", "-i", str(lista)]
+    if audio_path:
+        cmd += ["-i", str(Path(audio_path).resolve()), "-map", "0:v", "-map", "1:a",
+                "-c:a", "aac", "-b:a", "192k", "-shortest"]
+    cmd += ["-c:v", "copy", "-movflags", "+faststart", str(saida)]
+    result = executar_ffmpeg(cmd, rotulo="concat", execucao="copia", check=False)
+    lista.unlink(missing_ok=True)
+    if result.returncode != 0 or not saida.exists():
+        saida.unlink(missing_ok=True)
+        raise RuntimeError(f"Concat dos trechos falhou: {result.stderr[-500:]}")
+    return saida
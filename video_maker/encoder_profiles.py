@@ -0,0 +1,270 @@
+"""
+PERFIS DE ENCODER - política de encode dos intermediários e do vídeo entregue
+
+Os intermediários são decodificados e re-encodados depois. O padrão é quase sem perdas
+(CRF 12, perda invisível depois do encode final) com uma fração do disco do qp 0; os
+perfis sem perdas continuam disponíveis para quem tiver scratch de sobra.
+
+Perfis nomeados (perfil(nome)):
+  intermediario  PERFIL_INTERMEDIARIO (x264_quase | x264_lossless | x264_intra | ffv1 | h264)
+  final          PERFIL_FINAL (x264_final)      - vídeo entregue
+  preview        PERFIL_PREVIEW (x264_preview)  - renders de conferência
+
+Cada template entrega com o preset/CRF que já usava (perfil_final(padrao)); PERFIL_FINAL
+definido no ambiente troca o perfil de entrega de todos (ex.: x264_final em todos).
+
+Encoders de hardware (NVENC/QSV/VideoToolbox) só são usados se pedidos (hardware=True,
+ex.: ENCODER_HARDWARE no canal) e se um encode de teste funcionar nesta máquina
+(resultado em cache por host).
+"""
+import errno
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from video_maker.cache_disco import CACHE_DIR
+
+
+@dataclass(frozen=True)
+class PerfilEncoder:
+    nome: str
+    codec: str
+    opcoes: tuple = ()
+    pix_fmt: str = "yuv420p"
+    extensao: str = ".mp4"
+    # Taxa estimada (Mbit/s) em 1280x720 @ 30fps, usada só para checar espaço em disco
+    mbps_720p30: float = 8.0
+
+    def args(self) -> list:
+        """Argumentos de vídeo do ffmpeg (codec, opções e pix_fmt)"""
+        return ["-c:v", self.codec, *self.opcoes, "-pix_fmt", self.pix_fmt]
+
+    def chave(self) -> dict:
+        """Identificação do perfil para chaves de cache"""
+        return {"codec": self.codec, "opcoes": list(self.opcoes), "pix_fmt": self.pix_fmt}
+
+    def estimar_bytes(self, duracao: float, largura: int = 1280, altura: int = 720, fps: float = 30) -> int:
+        """Tamanho aproximado de um intermediário com esse perfil"""
+        escala = (largura * altura) / (1280 * 720) * (fps / 30)
+        return int(self.mbps_720p30 * 1_000_000 / 8 * duracao * escala)
+
+
+PERFIS = {
+    # quase sem perdas (padrão): ~4x menos disco que o qp 0 em 720p30, GOP normal
+    "x264_quase": PerfilEncoder(
+        "x264_quase", "libx264", ("-preset", "veryfast", "-crf", "12"),
+        mbps_720p30=30.0
+    ),
+    # sem perdas; GOP normal para que clipes de imagem parada fiquem pequenos
+    "x264_lossless": PerfilEncoder(
+        "x264_lossless", "libx264", ("-preset", "ultrafast", "-qp", "0"),
+        mbps_720p30=120.0
+    ),
+    # sem perdas e só keyframes: corte/seek exato, decode mais leve, mais disco
+    "x264_intra": PerfilEncoder(
+        "x264_intra", "libx264", ("-preset", "ultrafast", "-qp", "0", "-g", "1"),
+        mbps_720p30=180.0
+    ),
+    # FFV1 intra (exige container .mkv)
+    "ffv1": PerfilEncoder(
+        "ffv1", "ffv1", ("-level", "3", "-g", "1", "-slices", "4", "-slicecrc", "0"),
+        extensao=".mkv", mbps_720p30=150.0
+    ),
+    # comportamento antigo: H.264 com perda (ocupa pouco disco)
+    "h264": PerfilEncoder(
+        "h264", "libx264", ("-preset", "veryfast", "-crf", "21"),
+        mbps_720p30=6.0
+    ),
+    # entrega dos templates filosofia/estático (medium CRF 18, como já entregavam)
+    "x264_final": PerfilEncoder(
+        "x264_final", "libx264", ("-preset", "medium", "-crf", "18"),
+        mbps_720p30=5.0
+    ),
+    # entrega dos templates sequenciais (fast CRF 21, como já entregavam)
+    "x264_rapido": PerfilEncoder(
+        "x264_rapido", "libx264", ("-preset", "fast", "-crf", "21"),
+        mbps_720p30=3.5
+    ),
+    # entrega do long_religioso sem hardware (medium CRF 23, como já entregava)
+    "x264_medio": PerfilEncoder(
+        "x264_medio", "libx264", ("-preset", "medium", "-crf", "23"),
+        mbps_720p30=2.5
+    ),
+    # conferência: veryfast encoda bem mais rápido que medium; CRF 23 compensa o tamanho
+    "x264_preview": PerfilEncoder(
+        "x264_preview", "libx264", ("-preset", "veryfast", "-crf", "23"),
+        mbps_720p30=3.0
+    ),
+}
+
+# Equivalentes de hardware por nível (qualidade constante ~ CRF do perfil de software):
+# final ~ x264_final (18-19), rapido ~ x264_rapido (21), medio ~ x264_medio e preview (23)
+PERFIS_HARDWARE = {
+    "h264_nvenc": {
+        "final": PerfilEncoder("nvenc_final", "h264_nvenc", ("-preset", "p5", "-rc", "vbr", "-cq", "19", "-b:v", "0")),
+        "rapido": PerfilEncoder("nvenc_rapido", "h264_nvenc", ("-preset", "p4", "-rc", "vbr", "-cq", "21", "-b:v", "0")),
+        "medio": PerfilEncoder("nvenc_medio", "h264_nvenc", ("-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0")),
+        "preview": PerfilEncoder("nvenc_preview", "h264_nvenc", ("-preset", "p2", "-rc", "vbr", "-cq", "23", "-b:v", "0")),
+    },
+    "h264_qsv": {
+        "final": PerfilEncoder("qsv_final", "h264_qsv", ("-preset", "medium", "-global_quality", "19")),
+        "rapido": PerfilEncoder("qsv_rapido", "h264_qsv", ("-preset", "fast", "-global_quality", "21")),
+        "medio": PerfilEncoder("qsv_medio", "h264_qsv", ("-preset", "medium", "-global_quality", "23")),
+        "preview": PerfilEncoder("qsv_preview", "h264_qsv", ("-preset", "veryfast", "-global_quality", "23")),
+    },
+    "h264_videotoolbox": {
+        "final": PerfilEncoder("videotoolbox_final", "h264_videotoolbox", ("-q:v", "65")),
+        "rapido": PerfilEncoder("videotoolbox_rapido", "h264_videotoolbox", ("-q:v", "60")),
+        "medio": PerfilEncoder("videotoolbox_medio", "h264_videotoolbox", ("-q:v", "55")),
+        "preview": PerfilEncoder("videotoolbox_preview", "h264_videotoolbox", ("-q:v", "50")),
+    },
+}
+
+# perfil de software -> nível de hardware equivalente
+NIVEL_HARDWARE = {
+    "x264_final": "final",
+    "x264_rapido": "rapido",
+    "x264_medio": "medio",
+    "x264_preview": "preview",
+}
+
+ARQUIVO_SONDAGEM = CACHE_DIR / f"encoders_{socket.gethostname()}.json"
+
+_sondagem = None
+_sondagem_lock = threading.Lock()
+
+
+def obter_perfil(nome: str) -> PerfilEncoder:
+    if nome not in PERFIS:
+        raise ValueError(f"Perfil de encoder '{nome}' não encontrado. Perfis disponíveis: {list(PERFIS.keys())}")
+    return PERFIS[nome]
+
+
+INTERMEDIARIO = obter_perfil(os.getenv("PERFIL_INTERMEDIARIO", "x264_quase"))
+
+PERFIS_NOMEADOS = {
+    "intermediario": INTERMEDIARIO,
+    "final": obter_perfil(os.getenv("PERFIL_FINAL", "x264_final")),
+    "preview": obter_perfil(os.getenv("PERFIL_PREVIEW", "x264_preview")),
+}
+FINAL = PERFIS_NOMEADOS["final"]
+PREVIEW = PERFIS_NOMEADOS["preview"]
+
+
+def _testar_encoder(encoder: str) -> bool:
+    """Encoda alguns frames sintéticos: listar em 'ffmpeg -encoders' não garante GPU/driver"""
+    try:
+        resultado = subprocess.run(
+            ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", "color=c=black:s=256x144:r=30",
+             "-frames:v", "5", "-pix_fmt", "yuv420p", "-c:v", encoder, "-f", "null", "-"],
+            capture_output=True, text=True, timeout=30
+        )
+        return resultado.returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+
+def _id_ffmpeg() -> str:
+    """Identifica o binário do ffmpeg (trocou o ffmpeg = nova sondagem)"""
+    caminho = shutil.which("ffmpeg")
+    if not caminho:
+        return ""
+    st = os.stat(caminho)
+    return f"{caminho}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def encoders_funcionais() -> dict:
+    """
+    {encoder_hardware: funciona?} para esta máquina.
+
+    Sondado uma vez por host/binário do ffmpeg e gravado em ARQUIVO_SONDAGEM;
+    nas execuções seguintes não lança nenhum subprocesso.
+    """
+    global _sondagem
+    with _sondagem_lock:
+        if _sondagem is not None:
+            return _sondagem
+
+        id_ffmpeg = _id_ffmpeg()
+        try:
+            dados = json.loads(ARQUIVO_SONDAGEM.read_text(encoding="utf-8"))
+            if dados.get("ffmpeg") == id_ffmpeg and set(dados.get("encoders", {})) == set(PERFIS_HARDWARE):
+                _sondagem = dados["encoders"]
+                return _sondagem
+        except (OSError, ValueError):
+            pass
+
+        print("🔎 Testando encoders de hardware...")
+        _sondagem = {enc: bool(id_ffmpeg) and _testar_encoder(enc) for enc in PERFIS_HARDWARE}
+        for enc, ok in _sondagem.items():
+            print(f"   {'✅' if ok else '❌'} {enc}")
+        try:
+            ARQUIVO_SONDAGEM.parent.mkdir(parents=True, exist_ok=True)
+            ARQUIVO_SONDAGEM.write_text(
+                json.dumps({"ffmpeg": id_ffmpeg, "encoders": _sondagem}, indent=2), encoding="utf-8"
+            )
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar a sondagem de encoders: {e}")
+        return _sondagem
+
+
+def perfil(nome: str, hardware: bool = False) -> PerfilEncoder:
+    """
+    Perfil nomeado: 'intermediario', 'final' ou 'preview'.
+
+    hardware=True troca final/preview pelo primeiro encoder de hardware que passou
+    no encode de teste (sem nenhum, continua no libx264).
+    """
+    if nome not in PERFIS_NOMEADOS:
+        raise ValueError(f"Perfil nomeado '{nome}' não encontrado. Use: {list(PERFIS_NOMEADOS.keys())}")
+    if hardware and nome != "intermediario":
+        for encoder, ok in encoders_funcionais().items():
+            if ok:
+                return PERFIS_HARDWARE[encoder][nome]
+    return PERFIS_NOMEADOS[nome]
+
+
+def perfil_final(padrao: str = "x264_final", hardware: bool = False) -> PerfilEncoder:
+    """
+    Perfil de entrega de um template.
+
+    Args:
+        padrao: perfil que o template já usava; PERFIL_FINAL no ambiente tem prioridade
+        hardware: tenta o encoder de hardware do mesmo nível de qualidade (opt-in;
+            sem encoder funcional, continua no libx264)
+    """
+    nome = os.getenv("PERFIL_FINAL") or padrao
+    software = obter_perfil(nome)
+    if hardware and nome in NIVEL_HARDWARE:
+        for encoder, ok in encoders_funcionais().items():
+            if ok:
+                return PERFIS_HARDWARE[encoder][NIVEL_HARDWARE[nome]]
+    return software
+
+
+def verificar_espaco_scratch(diretorio, bytes_necessarios: int, folga: float = 1.2):
+    """
+    Confere se há espaço livre para os intermediários antes de começar o render.
+
+    Raises:
+        OSError (ENOSPC): espaço livre menor que bytes_necessarios * folga
+    """
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    livre = shutil.disk_usage(diretorio).free
+    necessario = int(bytes_necessarios * folga)
+    gb = 1024 ** 3
+    if livre < necessario:
+        raise OSError(
+            errno.ENOSPC,
+            f"Espaço insuficiente em {diretorio} para intermediários '{INTERMEDIARIO.nome}': "
+            f"{livre / gb:.1f} GB livres, ~{necessario / gb:.1f} GB necessários "
+            f"(use PERFIL_INTERMEDIARIO=h264 para economizar disco)"
+        )
+    print(f"💾 Scratch: {livre / gb:.1f} GB livres, ~{necessario / gb:.1f} GB estimados ({INTERMEDIARIO.nome})")
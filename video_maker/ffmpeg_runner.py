@@ -0,0 +1,306 @@
+"""
+FFMPEG RUNNER - ponto único de execução do ffmpeg
+
+- '-progress pipe:1' vira eventos de progresso (tempo encodado, velocidade, fps, % e ETA);
+  quem quer acompanhar (ex.: a task do Celery) registra um callback com ouvir_progresso()
+- perfis de execução: limite de threads, prioridade (nice), timeout e novas tentativas
+  para falhas transitórias
+- cada execução grava tempo, CPU do processo filho e pico de memória no arquivo de
+  métricas do job (JSONL), definido com metricas_do_job()
+
+Callback e job valem para o contexto atual, inclusive tarefas disparadas por renderizar_clipes.
+"""
+import contextvars
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Optional
+
+from video_maker.render_paralelo import threads_ffmpeg_atual
+
+_callback_progresso: contextvars.ContextVar = contextvars.ContextVar("callback_progresso", default=None)
+_job_atual: contextvars.ContextVar = contextvars.ContextVar("job_metricas", default=None)
+_lock_metricas = threading.Lock()
+
+INTERVALO_EVENTOS = 1.0  # segundos entre eventos do mesmo processo
+PASTA_METRICAS = Path(os.getenv("METRICAS_DIR", "./renders/metricas"))
+
+# Trechos do stderr que indicam falha transitória (vale tentar de novo)
+ERROS_TRANSITORIOS = (
+    "Resource temporarily unavailable",
+    "Cannot allocate memory",
+    "Too many open files",
+    "Device or resource busy",
+    "Connection reset",
+)
+
+
+@dataclass(frozen=True)
+class PerfilExecucao:
+    nome: str
+    threads: Optional[int] = None   # -threads do encoder fora do pool (dentro do pool vale args_threads)
+    nice: int = 0                   # prioridade do processo (POSIX: nice; Windows: abaixo do normal se > 0)
+    timeout: Optional[float] = None # segundos até matar o processo (mínimo, se houver fator)
+    timeout_fator: Optional[float] = None  # timeout = max(timeout, fator * duracao da saída)
+    tentativas: int = 1             # execuções em caso de falha transitória
+
+    def timeout_para(self, duracao: Optional[float]) -> Optional[float]:
+        """Timeout efetivo para uma saída de 'duracao' segundos"""
+        if self.timeout_fator and duracao:
+            return max(self.timeout or 0, self.timeout_fator * duracao)
+        return self.timeout
+
+
+PERFIS_EXECUCAO = {
+    # vídeo entregue: prioridade normal, todas as threads; timeout proporcional à duração
+    # (vídeos longos), no mínimo os 600s que os templates longos já usavam
+    "final": PerfilExecucao("final", timeout=600,
+                            timeout_fator=float(os.getenv("FFMPEG_TIMEOUT_FINAL_FATOR", "4"))),
+    # clipes de efeito e intermediários: cedem CPU ao encode final
+    "efeito": PerfilExecucao("efeito", threads=int(os.getenv("FFMPEG_THREADS_EFEITO", "4")),
+                             nice=5, timeout=900, tentativas=2),
+    # áudio: leve, poucas threads
+    "audio": PerfilExecucao("audio", threads=2, nice=5, timeout=600, tentativas=2),
+    # concat/mux em cópia: rápidos, I/O
+    "copia": PerfilExecucao("copia", threads=1, timeout=600, tentativas=2),
+}
+
+
+@dataclass
+class ProgressoFfmpeg:
+    rotulo: str = ""
+    tempo: float = 0.0              # segundos de mídia já encodados
+    duracao: Optional[float] = None # duração esperada da saída (se conhecida)
+    velocidade: float = 0.0         # 1.0 = tempo real
+    fps: float = 0.0
+    frame: int = 0
+    concluido: bool = False
+
+    @property
+    def percentual(self) -> Optional[float]:
+        if self.concluido:
+            return 100.0
+        if not self.duracao:
+            return None
+        return max(0.0, min(100.0, self.tempo / self.duracao * 100))
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados pela velocidade atual"""
+        if self.concluido:
+            return 0.0
+        if not self.duracao or self.velocidade <= 0:
+            return None
+        return max(0.0, (self.duracao - self.tempo) / self.velocidade)
+
+
+@contextmanager
+def ouvir_progresso(callback: Callable[[ProgressoFfmpeg], None]):
+    """Registra o callback de progresso para os ffmpeg executados dentro do bloco"""
+    token = _callback_progresso.set(callback)
+    try:
+        yield
+    finally:
+        _callback_progresso.reset(token)
+
+
+@contextmanager
+def metricas_do_job(job: str, pasta=None):
+    """Grava as métricas dos ffmpeg executados dentro do bloco em PASTA_METRICAS/<job>.jsonl"""
+    arquivo = Path(pasta or PASTA_METRICAS) / f"{job}.jsonl"
+    token = _job_atual.set((job, arquivo))
+    try:
+        yield arquivo
+    finally:
+        _job_atual.reset(token)
+
+
+def _registrar_metrica(registro: dict):
+    job = _job_atual.get()
+    if not job:
+        return
+    nome, arquivo = job
+    registro = {"job": nome, **registro}
+    try:
+        with _lock_metricas:
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            with open(arquivo, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar métricas: {e}")
+
+
+def _numero(valor: str, tipo=float, padrao=0):
+    try:
+        return tipo(valor.strip().rstrip("x"))
+    except (ValueError, AttributeError):
+        return padrao
+
+
+def _com_progresso(cmd: list) -> list:
+    """Insere '-progress pipe:1 -nostats' logo após o executável"""
+    return [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+
+def _com_threads(cmd: list, perfil: PerfilExecucao) -> list:
+    """Limita as threads do encoder (antes da saída) se o comando ainda não limita"""
+    if "-threads" in cmd:
+        return cmd
+    threads = threads_ffmpeg_atual() or perfil.threads
+    if not threads:
+        return cmd
+    return [*cmd[:-1], "-threads", str(threads), cmd[-1]]
+
+
+def _opcoes_prioridade(nice: int) -> dict:
+    """Prioridade no Windows (no POSIX ela é ajustada depois do Popen, ver _baixar_prioridade)"""
+    if nice > 0 and sys.platform == "win32":
+        return {"creationflags": subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+    return {}
+
+
+def _baixar_prioridade(pid: int, nice: int):
+    """
+    setpriority no filho já criado: preexec_fn não é seguro com threads no processo
+    (renderizar_clipes e o pool de threads do Celery chamam o ffmpeg em paralelo).
+    """
+    if nice <= 0 or not hasattr(os, "setpriority"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, nice)
+    except OSError:
+        pass  # processo já terminou
+
+
+def _aguardar(processo):
+    """
+    Espera o processo e devolve o uso de recursos dele (os.wait4; None onde não existe).
+
+    Returns:
+        dict | None: cpu_usuario, cpu_sistema (s) e rss_max_mb
+    """
+    if not hasattr(os, "wait4"):
+        processo.wait()
+        return None
+    try:
+        _, status, uso = os.wait4(processo.pid, 0)
+    except ChildProcessError:
+        processo.wait()
+        return None
+    processo.returncode = os.waitstatus_to_exitcode(status)
+    rss = uso.ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else uso.ru_maxrss / 1024
+    return {"cpu_usuario": round(uso.ru_utime, 3), "cpu_sistema": round(uso.ru_stime, 3),
+            "rss_max_mb": round(rss, 1)}
+
+
+def _executar_uma_vez(cmd, duracao, rotulo, cwd, callback, perfil, linhas_stderr):
+    processo = subprocess.Popen(
+        _com_progresso(cmd), cwd=cwd,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, encoding="utf-8", errors="replace",
+        **_opcoes_prioridade(perfil.nice)
+    )
+    _baixar_prioridade(processo.pid, perfil.nice)
+
+    # timeout: mata o processo; o loop de leitura termina quando o pipe fecha
+    estourou = threading.Event()
+    def _matar():
+        estourou.set()
+        processo.kill()
+    relogio = threading.Timer(perfil.timeout, _matar) if perfil.timeout else None
+    if relogio:
+        relogio.daemon = True
+        relogio.start()
+
+    # stderr lido em paralelo (evita travar o ffmpeg com o pipe cheio); guarda só o final
+    cauda_stderr = deque(maxlen=linhas_stderr)
+    leitor = threading.Thread(target=lambda: cauda_stderr.extend(processo.stderr), daemon=True)
+    leitor.start()
+
+    evento = ProgressoFfmpeg(rotulo=rotulo, duracao=duracao)
+    ultimo_envio = 0.0
+    for linha in processo.stdout:
+        chave, _, valor = linha.strip().partition("=")
+        if chave in ("out_time_us", "out_time_ms"):  # ambos em microssegundos
+            evento.tempo = max(evento.tempo, _numero(valor, int, 0) / 1_000_000)
+        elif chave == "speed":
+            evento.velocidade = _numero(valor)
+        elif chave == "fps":
+            evento.fps = _numero(valor)
+        elif chave == "frame":
+            evento.frame = _numero(valor, int, 0)
+        elif chave == "progress" and callback:
+            agora = time.monotonic()
+            if valor == "end" or agora - ultimo_envio >= INTERVALO_EVENTOS:
+                ultimo_envio = agora
+                evento.concluido = valor == "end"
+                try:
+                    callback(replace(evento))
+                except Exception as e:
+                    print(f"⚠️ Callback de progresso falhou: {e}")
+
+    uso = _aguardar(processo)
+    if relogio:
+        relogio.cancel()
+    leitor.join()
+    return processo.returncode, "".join(cauda_stderr), uso, estourou.is_set(), evento
+
+
+def executar_ffmpeg(cmd: list, duracao: Optional[float] = None, rotulo: str = "", cwd=None,
+                    check: bool = True, callback=None, execucao: str = "final",
+                    linhas_stderr: Optional[int] = 200) -> subprocess.CompletedProcess:
+    """
+    Executa um comando ffmpeg emitindo eventos de progresso e registrando métricas.
+
+    Args:
+        cmd: comando completo (cmd[0] = 'ffmpeg', último argumento = saída);
+            não deve usar stdout como saída
+        duracao: duração esperada da saída, para % e ETA
+        rotulo: identifica a etapa nos eventos e nas métricas (ex.: 'final', 'bloco 3')
+        check: levanta CalledProcessError (com stderr) se o ffmpeg falhar
+        callback: sobrepõe o callback do contexto (ouvir_progresso)
+        execucao: perfil de execução (PERFIS_EXECUCAO): threads, nice, timeout, tentativas
+        linhas_stderr: linhas finais do stderr guardadas (None = todas, ex.: silencedetect)
+
+    Returns:
+        CompletedProcess com returncode e stderr (stdout fica vazio).
+        Levanta subprocess.TimeoutExpired se o perfil tiver timeout e ele estourar.
+    """
+    perfil = PERFIS_EXECUCAO[execucao]
+    perfil = replace(perfil, timeout=perfil.timeout_para(duracao))
+    callback = callback or _callback_progresso.get()
+    cmd = _com_threads([str(c) for c in cmd], perfil)
+
+    for tentativa in range(1, max(1, perfil.tentativas) + 1):
+        inicio = time.monotonic()
+        codigo, stderr, uso, estourou, evento = _executar_uma_vez(
+            cmd, duracao, rotulo, cwd, callback, perfil, linhas_stderr
+        )
+        _registrar_metrica({
+            "ts": time.time(), "rotulo": rotulo, "execucao": perfil.nome,
+            "saida": cmd[-1], "tentativa": tentativa, "codigo": codigo,
+            "timeout": estourou, "segundos": round(time.monotonic() - inicio, 3),
+            "tempo_midia": round(evento.tempo, 3), "velocidade": evento.velocidade,
+            **(uso or {}),
+        })
+        if codigo == 0 or estourou:
+            break
+        transitoria = codigo < 0 or any(t in stderr for t in ERROS_TRANSITORIOS)
+        if not transitoria or tentativa >= perfil.tentativas:
+            break
+        print(f"🔁 ffmpeg ({rotulo or perfil.nome}) falhou (código {codigo}), tentando de novo...")
+        time.sleep(tentativa)
+
+    if estourou:
+        raise subprocess.TimeoutExpired(cmd, perfil.timeout, stderr=stderr)
+    resultado = subprocess.CompletedProcess(cmd, codigo, "", stderr)
+    if check and codigo != 0:
+        raise subprocess.CalledProcessError(codigo, cmd, output="", stderr=stderr)
+    return resultado
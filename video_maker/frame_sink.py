@@ -0,0 +1,98 @@
+"""
+FRAME SINK - envia frames NumPy (BGR) direto para um encoder ffmpeg via stdin
+"""
+import subprocess
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.render_paralelo import args_threads
+
+
+class FfmpegFrameSink:
+    """
+    Substituto do cv2.VideoWriter que codifica com o perfil de intermediários
+    (o mesmo dos efeitos ffmpeg) numa única passada, sem intermediário mp4v.
+
+    Uso:
+        with FfmpegFrameSink(saida, w, h, fps) as out:
+            out.write(frame)
+    """
+
+    def __init__(self, saida, largura: int, altura: int, fps: float):
+        self.saida = str(saida)
+        self.largura = int(largura)
+        self.altura = int(altura)
+        self._tamanho_frame = self.largura * self.altura * 3
+
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24",
+            "-s", f"{self.largura}x{self.altura}",
+            "-r", str(fps),
+            "-i", "-",
+            # yuv420p exige largura/altura pares
+            "-vf", "crop=trunc(iw/2)*2:trunc(ih/2)*2",
+            *INTERMEDIARIO.args(),
+            *args_threads(),
+            self.saida
+        ]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # drena o stderr em paralelo para o ffmpeg nunca bloquear escrevendo log
+        self._stderr = []
+        self._leitor = threading.Thread(target=self._ler_stderr, daemon=True)
+        self._leitor.start()
+
+    def _ler_stderr(self):
+        for linha in self._proc.stderr:
+            self._stderr.append(linha.decode(errors="replace"))
+
+    def write(self, frame):
+        """Escreve um frame BGR uint8 (altura, largura, 3)"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.nbytes != self._tamanho_frame:
+            raise ValueError(f"Frame {frame.shape} não corresponde a {self.largura}x{self.altura}x3")
+        try:
+            self._proc.stdin.write(frame.data)
+        except BrokenPipeError:
+            self._proc.wait()
+            self._leitor.join()
+            raise RuntimeError(f"ffmpeg encerrou durante a escrita de frames: {''.join(self._stderr)[-500:]}")
+
+    def release(self):
+        """Fecha o stdin e espera o encoder terminar"""
+        if self._proc.stdin and not self._proc.stdin.closed:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        returncode = self._proc.wait()
+        self._leitor.join()
+        if returncode != 0:
+            Path(self.saida).unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg falhou (code {returncode}): {''.join(self._stderr)[-500:]}")
+
+    def abortar(self):
+        """Mata o encoder e apaga a saída parcial (não finaliza um arquivo truncado)"""
+        self._proc.kill()
+        try:
+            self._proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        self._proc.wait()
+        self._leitor.join()
+        Path(self.saida).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # erro no render: não mascara a exceção original
+            self.abortar()
+            return False
+        self.release()
+        return False
@@ -0,0 +1,225 @@
+"""
+MEDIA INFO - cache persistente (SQLite) do ffprobe: duração, streams, resolução, fps e codec
+
+Chave: caminho absoluto + tamanho + mtime. Arquivo alterado = nova sondagem.
+Limite de MEDIA_INFO_MAX_ENTRADAS linhas: ao passar dele, saem as de arquivos que não
+existem mais e depois as usadas há mais tempo (LRU, como no CacheDisco).
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from video_maker.cache_disco import CACHE_DIR
+
+DB_PATH = Path(os.getenv("MEDIA_INFO_DB", str(CACHE_DIR / "media_info.sqlite")))
+MAX_ENTRADAS = int(os.getenv("MEDIA_INFO_MAX_ENTRADAS", "50000"))
+
+_conexao = None
+_lock = threading.Lock()
+
+
+@dataclass
+class MediaInfo:
+    duracao: float = 0.0
+    largura: int = 0
+    altura: int = 0
+    fps: float = 0.0
+    codec_video: str = ""
+    codec_audio: str = ""
+    streams: List[dict] = field(default_factory=list)  # [{"tipo": "video", "codec": "h264"}, ...]
+
+    @property
+    def tem_video(self) -> bool:
+        return bool(self.codec_video)
+
+    @property
+    def tem_audio(self) -> bool:
+        return bool(self.codec_audio)
+
+
+def _conectar():
+    """Conexão única por processo (WAL: vários workers podem ler/escrever o mesmo arquivo)"""
+    global _conexao
+    if _conexao is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _conexao = sqlite3.connect(str(DB_PATH), timeout=30, check_same_thread=False)
+        _conexao.execute("PRAGMA journal_mode=WAL")
+        _conexao.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            " path TEXT PRIMARY KEY, tamanho INTEGER, mtime_ns INTEGER, info TEXT,"
+            " usado REAL DEFAULT 0)"
+        )
+        colunas = {linha[1] for linha in _conexao.execute("PRAGMA table_info(media)")}
+        if "usado" not in colunas:  # banco criado antes do limite
+            _conexao.execute("ALTER TABLE media ADD COLUMN usado REAL DEFAULT 0")
+        _conexao.execute("CREATE INDEX IF NOT EXISTS media_usado ON media (usado)")
+        _conexao.commit()
+    return _conexao
+
+
+def _assinatura(path: Path):
+    st = path.stat()
+    return str(path.resolve()), st.st_size, st.st_mtime_ns
+
+
+def _fps(taxa: str) -> float:
+    """'30000/1001' -> 29.97"""
+    try:
+        num, _, den = (taxa or "0/1").partition("/")
+        return float(num) / float(den or 1) if float(den or 1) else 0.0
+    except ValueError:
+        return 0.0
+
+
+def sondar(path) -> Optional[MediaInfo]:
+    """Roda o ffprobe (sem cache). Retorna None se o arquivo não for mídia válida."""
+    try:
+        resultado = subprocess.run(
+            ["ffprobe", "-v", "error",
+             "-show_entries", "format=duration:stream=codec_type,codec_name,width,height,avg_frame_rate,r_frame_rate,duration",
+             "-of", "json", str(path)],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+    except OSError as e:
+        print(f"Erro ao sondar {path}: {e}")
+        return None
+    if resultado.returncode != 0:
+        return None
+    try:
+        dados = json.loads(resultado.stdout or "{}")
+    except ValueError:
+        return None
+
+    info = MediaInfo()
+    duracoes_streams = []
+    for stream in dados.get("streams", []):
+        tipo, codec = stream.get("codec_type", ""), stream.get("codec_name", "")
+        info.streams.append({"tipo": tipo, "codec": codec})
+        if stream.get("duration") not in (None, "N/A"):
+            duracoes_streams.append(float(stream["duration"]))
+        if tipo == "video" and not info.codec_video:
+            info.codec_video = codec
+            info.largura = int(stream.get("width") or 0)
+            info.altura = int(stream.get("height") or 0)
+            info.fps = _fps(stream.get("avg_frame_rate")) or _fps(stream.get("r_frame_rate"))
+        elif tipo == "audio" and not info.codec_audio:
+            info.codec_audio = codec
+
+    duracao = dados.get("format", {}).get("duration")
+    if duracao not in (None, "N/A"):
+        info.duracao = float(duracao)
+    elif duracoes_streams:
+        info.duracao = max(duracoes_streams)
+    return info
+
+
+def obter_media_infos(paths, max_workers: Optional[int] = None) -> List[Optional[MediaInfo]]:
+    """
+    Informações de várias mídias: acertos direto do SQLite, faltas sondadas em paralelo.
+
+    Returns:
+        lista na ordem de paths (None para arquivo inexistente ou inválido)
+    """
+    paths = [Path(p) for p in paths]
+    infos: List[Optional[MediaInfo]] = [None] * len(paths)
+
+    assinaturas = {}
+    for i, path in enumerate(paths):
+        try:
+            assinaturas[i] = _assinatura(path)
+        except OSError:
+            pass  # arquivo inexistente
+
+    try:
+        with _lock:
+            conexao = _conectar()
+            for i, (chave, tamanho, mtime_ns) in assinaturas.items():
+                linha = conexao.execute(
+                    "SELECT info FROM media WHERE path = ? AND tamanho = ? AND mtime_ns = ?",
+                    (chave, tamanho, mtime_ns)
+                ).fetchone()
+                if linha:
+                    infos[i] = MediaInfo(**json.loads(linha[0]))
+            agora = time.time()
+            acertos = [(agora, assinaturas[i][0]) for i in assinaturas if infos[i] is not None]
+            if acertos:
+                conexao.executemany("UPDATE media SET usado = ? WHERE path = ?", acertos)
+                conexao.commit()
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Cache de mídia indisponível: {e}")
+
+    faltando = [i for i in assinaturas if infos[i] is None]
+    if faltando:
+        max_workers = max_workers or min(16, (os.cpu_count() or 4) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sondados = list(executor.map(lambda i: sondar(paths[i]), faltando))
+
+        novos = []
+        for i, info in zip(faltando, sondados):
+            infos[i] = info
+            if info is not None:
+                novos.append((*assinaturas[i], json.dumps(asdict(info)), time.time()))
+
+        if novos:
+            try:
+                with _lock:
+                    conexao = _conectar()
+                    conexao.executemany(
+                        "INSERT OR REPLACE INTO media (path, tamanho, mtime_ns, info, usado) VALUES (?, ?, ?, ?, ?)",
+                        novos
+                    )
+                    conexao.commit()
+                    _aplicar_limite(conexao)
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Não foi possível gravar no cache de mídia: {e}")
+
+    return infos
+
+
+def _aplicar_limite(conexao, limite: int = None):
+    """Acima do limite: remove linhas de arquivos apagados, depois as menos usadas (com _lock)"""
+    limite = MAX_ENTRADAS if limite is None else limite
+    total = conexao.execute("SELECT COUNT(*) FROM media").fetchone()[0]
+    if total <= limite:
+        return
+
+    # arquivos que sumiram (renders temporários, clipes apagados) saem primeiro
+    apagados = [(path,) for (path,) in conexao.execute("SELECT path FROM media ORDER BY usado")
+                if not os.path.exists(path)]
+    conexao.executemany("DELETE FROM media WHERE path = ?", apagados)
+    total -= len(apagados)
+    if total > limite:
+        conexao.execute(
+            "DELETE FROM media WHERE path IN (SELECT path FROM media ORDER BY usado LIMIT ?)",
+            (total - limite,)
+        )
+    conexao.commit()
+
+
+def podar_cache(limite: int = None):
+    """Aplica o limite de entradas do cache de sondagens agora"""
+    with _lock:
+        _aplicar_limite(_conectar(), limite)
+
+
+def obter_media_info(path) -> Optional[MediaInfo]:
+    """Informações de uma mídia (cache ou ffprobe)"""
+    return obter_media_infos([path])[0]
+
+
+def obter_duracao(path) -> float:
+    """Duração em segundos (0.0 se o arquivo não existir ou não puder ser lido)"""
+    info = obter_media_info(path)
+    return info.duracao if info else 0.0
+
+
+def obter_duracoes(paths, max_workers: Optional[int] = None) -> List[float]:
+    """Durações de várias mídias, sondando as que faltam em paralelo"""
+    return [info.duracao if info else 0.0 for info in obter_media_infos(paths, max_workers)]
@@ -0,0 +1,77 @@
+"""
+CONTEXTO DE RENDER - pasta de trabalho exclusiva por job
+
+Clipes de efeito, listas de concat e legendas intermediárias vão para a pasta do job
+atual em vez de ./renders/temp, então dois renders na mesma máquina não sobrescrevem
+os arquivos um do outro. A pasta pode ficar num tmpfs ou SSD local (RENDER_SCRATCH_DIR
+ou PASTA_SCRATCH do canal) e é apagada ao sair do contexto, só ela.
+
+Fora de um contexto (scripts avulsos), pasta_temp() continua sendo ./renders/temp.
+"""
+import contextvars
+import os
+import re
+import shutil
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+PASTA_PADRAO = Path("./renders/temp")
+SCRATCH_DIR = os.getenv("RENDER_SCRATCH_DIR")  # ex.: /dev/shm/creator ou um SSD local
+
+_contexto_atual: contextvars.ContextVar = contextvars.ContextVar("contexto_render", default=None)
+
+
+@dataclass(frozen=True)
+class ContextoRender:
+    job: str
+    pasta: Path   # exclusiva do job, absoluta
+
+    def subpasta(self, nome: str) -> Path:
+        """Subpasta da pasta do job (criada se não existir)"""
+        caminho = self.pasta / nome
+        caminho.mkdir(parents=True, exist_ok=True)
+        return caminho
+
+
+def contexto_atual() -> Optional[ContextoRender]:
+    return _contexto_atual.get()
+
+
+def pasta_temp() -> Path:
+    """Pasta onde efeitos e helpers gravam intermediários (a do job atual, se houver)"""
+    contexto = _contexto_atual.get()
+    pasta = contexto.pasta if contexto else PASTA_PADRAO
+    pasta.mkdir(parents=True, exist_ok=True)
+    return pasta
+
+
+@contextmanager
+def contexto_render(job: str = "render", base=None, manter: bool = False):
+    """
+    Cria a pasta de trabalho do job e a torna a pasta_temp() do bloco (inclusive nas
+    tarefas de renderizar_clipes). Dentro de outro contexto, reaproveita o de fora.
+
+    Args:
+        job: identifica o job no nome da pasta (ex.: 'roteiro_42')
+        base: onde criar a pasta (padrão: RENDER_SCRATCH_DIR ou ./renders/temp)
+        manter: não apagar a pasta no fim (depuração)
+    """
+    externo = _contexto_atual.get()
+    if externo:
+        yield externo
+        return
+
+    nome = re.sub(r"[^\w.-]+", "_", str(job)) or "render"
+    pasta = (Path(base or SCRATCH_DIR or PASTA_PADRAO) / f"{nome}_{uuid.uuid4().hex[:8]}").resolve()
+    pasta.mkdir(parents=True, exist_ok=True)
+    contexto = ContextoRender(job=str(job), pasta=pasta)
+    token = _contexto_atual.set(contexto)
+    try:
+        yield contexto
+    finally:
+        _contexto_atual.reset(token)
+        if not manter:
+            shutil.rmtree(pasta, ignore_errors=True)
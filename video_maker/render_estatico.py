@@ -0,0 +1,129 @@
+"""
+RENDER DE IMAGEM ESTÁTICA - um único encode para vídeos de imagem parada + legenda
+
+A imagem só muda quando um evento da legenda começa ou termina. Em vez de encodar um
+vídeo de 30fps da imagem e re-encodá-lo para queimar a legenda, o concat demuxer entrega
+um frame por trecho entre trocas (VFR), o filtro ass desenha só esses frames e o fps=30
+duplica para CFR antes do encoder (-tune stillimage). O custo passa a depender do número
+de trocas de legenda, não da duração do áudio.
+"""
+import json
+import subprocess
+from pathlib import Path
+
+from video_maker.encode_segmentado import encodar_segmentado
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.subtitle_tools import tempo_ass_para_segundos
+
+
+def instantes_de_troca(ass_path, duracao: float) -> list:
+    """
+    Instantes (s) em que a imagem com legenda muda: início e fim de cada Dialogue,
+    mais 0 e a duração total, ordenados e sem repetição.
+    """
+    instantes = {0.0, round(duracao, 3)}
+    with open(ass_path, encoding="utf-8") as f:
+        for linha in f:
+            if not linha.startswith("Dialogue:"):
+                continue
+            campos = linha.split(",", 3)
+            for tempo in campos[1:3]:
+                t = round(tempo_ass_para_segundos(tempo), 3)
+                if 0.0 < t < duracao:
+                    instantes.add(t)
+    return sorted(instantes)
+
+
+def _entrada_vfr(imagem, instantes: list):
+    """Entrada de trecho para o encode segmentado: lista VFR só com as trocas do trecho"""
+    def _entrada(inicio, fim, pasta):
+        trecho = [0.0] + [t - inicio for t in instantes if inicio < t < fim] + [fim - inicio]
+        lista = escrever_lista_vfr(imagem, trecho, Path(pasta) / f"vfr_{inicio:09.3f}.txt")
+        return ["-f", "concat", "-safe", "0", "-i", str(lista.resolve())]
+    return _entrada
+
+
+def escrever_lista_vfr(imagem, instantes: list, lista_path) -> Path:
+    """Lista do concat demuxer: a imagem repetida, cada entrada durando até a próxima troca"""
+    caminho = Path(imagem).resolve().as_posix().replace("'", "'\\''")
+    linhas = ["ffconcat version 1.0"]
+    for inicio, fim in zip(instantes, instantes[1:]):
+        linhas += [f"file '{caminho}'", f"duration {fim - inicio:.3f}"]
+    # a duração da última entrada só vale se o arquivo aparecer mais uma vez
+    linhas.append(f"file '{caminho}'")
+    lista_path = Path(lista_path)
+    lista_path.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return lista_path
+
+
+def verificar_cfr(video_path, fps: int) -> bool:
+    """Confere se o vídeo saiu com taxa de quadros constante (exigência de upload do YouTube)"""
+    resultado = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "stream=r_frame_rate,avg_frame_rate",
+         "-of", "json", str(video_path)],
+        capture_output=True, text=True
+    )
+    try:
+        stream = json.loads(resultado.stdout or "{}")["streams"][0]
+    except (ValueError, KeyError, IndexError):
+        return False
+    esperado = f"{fps}/1"
+    return stream.get("r_frame_rate") == esperado and stream.get("avg_frame_rate") == esperado
+
+
+def renderizar_estatico(imagem, audio_path, ass_path, saida, duracao: float, fps: int = 30,
+                        perfil_video=None, segmentos: int = 1) -> Path:
+    """
+    Renderiza imagem + áudio + legenda ASS num único ffmpeg.
+
+    Args:
+        imagem: imagem já no tamanho final (ex.: 1280x720)
+        ass_path: legenda; a lista VFR e o filtro ass usam a pasta dela como diretório de trabalho
+        perfil_video: PerfilEncoder do vídeo (padrão: perfil final)
+        segmentos: > 1 encoda trechos em paralelo (encode_segmentado) e junta sem re-encode
+
+    Returns:
+        Path do vídeo. Levanta RuntimeError se o ffmpeg falhar ou a saída não for CFR.
+    """
+    ass_path = Path(ass_path)
+    saida = Path(saida)
+    perfil_video = perfil_video or FINAL
+    pasta = ass_path.parent
+
+    instantes = instantes_de_troca(ass_path, duracao)
+    print(f"🖼️ {len(instantes) - 1} trechos de imagem fixa (trocas de legenda)")
+
+    tune = ["-tune", "stillimage"] if perfil_video.codec == "libx264" else []
+    if segmentos > 1:
+        encodar_segmentado(
+            _entrada_vfr(imagem, instantes), duracao, saida, fps=fps, ass_path=ass_path,
+            audio_path=audio_path, perfil_video=perfil_video, segmentos=segmentos,
+            opcoes_video=tune
+        )
+    else:
+        lista = escrever_lista_vfr(imagem, instantes, pasta / "estatico_vfr.txt")
+        cmd = [
+            "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "warning",
+            "-f", "concat", "-safe", "0", "-i", lista.name,
+            "-i", str(Path(audio_path).resolve()),
+            "-map", "0:v", "-map", "1:a",
+            "-vf", f"ass={ass_path.name},fps={fps},setsar=1",
+            *perfil_video.args(), *tune,
+            "-r", str(fps),
+            "-c:a", "aac", "-b:a", "192k",
+            "-t", f"{duracao:.3f}",
+            "-shortest",
+            "-movflags", "+faststart",
+            str(saida.resolve())
+        ]
+        result = executar_ffmpeg(cmd, duracao=duracao, rotulo="imagem estática", cwd=pasta, check=False)
+        if result.returncode != 0 or not saida.exists():
+            saida.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg (imagem estática) falhou: {result.stderr[-800:]}")
+
+    if not verificar_cfr(saida, fps):
+        raise RuntimeError(f"Vídeo estático não saiu em {fps}fps constante: {saida}")
+    print(f"✅ CFR {fps}fps confirmado")
+    return saida
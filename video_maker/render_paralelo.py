@@ -0,0 +1,87 @@
+"""
+RENDERIZAÇÃO PARALELA DE CLIPES DE EFEITO COM ORÇAMENTO DE CPU
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Limite de threads do ffmpeg para a tarefa em execução na thread atual
+_local = threading.local()
+
+def threads_ffmpeg_atual():
+    """Número de threads reservado ao ffmpeg da tarefa atual (None fora do pool)"""
+    return getattr(_local, 'threads', None)
+
+def args_threads() -> list:
+    """Argumentos '-threads N' para o ffmpeg da tarefa atual (vazio fora do pool)"""
+    threads = threads_ffmpeg_atual()
+    return ["-threads", str(threads)] if threads else []
+
+def orcamento_cpu_padrao(orcamento_cpu=None) -> int:
+    """Núcleos disponíveis para renderização (config > RENDER_CPU_BUDGET > cpu_count)"""
+    if orcamento_cpu:
+        return max(1, int(orcamento_cpu))
+    env = os.getenv("RENDER_CPU_BUDGET")
+    if env:
+        return max(1, int(env))
+    return os.cpu_count() or 1
+
+def calcular_distribuicao(num_tarefas: int, orcamento_cpu=None, max_paralelo=None) -> tuple:
+    """
+    Divide o orçamento de núcleos entre as tarefas
+
+    Returns:
+        tuple: (workers, threads_por_job) com workers * threads_por_job <= orçamento
+    """
+    nucleos = orcamento_cpu_padrao(orcamento_cpu)
+    # x264 escala bem até ~4 threads por clipe curto; acima disso é melhor paralelizar clipes
+    workers = max(1, min(num_tarefas, nucleos, int(max_paralelo or max(1, nucleos // 2))))
+    threads = max(1, nucleos // workers)
+    return workers, threads
+
+def renderizar_clipes(tarefas, orcamento_cpu=None, max_paralelo=None) -> list:
+    """
+    Executa tarefas de renderização em paralelo mantendo a ordem de entrada
+
+    Args:
+        tarefas: lista de (chave, funcao) - funcao sem argumentos que gera o clipe.
+                 Tarefas com a mesma chave são renderizadas uma única vez
+                 (evita dois ffmpeg escrevendo no mesmo arquivo).
+        orcamento_cpu: total de núcleos que a etapa pode usar
+        max_paralelo: máximo de clipes simultâneos
+
+    Returns:
+        list: [(resultado, erro)] na mesma ordem de 'tarefas'
+    """
+    if not tarefas:
+        return []
+
+    unicas = {}
+    for chave, funcao in tarefas:
+        unicas.setdefault(chave, funcao)
+
+    workers, threads = calcular_distribuicao(len(unicas), orcamento_cpu, max_paralelo)
+    print(f"⚙️ Renderizando {len(unicas)} clipes: {workers} em paralelo x {threads} threads")
+
+    def _executar(funcao):
+        _local.threads = threads
+        try:
+            return funcao()
+        finally:
+            _local.threads = None
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render") as pool:
+        # cada tarefa roda numa cópia do contexto de quem chamou (callback de progresso etc.)
+        futuros = {
+            chave: pool.submit(contextvars.copy_context().run, _executar, funcao)
+            for chave, funcao in unicas.items()
+        }
+
+        resultados = []
+        for chave, _ in tarefas:
+            try:
+                resultados.append((futuros[chave].result(), None))
+            except Exception as e:
+                resultados.append((None, e))
+    return resultados
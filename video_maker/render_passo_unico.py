@@ -0,0 +1,121 @@
+"""
+RENDER EM PASSO ÚNICO - efeitos por imagem, concat, legenda e áudio num só filter_complex
+(um único encode x264 em vez de clipes + concat + queima de legenda)
+"""
+from pathlib import Path
+
+from video_maker.efeitos.camera_instavel import filtro_camera_instavel
+from video_maker.efeitos.pan import filtro_pan
+from video_maker.efeitos.zoom_invertido import filtro_zoom_invertido
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.media_info import obter_duracao
+
+# nome do efeito -> trecho do grafo (entrada, saida, prefixo, duracao)
+_FILTROS = {
+    'camera_instavel': lambda entrada, saida, prefixo, duracao: filtro_camera_instavel(entrada, saida, prefixo),
+    'pan': lambda entrada, saida, prefixo, duracao: filtro_pan(duracao, entrada, saida, prefixo),
+    'zoom_invertido': lambda entrada, saida, prefixo, duracao: filtro_zoom_invertido(entrada, saida, prefixo),
+}
+
+# taxa da imagem em loop exigida pelo efeito (zoompan d=1 gera um quadro por quadro de
+# entrada: a 25fps padrão do -loop o clipe sairia com 25/60 da duração)
+_FRAMERATE = {
+    'zoom_invertido': 60,
+}
+
+# folga aceita entre a duração do vídeo e a do áudio (s)
+TOLERANCIA_DURACAO = 0.25
+
+def suporta_efeitos(nomes) -> bool:
+    """True se todos os efeitos têm versão em grafo"""
+    return all(nome in _FILTROS for nome in nomes)
+
+def _caminho_filtro(path) -> str:
+    """Caminho para usar dentro de um filtro (POSIX, ':' do drive escapado)"""
+    return Path(path).resolve().as_posix().replace(':', r'\:')
+
+def montar_grafo(clipes, fps: int = 30, legenda=None):
+    """
+    Monta o filter_complex: um trecho por clipe (entrada i = imagem do clipe i),
+    normalizado para fps/duração exata, concat em grafo e legenda ASS.
+
+    Args:
+        clipes: lista de (efeito, imagem, duracao)
+        legenda: arquivo .ass a queimar (opcional)
+
+    Returns:
+        (filtro, label_final)
+    """
+    partes = []
+    for i, (efeito, _img, duracao) in enumerate(clipes):
+        p = f"c{i}_"
+        partes.append(_FILTROS[efeito](f"{i}:v", f"{p}fx", p, duracao))
+        # tpad: se o efeito gerar menos quadros que o previsto, congela o último
+        partes.append(
+            f"[{p}fx]fps={fps},tpad=stop_mode=clone:stop_duration={duracao:.3f},"
+            f"trim=duration={duracao:.3f},setpts=PTS-STARTPTS,"
+            f"format=yuv420p,setsar=1[{p}out]"
+        )
+
+    entradas = "".join(f"[c{i}_out]" for i in range(len(clipes)))
+    partes.append(f"{entradas}concat=n={len(clipes)}:v=1:a=0[vcat]")
+    final = "vcat"
+
+    if legenda:
+        partes.append(f"[vcat]ass='{_caminho_filtro(legenda)}'[vout]")
+        final = "vout"
+    return ";".join(partes), final
+
+def renderizar_passo_unico(clipes, audio_path, saida, fps: int = 30, legenda=None,
+                           arquivo_grafo=None, perfil_video=None):
+    """
+    Renderiza o vídeo final num único ffmpeg.
+
+    Args:
+        clipes: lista de (efeito, imagem, duracao)
+        arquivo_grafo: onde gravar o filter_complex (evita o limite de linha de comando
+            com muitas imagens); por padrão, ao lado da saída
+        perfil_video: PerfilEncoder do vídeo (padrão: perfil final)
+
+    Returns:
+        Path do vídeo. Levanta RuntimeError se o ffmpeg falhar ou o vídeo sair mais curto
+        que o áudio (o template cai para o caminho por clipes).
+    """
+    saida = Path(saida)
+    filtro, final = montar_grafo(clipes, fps, legenda)
+
+    arquivo_grafo = Path(arquivo_grafo or saida.with_suffix(".grafo.txt"))
+    arquivo_grafo.write_text(filtro, encoding="utf-8")
+
+    cmd = ["ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error"]
+    for efeito, img, duracao in clipes:
+        cmd += ["-loop", "1", "-framerate", str(_FRAMERATE.get(efeito, fps)),
+                "-t", f"{duracao:.3f}", "-i", str(img)]
+    cmd += [
+        "-i", str(audio_path),
+        "-filter_complex_script", str(arquivo_grafo),
+        "-map", f"[{final}]", "-map", f"{len(clipes)}:a",
+        *(perfil_video or FINAL).args(), "-r", str(fps),
+        "-c:a", "aac", "-b:a", "192k",
+        "-shortest",
+        "-movflags", "+faststart",
+        str(saida)
+    ]
+
+    duracao_total = sum(duracao for _efeito, _img, duracao in clipes)
+    result = executar_ffmpeg(cmd, duracao=duracao_total, rotulo="passo único", check=False)
+    if result.returncode != 0 or not saida.exists():
+        # não deixa um arquivo parcial passar por vídeo final no fallback
+        saida.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg (passo único) falhou: {result.stderr[-800:]}")
+
+    # -shortest corta o áudio sem erro se o vídeo sair curto: confere antes de entregar
+    duracao_audio = obter_duracao(audio_path)
+    duracao_saida = obter_duracao(saida)
+    if duracao_audio and duracao_saida < duracao_audio - TOLERANCIA_DURACAO:
+        saida.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"passo único gerou {duracao_saida:.2f}s para {duracao_audio:.2f}s de áudio"
+        )
+    return saida
@@ -0,0 +1,163 @@
+"""
+XFADE EM BLOCOS - a linha do tempo com transições xfade é renderizada em blocos de K
+clipes em vez de um único filter_complex com N entradas.
+
+Blocos vizinhos compartilham um clipe: o bloco c termina no clipe k e o bloco c+1 começa
+nele. O corte entre os blocos fica no meio do clipe compartilhado, onde só ele aparece
+(longe das duas transições), então os dois lados mostram exatamente a mesma imagem.
+Cada bloco recebe a legenda recortada/deslocada e é encodado separadamente (em
+paralelo); bloco que falha é refeito sozinho. No fim, concat em cópia e o áudio é
+mixado uma única vez.
+"""
+import shutil
+from pathlib import Path
+
+from video_maker.encode_segmentado import concatenar_trechos
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import args_threads, renderizar_clipes
+from video_maker.subtitle_tools import recortar_ass
+
+CLIPES_POR_BLOCO = 8
+
+
+def inicios_na_linha_do_tempo(duracoes: list, dur_fade: float) -> list:
+    """Início de cada clipe no vídeo final (= offset do xfade que o traz)"""
+    inicios, acumulado = [], 0.0
+    for i, d in enumerate(duracoes):
+        inicios.append(max(0.0, acumulado - i * dur_fade))
+        acumulado += d
+    return inicios
+
+
+def dividir_em_blocos(duracoes: list, dur_fade: float, fps: int, clipes_por_bloco: int = CLIPES_POR_BLOCO) -> list:
+    """
+    Blocos de clipes com um clipe compartilhado entre vizinhos e o frame de corte no meio dele.
+
+    Returns:
+        list[dict]: {"primeiro", "ultimo", "frame_inicio", "frame_fim"} (frames no vídeo final)
+    """
+    n = len(duracoes)
+    inicios = inicios_na_linha_do_tempo(duracoes, dur_fade)
+    total_frames = int(round((sum(duracoes) - max(0, n - 1) * dur_fade) * fps))
+    # o clipe compartilhado precisa de um trecho sem transição para o corte
+    minimo_compartilhado = 2 * dur_fade + 2.0 / fps
+
+    blocos, primeiro, frame_inicio = [], 0, 0
+    while True:
+        ultimo = min(primeiro + max(2, clipes_por_bloco) - 1, n - 1)
+        while ultimo < n - 1 and duracoes[ultimo] <= minimo_compartilhado:
+            ultimo += 1
+        if ultimo >= n - 1:
+            blocos.append({"primeiro": primeiro, "ultimo": n - 1,
+                           "frame_inicio": frame_inicio, "frame_fim": total_frames})
+            return blocos
+        frame_corte = int(round((inicios[ultimo] + duracoes[ultimo] / 2) * fps))
+        blocos.append({"primeiro": primeiro, "ultimo": ultimo,
+                       "frame_inicio": frame_inicio, "frame_fim": frame_corte})
+        primeiro, frame_inicio = ultimo, frame_corte
+
+
+def renderizar_xfade_em_blocos(clipes, duracoes, dur_fade: float, saida, audio_path=None,
+                               fps: int = 30, largura: int = 1280, altura: int = 720,
+                               ass_path=None, clipes_por_bloco: int = CLIPES_POR_BLOCO,
+                               tentativas: int = 2, perfil_video=None, pasta=None,
+                               orcamento_cpu=None, sem_legenda_se_falhar: bool = False) -> Path:
+    """
+    Renderiza clipes encadeados por xfade (transição 'fade') em blocos paralelos.
+
+    Args:
+        clipes / duracoes: clipes na ordem do vídeo e suas durações
+        ass_path: legenda queimada (cada bloco recebe só o seu trecho)
+        tentativas: vezes que um bloco é tentado antes de a render falhar
+        sem_legenda_se_falhar: se todas as tentativas falharem, faz o bloco uma última vez
+            sem legenda (o vídeo sai com um buraco na legenda; avisado no fim)
+        pasta: blocos temporários (padrão: ao lado da saída), apagada no fim
+
+    Returns:
+        Path do vídeo. Levanta RuntimeError se algum bloco ou o concat falhar.
+    """
+    saida = Path(saida)
+    clipes = [Path(c).resolve() for c in clipes]
+    perfil_video = perfil_video or FINAL
+    pasta = Path(pasta or saida.parent / f"{saida.stem}_blocos")
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    inicios = inicios_na_linha_do_tempo(duracoes, dur_fade)
+    blocos = dividir_em_blocos(duracoes, dur_fade, fps, clipes_por_bloco)
+    print(f"🧱 xfade em {len(blocos)} blocos de até {clipes_por_bloco} clipes")
+
+    sem_legenda = []
+
+    def _encodar(idx, bloco, com_legenda):
+        primeiro, ultimo = bloco["primeiro"], bloco["ultimo"]
+        arquivo = pasta / f"bloco_{idx:03d}{perfil_video.extensao}"
+        inicio_bloco = inicios[primeiro]
+        corte_ini = bloco["frame_inicio"] / fps
+        corte_fim = bloco["frame_fim"] / fps
+
+        cmd = ["ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error"]
+        partes = []
+        for j, i in enumerate(range(primeiro, ultimo + 1)):
+            cmd += ["-i", str(clipes[i])]
+            partes.append(f"[{j}:v]scale={largura}:{altura}:flags=lanczos,fps={fps},format=yuv420p,setpts=PTS-STARTPTS[v{j}]")
+
+        atual = "v0"
+        for j, i in enumerate(range(primeiro + 1, ultimo + 1), 1):
+            offset = inicios[i] - inicio_bloco
+            partes.append(f"[{atual}][v{j}]xfade=transition=fade:duration={dur_fade:.3f}:offset={offset:.3f}[x{j}]")
+            atual = f"x{j}"
+
+        cadeia = f"[{atual}]trim=start={corte_ini - inicio_bloco:.6f},setpts=PTS-STARTPTS"
+        if com_legenda:
+            legenda = pasta / f"bloco_{idx:03d}.ass"
+            recortar_ass(ass_path, legenda, corte_ini, corte_fim)
+            cadeia += f",ass={legenda.name}"
+        partes.append(cadeia + "[vout]")
+
+        cmd += [
+            "-filter_complex", ";".join(partes),
+            "-map", "[vout]", "-an",
+            *perfil_video.args(),
+            *args_threads(),
+            "-frames:v", str(bloco["frame_fim"] - bloco["frame_inicio"]),
+            arquivo.name
+        ]
+        result = executar_ffmpeg(cmd, duracao=corte_fim - corte_ini, rotulo=f"bloco {idx + 1}/{len(blocos)}", cwd=pasta, check=False)
+        if result.returncode != 0 or not arquivo.exists():
+            arquivo.unlink(missing_ok=True)
+            raise RuntimeError(f"bloco {idx} (clipes {primeiro}-{ultimo}): {result.stderr[-500:]}")
+        return arquivo
+
+    def _renderizar_bloco(idx, bloco):
+        com_legenda = bool(ass_path)
+        erro = None
+        for tentativa in range(1, max(1, tentativas) + 1):
+            try:
+                return _encodar(idx, bloco, com_legenda)
+            except RuntimeError as e:
+                erro = e
+                print(f"   ⚠️ Bloco {idx}, tentativa {tentativa}: {e}")
+
+        if not (com_legenda and sem_legenda_se_falhar):
+            raise erro
+        print(f"   🔄 Bloco {idx} sem legenda...")
+        arquivo = _encodar(idx, bloco, False)
+        sem_legenda.append(idx)
+        return arquivo
+
+    tarefas = [
+        (idx, lambda idx=idx, bloco=bloco: _renderizar_bloco(idx, bloco))
+        for idx, bloco in enumerate(blocos)
+    ]
+    resultados = renderizar_clipes(tarefas, orcamento_cpu=orcamento_cpu, max_paralelo=len(blocos))
+    erros = [erro for _, erro in resultados if erro is not None]
+    if erros:
+        raise RuntimeError(f"Render em blocos falhou: {erros[0]}")
+
+    concatenar_trechos([arquivo for arquivo, _ in resultados], saida, audio_path)
+    shutil.rmtree(pasta, ignore_errors=True)
+    if sem_legenda:
+        blocos_sem = ", ".join(str(i) for i in sorted(sem_legenda))
+        print(f"⚠️ ATENÇÃO: blocos {blocos_sem} saíram SEM legenda em {saida.name}")
+    return saida
@@ -0,0 +1,110 @@
+"""
+SELEÇÃO DE CLIPES POR DURAÇÃO - escolhe clipes sem repetição cuja soma fica entre
+a duração alvo e alvo + tolerância (guloso com reparo por trocas, aleatoriedade com semente)
+"""
+import bisect
+import random
+from typing import Dict, List, Optional
+
+
+def _guloso_com_reparo(clipes, alvo: float, tolerancia: float, rng: random.Random):
+    """
+    Uma tentativa: ordem aleatória, adiciona enquanto couber em alvo + tolerância,
+    depois troca um selecionado por um de fora para fechar a diferença.
+
+    Returns:
+        (selecionados, total)
+    """
+    ordem = list(clipes)
+    rng.shuffle(ordem)
+    limite = alvo + tolerancia
+
+    selecionados, fora, total = [], [], 0.0
+    for clipe, dur in ordem:
+        if total < alvo and total + dur <= limite:
+            selecionados.append((clipe, dur))
+            total += dur
+        else:
+            fora.append((clipe, dur))
+
+    # Reparo: trocar s (dentro) por u (fora) com d_u - d_s em [alvo - total, limite - total]
+    for _ in range(len(selecionados)):
+        if total >= alvo or not fora:
+            break
+        fora.sort(key=lambda c: c[1])
+        duracoes_fora = [d for _, d in fora]
+        troca = None
+        for i, (_, d_s) in enumerate(selecionados):
+            j = bisect.bisect_left(duracoes_fora, d_s + (alvo - total))
+            if j < len(fora) and fora[j][1] - d_s <= limite - total:
+                troca = (i, j)
+                break
+        if troca is None:
+            break
+        i, j = troca
+        saiu, entrou = selecionados[i], fora.pop(j)
+        selecionados[i] = entrou
+        fora.append(saiu)
+        total += entrou[1] - saiu[1]
+
+    # Sem solução na tolerância: o menor clipe de fora que cobre a diferença
+    if total < alvo and fora:
+        cobre = [c for c in fora if total + c[1] >= alvo]
+        extra = min(cobre, key=lambda c: c[1]) if cobre else max(fora, key=lambda c: c[1])
+        selecionados.append(extra)
+        total += extra[1]
+
+    return selecionados, total
+
+
+def selecionar_clipes(duracoes: Dict[object, float], alvo: float, tolerancia: float = 1.0,
+                      semente=None, tentativas: int = 32) -> List[object]:
+    """
+    Seleciona clipes para cobrir 'alvo' segundos com o mínimo de sobra.
+
+    Args:
+        duracoes: {clipe: duração em segundos} (durações <= 0 são ignoradas)
+        tolerancia: sobra aceitável além do alvo (segundos)
+        semente: mesma semente + mesma biblioteca = mesma seleção
+        tentativas: ordens aleatórias testadas (para no primeiro resultado dentro da tolerância)
+
+    Returns:
+        Lista de clipes na ordem de reprodução. Se a biblioteca inteira for menor que o
+        alvo, os clipes se repetem em rodadas completas antes de selecionar o restante.
+    """
+    rng = random.Random(semente)
+    clipes = sorted(((c, float(d)) for c, d in duracoes.items() if d and d > 0), key=lambda c: str(c[0]))
+    if not clipes:
+        raise ValueError("Nenhum clipe com duração válida para selecionar")
+
+    total_biblioteca = sum(d for _, d in clipes)
+    sequencia: List[object] = []
+    restante = alvo
+
+    # Biblioteca menor que o alvo: rodadas completas (embaralhadas) até faltar menos que uma
+    while restante > total_biblioteca:
+        rodada = [c for c, _ in clipes]
+        rng.shuffle(rodada)
+        # evita o mesmo clipe na emenda entre rodadas
+        if sequencia and len(rodada) > 1 and rodada[0] == sequencia[-1]:
+            rodada[0], rodada[-1] = rodada[-1], rodada[0]
+        sequencia += rodada
+        restante -= total_biblioteca
+
+    if restante <= 0:
+        return sequencia
+
+    melhor: Optional[tuple] = None
+    for _ in range(max(1, tentativas)):
+        selecionados, total = _guloso_com_reparo(clipes, restante, tolerancia, rng)
+        sobra = total - restante
+        # prioriza cobrir o alvo; entre as que cobrem, a menor sobra
+        nota = (sobra < 0, abs(sobra))
+        if melhor is None or nota < melhor[0]:
+            melhor = (nota, selecionados)
+        if 0 <= sobra <= tolerancia:
+            break
+
+    escolhidos = [c for c, _ in melhor[1]]
+    rng.shuffle(escolhidos)
+    return sequencia + escolhidos
@@ -0,0 +1,108 @@
+"""
+SILÊNCIO - detecção de pausas sobre o PCM decodificado (NumPy), sem silencedetect
+
+A narração é decodificada uma vez para PCM s16le mono num arquivo, lido por memmap (25+
+min de narração não passam pela RAM de uma vez). O RMS por janela é calculado em blocos
+com um buffer reaproveitado. O mesmo arquivo PCM serve de entrada para o corte
+(audio_pipeline.processar_audio), então o MP3 do TTS é decodificado uma única vez.
+"""
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_context import pasta_temp
+
+TAXA_PCM = 48000            # mesma taxa da mixagem final
+JANELA_S = 0.02             # janela do RMS (20 ms)
+JANELAS_POR_BLOCO = 4096    # ~80s de áudio por bloco (buffer float32 de ~16 MB a 48 kHz)
+
+
+@dataclass
+class PcmDecodificado:
+    path: Path
+    taxa: int = TAXA_PCM
+
+    def amostras(self) -> np.memmap:
+        """Amostras int16 mono, mapeadas do disco"""
+        return np.memmap(self.path, dtype="<i2", mode="r")
+
+    @property
+    def duracao(self) -> float:
+        return self.path.stat().st_size / 2 / self.taxa
+
+    def args_entrada(self) -> list:
+        """Argumentos de entrada do ffmpeg para ler este PCM"""
+        return ["-f", "s16le", "-ar", str(self.taxa), "-ac", "1", "-i", str(self.path)]
+
+    def apagar(self):
+        self.path.unlink(missing_ok=True)
+
+
+def decodificar_pcm(audio_path, destino=None, taxa: int = TAXA_PCM) -> PcmDecodificado:
+    """Decodifica o áudio para PCM s16le mono (padrão: na pasta_temp() do job)"""
+    audio_path = Path(audio_path)
+    destino = Path(destino or pasta_temp() / f"{audio_path.stem}_{uuid.uuid4().hex[:8]}.pcm")
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+        "-i", str(audio_path),
+        "-vn", "-ac", "1", "-ar", str(taxa),
+        "-f", "s16le", "-c:a", "pcm_s16le",
+        str(destino)
+    ]
+    executar_ffmpeg(cmd, rotulo="decodificar pcm", execucao="audio")
+    return PcmDecodificado(destino, taxa)
+
+
+def rms_db_por_janela(amostras, taxa: int, janela_s: float = JANELA_S,
+                      janelas_por_bloco: int = JANELAS_POR_BLOCO) -> np.ndarray:
+    """
+    Nível RMS (dBFS) de cada janela de 'janela_s' segundos (a janela final incompleta é ignorada).
+    """
+    janela = max(1, int(round(taxa * janela_s)))
+    n = len(amostras) // janela
+    niveis = np.empty(n, dtype=np.float32)
+    if n == 0:
+        return niveis
+
+    buffer = np.empty((min(janelas_por_bloco, n), janela), dtype=np.float32)
+    for ini in range(0, n, janelas_por_bloco):
+        fim = min(n, ini + janelas_por_bloco)
+        bloco = buffer[:fim - ini]
+        trecho = np.asarray(amostras[ini * janela:fim * janela]).reshape(fim - ini, janela)
+        np.multiply(trecho, 1.0 / 32768, out=bloco, casting="same_kind")
+        np.square(bloco, out=bloco)
+        np.sqrt(bloco.mean(axis=1), out=niveis[ini:fim])
+
+    np.maximum(niveis, 1e-10, out=niveis)
+    np.log10(niveis, out=niveis)
+    niveis *= 20
+    return niveis
+
+
+def detectar_silencios_pcm(pcm: PcmDecodificado, limiar_db: float = -40, minimo: float = 0.5,
+                           janela_s: float = JANELA_S) -> list:
+    """
+    Pausas em que o RMS fica abaixo de 'limiar_db' por mais de 'minimo' segundos.
+    A margem mantida em cada lado da pausa é aplicada no corte (audio_pipeline.MARGEM_CORTE).
+
+    Returns:
+        list[dict]: {'start', 'end', 'duration'} em segundos, em ordem
+    """
+    niveis = rms_db_por_janela(pcm.amostras(), pcm.taxa, janela_s)
+    silencio = (niveis < limiar_db).astype(np.int8)
+    bordas = np.diff(np.concatenate(([0], silencio, [0])))
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+
+    passo = int(round(pcm.taxa * janela_s)) / pcm.taxa
+    duracao = pcm.duracao
+    silencios = []
+    for i, f in zip(inicios, fins):
+        inicio = round(float(i * passo), 3)
+        fim = round(float(min(f * passo, duracao)), 3)
+        if fim - inicio > minimo:
+            silencios.append({"start": inicio, "end": fim, "duration": round(fim - inicio, 3)})
+    return silencios
@@ -29,6 +29,51 @@ def clean_text(text):
     """Remove tags HTML/XML do texto"""
     return re.sub(r'<[^>]+>', '', text).strip()
 
+_TEMPO_ASS = re.compile(r"(\d+):(\d{2}):(\d{2})[.,](\d{1,3})")
+
+def tempo_ass_para_segundos(tempo: str) -> float:
+    """'0:01:02.34' -> 62.34"""
+    m = _TEMPO_ASS.match(tempo.strip())
+    if not m:
+        raise ValueError(f"Tempo ASS inválido: {tempo}")
+    h, mi, s, frac = m.groups()
+    return int(h) * 3600 + int(mi) * 60 + int(s) + int(frac) / (10 ** len(frac))
+
+def segundos_para_tempo_ass(segundos: float) -> str:
+    """62.34 -> '0:01:02.34'"""
+    cs = int(round(max(0.0, segundos) * 100))
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h:01}:{m:02}:{s:02}.{cs:02}"
+
+def recortar_ass(ass_entrada, ass_saida, inicio: float, fim: float) -> int:
+    """
+    Copia só os eventos de [inicio, fim) com os tempos deslocados para começar em 0
+    (legenda de um trecho renderizado separadamente). Cabeçalho e estilos são mantidos.
+
+    Returns:
+        int: número de eventos no trecho
+    """
+    linhas, eventos = [], 0
+    with open(ass_entrada, encoding="utf-8") as f:
+        for linha in f:
+            if not linha.startswith("Dialogue:"):
+                linhas.append(linha)
+                continue
+            campos = linha.split(",", 3)
+            ini_ev = tempo_ass_para_segundos(campos[1])
+            fim_ev = tempo_ass_para_segundos(campos[2])
+            if fim_ev <= inicio or ini_ev >= fim:
+                continue
+            campos[1] = segundos_para_tempo_ass(max(ini_ev, inicio) - inicio)
+            campos[2] = segundos_para_tempo_ass(min(fim_ev, fim) - inicio)
+            linhas.append(",".join(campos))
+            eventos += 1
+    with open(ass_saida, "w", encoding="utf-8") as f:
+        f.writelines(linhas)
+    return eventos
+
 def srt_to_ass_karaoke(srt_file, ass_file, orientacao="vertical", font_name="Arial"):
     """
     Converte SRT em ASS karaokê com opções de orientação
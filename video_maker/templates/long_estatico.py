@@ -1,13 +1,13 @@
 # long_estatico.py - template para vídeos longos 16:9 com imagem estática
 import re
-import shutil
-import subprocess
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
 from video_maker.subtitle_tools import srt_to_ass_karaoke
+from video_maker.encode_segmentado import segmentos_padrao
+from video_maker.render_estatico import renderizar_estatico
 from video_maker.video_utils import (
-    criar_frame_estatico_long, get_media_duration, criar_frame_estatico,
+    get_media_duration, criar_frame_estatico,
     preparar_diretorios_trabalho, limpar_diretorio_temp
 )
 
@@ -157,44 +157,16 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
 
     print(f"🖼️ Imagem com marca d'água preparada")
 
-    # 5. Criar vídeo estático
+    # 5. Render único: frames só nas trocas de legenda, ass, fps CFR e encode stillimage
     video_id = audio.stem
     output_path = output_dir / f"{video_id}.mp4"
-    video_estatico_path = temp_dir / "video_estatico.mp4"
-    
-    criar_frame_estatico_long(imagem_final_path, audio_duration, video_estatico_path)
-    print(f"🎬 Vídeo estático criado")
 
-    # 6. Render final COM LEGENDA
-    print("🎥 Montando vídeo final...")
+    # Máquina com muitos núcleos: trechos encodados em paralelo (ENCODE_SEGMENTADO)
+    segmentos = segmentos_padrao(audio_duration) if config.get('ENCODE_SEGMENTADO', True) else 1
 
-    audio_temp = temp_dir / audio.name
-    shutil.copy2(audio, audio_temp)
-
-    cmd_final = [
-        "ffmpeg", "-y", "-hide_banner", "-loglevel", "warning",
-        "-i", str(video_estatico_path.name),
-        "-i", str(audio_temp.name),
-        "-vf", f"ass={ass_path.name}",
-        "-c:v", "libx264", "-preset", "medium", "-crf", "18",
-        "-c:a", "aac", "-b:a", "192k",
-        "-shortest",
-        "-movflags", "+faststart",
-        "-r", str(fps),
-        "-pix_fmt", "yuv420p",
-        str(output_path)
-    ]
-
-    # Executar render - SEM FALLBACK
-    print("🔧 Executando FFmpeg...")
-    result = subprocess.run(
-        cmd_final, 
-        check=True, 
-        cwd=temp_dir, 
-        capture_output=True, 
-        text=True, 
-        timeout=600
-    )
+    print("🎥 Montando vídeo final...")
+    renderizar_estatico(imagem_final_path, audio, ass_path, output_path, audio_duration, fps,
+                        segmentos=segmentos)
 
     # Verificar se o vídeo foi criado
     if not output_path.exists():
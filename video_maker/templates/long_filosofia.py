@@ -3,11 +3,14 @@
 import random
 import re
 import shutil
-import subprocess
 from pathlib import Path
 
 from video_maker.subtitle_tools import srt_to_ass_karaoke
 from video_maker.video_engine import aplicar_efeito
+from video_maker.cache_clipes import clipe_em_cache
+from video_maker.encoder_profiles import INTERMEDIARIO, verificar_espaco_scratch
+from video_maker.render_paralelo import renderizar_clipes
+from video_maker.render_xfade_blocos import CLIPES_POR_BLOCO, renderizar_xfade_em_blocos
 from video_maker.video_utils import (
     get_media_duration, listar_imagens, quebrar_texto,
     criar_frame_estatico, normalizar_duracao, gerar_capa_pillow,
@@ -22,8 +25,8 @@ from video_maker.efeitos.zoom_pulse import criar_video_pulse_horizontal
 from video_maker.efeitos.camera_instavel import criar_video_camera_instavel_horizontal
 
 
-def aplicar_efeito_horizontal(nome_efeito: str, img_path: str, temp: float):
-    """Aplica efeitos na versão horizontal 16:9"""
+def aplicar_efeito_horizontal(nome_efeito: str, img_path: str, temp: float, usar_cache: bool = True):
+    """Aplica efeitos na versão horizontal 16:9 (reutilizando o cache de clipes)"""
     efeitos_horizontal = {
         'pan': criar_video_pan_horizontal,
         'panoramica_vertical': criar_video_panoramica_horizontal,
@@ -35,7 +38,10 @@ def aplicar_efeito_horizontal(nome_efeito: str, img_path: str, temp: float):
     if nome_efeito not in efeitos_horizontal:
         raise ValueError(f"Efeito horizontal '{nome_efeito}' não encontrado. Efeitos disponíveis: {list(efeitos_horizontal.keys())}")
     
-    return efeitos_horizontal[nome_efeito](img_path, temp)
+    funcao = efeitos_horizontal[nome_efeito]
+    if not usar_cache:
+        return funcao(img_path, temp)
+    return clipe_em_cache(f"{nome_efeito}_horizontal", img_path, temp, lambda: funcao(img_path, temp))
 
 def render(audio_path: str, config: dict, roteiro) -> Path:
     """
@@ -85,6 +91,13 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         audio_duration = get_media_duration(audio)
         print(f"⏱️ Duração do áudio: {audio_duration:.2f}s")
 
+        # Espaço para os intermediários (efeito + normalizado + cópia em temp)
+        verificar_espaco_scratch(
+            temp_dir,
+            INTERMEDIARIO.estimar_bytes(audio_duration, width, height, 60)
+            + 2 * INTERMEDIARIO.estimar_bytes(audio_duration, width, height, fps)
+        )
+
         # 3. Processar legendas
         ass_path = temp_dir / "legenda.ass"
         tem_legenda = False
@@ -135,7 +148,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
             if capa_com_efeito and hasattr(capa_com_efeito, 'filename') and Path(capa_com_efeito.filename).exists():
                 norm_capa = normalizar_duracao(capa_com_efeito.filename, duracao_capa, fps=fps)
                 if norm_capa and Path(norm_capa).exists():
-                    nome_capa = "capa_com_efeito.mp4"
+                    nome_capa = f"capa_com_efeito{INTERMEDIARIO.extensao}"
                     destino_capa = temp_dir / nome_capa
                     shutil.copy2(norm_capa, destino_capa)
                     clip_files.append(destino_capa)
@@ -153,12 +166,16 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         # Fallback: capa estática
         if not capa_gerada:
             try:
-                fallback_capa = temp_dir / "capa_estatica.mp4"
-                criar_frame_estatico(capa_path, duracao_capa, fallback_capa)
+                fallback_capa = temp_dir / f"capa_estatica{INTERMEDIARIO.extensao}"
+                clipe_em_cache(
+                    'frame_estatico', capa_path, duracao_capa,
+                    lambda: criar_frame_estatico(capa_path, duracao_capa, fallback_capa),
+                    destino=fallback_capa, largura=720, altura=1280
+                )
                 clip_files.append(fallback_capa)
                 clip_durations.append(duracao_capa)
                 with open(lista_clips, "a", encoding="utf-8") as f:
-                    f.write(f"file 'capa_estatica.mp4'\n")
+                    f.write(f"file '{fallback_capa.name}'\n")
                 print("✅ Fallback: capa estática criada")
             except Exception as e2:
                 print(f"❌ Fallback da capa também falhou: {e2}")
@@ -192,43 +209,65 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
             efeitos_horizontais = ['pan', 'panoramica_vertical', 'zoom_invertido', 'zoom_pulse', 'camera_instavel']
             print(f"🎬 Efeitos horizontais disponíveis: {efeitos_horizontais}")
 
+            def _renderizar_clipe(i, img, seg, efeito):
+                """Efeito + normalização de duração; retorna o clipe final em temp_dir"""
+                print(f"🎬 [{i+1}/{n_total}] {Path(img).name} → {efeito}_horizontal ({seg:.1f}s)...")
+                raw = aplicar_efeito_horizontal(efeito, img, seg)
+                if not (raw and hasattr(raw, 'filename') and Path(raw.filename).exists()):
+                    return None
+                norm = normalizar_duracao(raw.filename, seg, fps=fps)
+                if not (norm and Path(norm).exists()):
+                    return None
+                destino = temp_dir / f"clip_{i:03d}{INTERMEDIARIO.extensao}"
+                shutil.copy2(norm, destino)
+                # Limpar temporários
+                Path(norm).unlink(missing_ok=True)
+                Path(raw.filename).unlink(missing_ok=True)
+                return destino
+
+            clipes = []
             for i, (img, seg) in enumerate(zip(imgs_restantes, durs)):
                 if seg < 1.0:  # Duração mínima prática
                     print(f"⏩ Pulando imagem {i+1}: duração muito curta ({seg:.1f}s)")
                     continue
-                    
-                efeito = efeitos_horizontais[i % len(efeitos_horizontais)]
-                try:
-                    print(f"🎬 [{i+1}/{n_total}] {Path(img).name} → {efeito}_horizontal ({seg:.1f}s)...")
-                    raw = aplicar_efeito_horizontal(efeito, img, seg)
-
-                    if raw and hasattr(raw, 'filename') and Path(raw.filename).exists():
-                        norm = normalizar_duracao(raw.filename, seg, fps=fps)
-                        if norm and Path(norm).exists():
-                            nome_arquivo = f"clip_{i:03d}.mp4"
-                            destino = temp_dir / nome_arquivo
-                            shutil.copy2(norm, destino)
-                            clip_files.append(destino)
-                            clip_durations.append(float(seg))
-                            with open(lista_clips, "a", encoding="utf-8") as f:
-                                f.write(f"file '{nome_arquivo}'\n")
-                            # Limpar temporários
-                            Path(norm).unlink(missing_ok=True)
-                            Path(raw.filename).unlink(missing_ok=True)
-                except Exception as e:
-                    print(f"   ❌ Erro no efeito {efeito}_horizontal: {e}")
-                    # Fallback: criar clipe estático
-                    try:
-                        nome_arquivo = f"fallback_{i:03d}.mp4"
-                        fallback_path = temp_dir / nome_arquivo
-                        criar_frame_estatico(img, seg, fallback_path)
-                        clip_files.append(fallback_path)
+                clipes.append((i, img, seg, efeitos_horizontais[i % len(efeitos_horizontais)]))
+
+            tarefas = [
+                (i, lambda i=i, img=img, seg=seg, efeito=efeito: _renderizar_clipe(i, img, seg, efeito))
+                for i, img, seg, efeito in clipes
+            ]
+            resultados = renderizar_clipes(
+                tarefas,
+                orcamento_cpu=config.get('RENDER_CPU_BUDGET'),
+                max_paralelo=config.get('RENDER_MAX_PARALELO')
+            )
+
+            for (i, img, seg, efeito), (destino, erro) in zip(clipes, resultados):
+                if erro is None:
+                    if destino:
+                        clip_files.append(destino)
                         clip_durations.append(float(seg))
                         with open(lista_clips, "a", encoding="utf-8") as f:
-                            f.write(f"file '{nome_arquivo}'\n")
-                        print(f"   ✅ Fallback estático criado")
-                    except Exception as fallback_error:
-                        print(f"   ❌ Fallback também falhou: {fallback_error}")
+                            f.write(f"file '{destino.name}'\n")
+                    continue
+
+                print(f"   ❌ Erro no efeito {efeito}_horizontal: {erro}")
+                # Fallback: criar clipe estático
+                try:
+                    nome_arquivo = f"fallback_{i:03d}{INTERMEDIARIO.extensao}"
+                    fallback_path = temp_dir / nome_arquivo
+                    clipe_em_cache(
+                        'frame_estatico', img, seg,
+                        lambda: criar_frame_estatico(img, seg, fallback_path),
+                        destino=fallback_path, largura=720, altura=1280
+                    )
+                    clip_files.append(fallback_path)
+                    clip_durations.append(float(seg))
+                    with open(lista_clips, "a", encoding="utf-8") as f:
+                        f.write(f"file '{nome_arquivo}'\n")
+                    print(f"   ✅ Fallback estático criado")
+                except Exception as fallback_error:
+                    print(f"   ❌ Fallback também falhou: {fallback_error}")
         else:
             print("⚠️  Não há imagens suficientes para continuar após a capa")
 
@@ -240,107 +279,22 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         # 7. RENDER FINAL COM XFADE
         print("🎥 Montando vídeo longo com transições...")
 
-        # Copiar áudio para temp_dir
-        audio_temp = temp_dir / audio.name
-        if not audio_temp.exists():
-            shutil.copy2(audio, audio_temp)
-
-        # Construir comando FFmpeg
-        cmd_final = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "warning"]
-
-        # Adicionar cada clipe como input
-        for cf in clip_files:
-            cmd_final += ["-i", str(cf.name)]
-
-        # Adicionar o áudio como último input
-        cmd_final += ["-i", str(audio_temp.name)]
-
-        # Construir filter_complex para xfade
-        filter_parts = []
-        
-        # 1. Pré-processamento de cada vídeo
-        for idx in range(len(clip_files)):
-            filter_parts.append(f"[{idx}:v]scale={width}:{height}:flags=lanczos,fps={fps},format=yuv420p,setpts=PTS-STARTPTS[v{idx}]")
-
-        # 2. Encadeamento com xfade
-        if len(clip_files) == 1:
-            current = "v0"
-        else:
-            current = "v0"
-            accumulated_time = 0.0
-            
-            for i in range(1, len(clip_files)):
-                # xfade offset deve começar nos últimos 'dur_fade' segundos
-                # do input 1 (timeline acumulada até o clipe i-1), o que resulta em:
-                #   offset_i = (dur0 + ... + dur{i-1}) - i*dur_fade
-                # usando accumulated_time como soma até i-2, somamos o dur do (i-1)
-                offset = (accumulated_time + clip_durations[i-1]) - (i * dur_fade)
-                if offset < 0:
-                    offset = 0.0
-                output_label = f"xfade{i}"
-
-                filter_parts.append(
-                    f"[{current}][v{i}]xfade=transition=fade:duration={dur_fade:.3f}:offset={offset:.3f}[{output_label}]"
-                )
-                current = output_label
-                accumulated_time += clip_durations[i-1]
-
-        # 3. Aplicar legenda se existir
-        video_output = current
-        if tem_legenda and ass_path.exists():
-            filter_parts.append(f"[{video_output}]ass={ass_path.name}[vout]")
-            video_output = "vout"
-
-        filter_complex = ";".join(filter_parts)
-
-        # Comando final
-        cmd_final += [
-            "-filter_complex", filter_complex,
-            "-map", f"[{video_output}]",
-            "-map", f"{len(clip_files)}:a",
-            "-c:v", "libx264", "-preset", "medium", "-crf", "18",
-            "-c:a", "aac", "-b:a", "192k",
-            "-shortest",
-            "-movflags", "+faststart",
-            "-r", str(fps),
-            "-pix_fmt", "yuv420p",
-            str(output_path)
-        ]
-
-        # Executar render
+        # Blocos de K clipes com um clipe compartilhado entre vizinhos, renderizados em
+        # paralelo; bloco que falha é refeito sozinho (sem legenda só se o canal aceitar)
         try:
-            print("🔧 Executando FFmpeg para vídeo longo...")
-            result = subprocess.run(cmd_final, check=True, cwd=temp_dir, capture_output=True, text=True, timeout=600)
-        except subprocess.CalledProcessError as e:
+            renderizar_xfade_em_blocos(
+                clip_files, clip_durations, dur_fade, output_path,
+                audio_path=audio, fps=fps, largura=width, altura=height,
+                ass_path=ass_path if tem_legenda and ass_path.exists() else None,
+                clipes_por_bloco=int(config.get('XFADE_CLIPES_POR_BLOCO', CLIPES_POR_BLOCO)),
+                tentativas=int(config.get('XFADE_TENTATIVAS', 2)),
+                pasta=temp_dir / "blocos",
+                orcamento_cpu=config.get('RENDER_CPU_BUDGET'),
+                sem_legenda_se_falhar=bool(config.get('XFADE_FALLBACK_SEM_LEGENDA', False))
+            )
+        except RuntimeError as e:
             print(f"❌ Erro no FFmpeg (xfade): {e}")
-            if e.stderr:
-                print(f"🔍 STDERR: {e.stderr[:500]}...")
-            
-            # Tentar fallback sem legenda
-            if "ass=" in filter_complex:
-                print("🔄 Tentando sem legenda...")
-                filter_simple = ";".join([part for part in filter_parts if "ass=" not in part])
-                cmd_simple = [
-                    "ffmpeg", "-y", "-hide_banner", "-loglevel", "warning"
-                ]
-                for cf in clip_files:
-                    cmd_simple += ["-i", str(cf.name)]
-                cmd_simple += ["-i", str(audio_temp.name)]
-                cmd_simple += [
-                    "-filter_complex", filter_simple,
-                    "-map", "[vout]" if "vout" in filter_simple else f"[{current}]",
-                    "-map", f"{len(clip_files)}:a",
-                    "-c:v", "libx264", "-preset", "medium", "-crf", "18",
-                    "-c:a", "aac", "-b:a", "192k",
-                    "-shortest", "-movflags", "+faststart",
-                    "-r", str(fps), "-pix_fmt", "yuv420p",
-                    str(output_path)
-                ]
-                try:
-                    subprocess.run(cmd_simple, check=True, cwd=temp_dir, timeout=600)
-                except subprocess.CalledProcessError as e2:
-                    print(f"❌ Também falhou sem legenda: {e2}")
-                    return None
+            return None
 
         if output_path.exists():
             duracao_final = get_media_duration(output_path)
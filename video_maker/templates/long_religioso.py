@@ -5,7 +5,7 @@ maker.py - Template otimizado para vídeos longos - HORIZONTAL (1280x720)
 Versão otimizada para performance
 """
 import re
-import argparse, random, subprocess, tempfile, os, sys
+import argparse, subprocess, tempfile, os, sys
 import time
 import math
 from pathlib import Path
@@ -17,68 +17,31 @@ from video_maker.video_utils import (
     get_media_duration, listar_videos, preparar_diretorios_trabalho, 
     limpar_diretorio_temp
 )
+from video_maker.media_info import obter_duracoes, obter_duracao
+from video_maker.biblioteca_clipes import carregar_biblioteca
+from video_maker.selecao_clipes import selecionar_clipes
+from video_maker.encoder_profiles import perfil_final
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.encode_segmentado import encodar_segmentado, entrada_com_seek, segmentos_padrao
 
 VIDEOS_DIR = {".mp4", ".mov", ".mkv", ".m4v", ".webm", ".avi"}
 
-def run(cmd: list) -> None:
-    """Executa comando com melhor tratamento de erro"""
+def run(cmd: list, duracao: float = None, rotulo: str = "") -> None:
+    """Executa comando com melhor tratamento de erro (progresso via ffmpeg_runner)"""
     print(f"🔧 Executando: {' '.join(cmd[:4])}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = executar_ffmpeg(cmd, duracao=duracao, rotulo=rotulo, check=False)
     if result.returncode != 0:
         print(f"❌ Erro FFmpeg (code {result.returncode})")
         print(f"   Detalhes: {result.stderr[:500]}...")
         raise subprocess.CalledProcessError(result.returncode, cmd)
 
 def ffprobe_duration(path: Path) -> float:
-    """Obtém duração de arquivo de mídia"""
+    """Obtém duração de arquivo de mídia (cache de media info)"""
     try:
-        out = subprocess.check_output([
-            "ffprobe", "-v", "error", "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1", str(path)
-        ], text=True, stderr=subprocess.DEVNULL)
-        return float(out.strip())
+        return obter_duracao(path)
     except Exception:
         return 0.0
 
-def detect_hardware_acceleration():
-    """Detecta a melhor aceleração de hardware disponível"""
-    # Testa NVENC (NVIDIA)
-    try:
-        subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], 
-                      capture_output=True, text=True, check=True)
-        print("✅ NVENC disponível")
-        return {
-            'video_encoder': 'h264_nvenc',
-            'preset': 'p4',  # Mais rápido que p5
-            'quality': '-cq 23',  # Qualidade balanceada
-            'pix_fmt': 'yuv420p'
-        }
-    except:
-        pass
-    
-    # Testa QSV (Intel)
-    try:
-        subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], 
-                      capture_output=True, text=True, check=True)
-        print("✅ QSV disponível")
-        return {
-            'video_encoder': 'h264_qsv',
-            'preset': 'fast',
-            'quality': '-q 24',
-            'pix_fmt': 'nv12'
-        }
-    except:
-        pass
-    
-    # Fallback para CPU (mais lento)
-    print("⚠️  Usando encoder de CPU (mais lento)")
-    return {
-        'video_encoder': 'libx264',
-        'preset': 'medium',
-        'quality': '-crf 23',
-        'pix_fmt': 'yuv420p'
-    }
-
 def render(audio_path: str, config: dict, roteiro) -> Path:
     """
     Template OTIMIZADO para vídeos longos com vídeos pré-processados
@@ -86,8 +49,8 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
     inicio = time.time()
     audio = Path(audio_path)
     
-    # Detectar aceleração de hardware
-    hw_config = detect_hardware_acceleration()
+    # Encoder: hardware só se passou no encode de teste desta máquina (sondagem em cache)
+    perfil_video = perfil_final("x264_medio", hardware=config.get('ENCODER_HARDWARE', False))
     
     # ✅ CORREÇÃO CRÍTICA: Tratamento robusto para o diretório de vídeos
     videos_dir = config.get('VIDEOS_DIR')
@@ -101,7 +64,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
     print(f"🎯 Hook: {hook}")
     print(f"📁 Vídeos: {videos_dir}")
     print(f"📁 Saída: {output_dir}")
-    print(f"⚡ Aceleração: {hw_config['video_encoder']}")
+    print(f"⚡ Encoder: {perfil_video.codec} ({perfil_video.nome})")
 
     try:
         # 1. Validações
@@ -112,35 +75,36 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         duracao_audio = ffprobe_duration(audio)
         print(f"🎵 Duração do áudio: {duracao_audio:.2f}s")
 
-        # 2. Coleta vídeos pré-processados
-        videos = [Path(v) for v in listar_videos(videos_dir)]
+        # 2. Coleta vídeos: biblioteca normalizada (durações no índice) ou clipes originais
+        biblioteca = carregar_biblioteca(videos_dir, config.get('VIDEOS_DIR_NORMALIZADOS'))
+        if biblioteca:
+            videos = [video for video, _ in biblioteca]
+            duracoes = dict(biblioteca)
+            print(f"📚 Biblioteca normalizada: {len(videos)} clipes (concat sem re-encode)")
+        else:
+            videos = [Path(v) for v in listar_videos(videos_dir)]
             
-        if not videos:
-            raise ValueError(f"❌ Nenhum vídeo encontrado em {videos_dir}")
+            if not videos:
+                raise ValueError(f"❌ Nenhum vídeo encontrado em {videos_dir}")
 
-        # 3. Seleção baseada em DURAÇÃO REAL (OTIMIZADA)
-        print("📊 Calculando durações dos vídeos...")
-        duracao_total = 0
-        videos_selecionados = []
-        
-        # Embaralha os vídeos
-        random.shuffle(videos)
-        
-        # Seleciona vídeos até ter duração suficiente + margem menor
-        for video in videos:
-            if duracao_total >= duracao_audio * 1.1:  # Reduzido para 10% de margem
-                break
-            duracao_video = ffprobe_duration(video)
-            videos_selecionados.append(video)
-            duracao_total += duracao_video
-        
-        # Se ainda não tem vídeos suficientes, recicla
-        while duracao_total < duracao_audio:
-            video = random.choice(videos)
-            duracao_video = ffprobe_duration(video)
-            videos_selecionados.append(video)
-            duracao_total += duracao_video
-            print(f"🔄 Reciclando vídeos... Duração atual: {duracao_total:.2f}s")
+            print("📊 Calculando durações dos vídeos...")
+            # uma sondagem por arquivo (cache SQLite; faltantes em paralelo)
+            duracoes = dict(zip(videos, obter_duracoes(videos)))
+            if not any(duracoes.values()):
+                raise ValueError(f"❌ Nenhum vídeo legível em {videos_dir}")
+
+        # 3. Seleção por duração: sem repetir clipes, soma entre o áudio e áudio + tolerância
+        # (mesma semente = mesma seleção; padrão: nome do áudio, re-render reproduzível)
+        semente = config.get('SEMENTE_SELECAO', audio.stem)
+        videos_selecionados = selecionar_clipes(
+            duracoes, duracao_audio,
+            tolerancia=float(config.get('TOLERANCIA_SELECAO', 2.0)),
+            semente=semente
+        )
+        duracao_total = sum(duracoes[video] for video in videos_selecionados)
+        repetidos = len(videos_selecionados) - len(set(videos_selecionados))
+        if repetidos:
+            print(f"🔄 Biblioteca menor que o áudio: {repetidos} clipes repetidos")
 
         print(f"🎬 Selecionados {len(videos_selecionados)} vídeos")
         print(f"📏 Duração total dos vídeos: {duracao_total:.2f}s (áudio: {duracao_audio:.2f}s)")
@@ -169,42 +133,59 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
                 caminho_absoluto = video.resolve().as_posix().replace("'", "'\\''")
                 f.write(f"file '{caminho_absoluto}'\n")
 
-        print("🎞️ Processamento único: concat + legenda + encode...")
         video_intermediario = temp_dir / "video_intermediario.mp4"
 
-        # COMANDO ÚNICO OTIMIZADO: concat + legenda + encode acelerado
-        cmd = [
-            "ffmpeg", "-y",
-            "-f", "concat", "-safe", "0",
-            "-i", str(lista_concat),
-        ]
-
-        # Adiciona legenda se existir
-        if tem_legenda and ass_path.exists():
-            legenda_escaped = _ff_esc(ass_path)
-            cmd += ["-vf", f"subtitles='{legenda_escaped}'"]
+        # Encode segmentado só com libx264 (GPUs limitam sessões simultâneas de encode)
+        segmentos = 1
+        if config.get('ENCODE_SEGMENTADO', True) and perfil_video.codec == "libx264":
+            segmentos = segmentos_padrao(duracao_audio)
 
-        # Parâmetros de encode OTIMIZADOS
-        cmd += [
-            "-an",  # Sem áudio por enquanto
-            "-c:v", hw_config['video_encoder'],
-            "-preset", hw_config['preset'],
-        ]
-        
-        # Adiciona parâmetros de qualidade específicos
-        if hw_config['video_encoder'] in ['h264_nvenc', 'h264_qsv']:
-            cmd += ["-cq", "23", "-b:v", "0"]
+        if biblioteca and not tem_legenda:
+            # Clipes no formato canônico e nada a queimar: concat sem re-encode
+            print("🎞️ Concat em cópia (biblioteca normalizada, sem legenda)...")
+            run([
+                "ffmpeg", "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", str(lista_concat),
+                "-an",
+                "-c", "copy",
+                "-movflags", "+faststart",
+                "-t", str(duracao_audio),
+                str(video_intermediario)
+            ], duracao=duracao_audio, rotulo="concat")
+        elif segmentos > 1:
+            # Trechos da linha do tempo encodados em paralelo, cada um com a legenda deslocada
+            encodar_segmentado(
+                entrada_com_seek(["-f", "concat", "-safe", "0", "-i", str(lista_concat.resolve())]),
+                duracao_audio, video_intermediario, fps=30,
+                ass_path=ass_path if tem_legenda else None,
+                perfil_video=perfil_video, segmentos=segmentos
+            )
         else:
-            cmd += ["-crf", "23"]
-            
-        cmd += [
-            "-pix_fmt", hw_config['pix_fmt'],
-            "-movflags", "+faststart",
-            "-t", str(duracao_audio),  # Corta no tempo exato
-            str(video_intermediario)
-        ]
+            print("🎞️ Processamento único: concat + legenda + encode...")
+
+            # COMANDO ÚNICO OTIMIZADO: concat + legenda + encode acelerado
+            cmd = [
+                "ffmpeg", "-y",
+                "-f", "concat", "-safe", "0",
+                "-i", str(lista_concat),
+            ]
+
+            # Adiciona legenda se existir
+            if tem_legenda and ass_path.exists():
+                legenda_escaped = _ff_esc(ass_path)
+                cmd += ["-vf", f"subtitles='{legenda_escaped}'"]
+
+            # Parâmetros de encode (perfil final)
+            cmd += [
+                "-an",  # Sem áudio por enquanto
+                *perfil_video.args(),
+                "-movflags", "+faststart",
+                "-t", str(duracao_audio),  # Corta no tempo exato
+                str(video_intermediario)
+            ]
         
-        run(cmd)
+            run(cmd, duracao=duracao_audio, rotulo="encode")
 
         # 6. Verificação rápida
         duracao_concat = ffprobe_duration(video_intermediario)
@@ -230,7 +211,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
             "-shortest",
             "-movflags", "+faststart",
             str(output_path)
-        ])
+        ], duracao=duracao_audio, rotulo="mux")
         
         # 8. Verificação final
         duracao_final = ffprobe_duration(output_path)
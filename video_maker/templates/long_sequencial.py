@@ -1,4 +1,3 @@
-import subprocess
 import sys
 from pathlib import Path
 
@@ -9,6 +8,9 @@ sys.path.insert(0, str(project_root))
 from roteiro_manager import RoteiroManager
 from video_maker.subtitle_tools import srt_to_ass_karaoke
 from video_maker.efeitos.depth_3d import criar_video_depth_3d
+from video_maker.efeitos.cache_profundidade import obter_profundidades
+from video_maker.encoder_profiles import INTERMEDIARIO, perfil_final, verificar_espaco_scratch
+from video_maker.ffmpeg_runner import executar_ffmpeg
 
 from video_maker.video_utils import (
     listar_imagens, get_media_duration, preparar_diretorios_trabalho, safe_copy
@@ -31,8 +33,16 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
 
     videos_files = []
 
-    for img_path in images_dir:
-        video = criar_video_depth_3d(img_path, temp=dur)
+    # clipes depth_3d (30fps) + concat em cópia
+    verificar_espaco_scratch(temp_dir, 2 * INTERMEDIARIO.estimar_bytes(audio_duration, 1280, 720, 30))
+
+    # Profundidade de todas as imagens: cache por hash, faltantes em lote no modelo
+    depths = obter_profundidades(images_dir)
+
+    # Remap direto em 1280x720: todos os clipes saem com o mesmo tamanho/codec/fps
+    width, height = 1280, 720
+    for img_path, depth in zip(images_dir, depths):
+        video = criar_video_depth_3d(img_path, temp=dur, depth=depth, largura=width, altura=height)
         videos_files.append(video.filename)
         print(f"Vídeo criado em: {video.filename}")
 
@@ -49,25 +59,20 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
 
     video_id = audio.stem
 
-    saida_conteudo = temp_dir / f"{video_id}_conteudo.mp4"
+    saida_conteudo = temp_dir / f"{video_id}_conteudo{INTERMEDIARIO.extensao}"
 
+    # Clipes idênticos em formato: concatena sem re-encode
     cmd_concat = [
             "ffmpeg", "-y", 
             "-f", "concat", 
             "-safe", "0",
             "-i", str(lista_videos.resolve()),
-            "-c:v", "libx264", 
-            "-preset", "fast", 
-            "-crf", "23",
-            "-c:a", "aac", 
-            "-b:a", "192k",
-            "-pix_fmt", "yuv420p",
-            "-r", "30",
+            "-c", "copy",
             str(saida_conteudo.resolve())
         ]
         
     print(f"🎥 Executando concatenação...")
-    result = subprocess.run(cmd_concat, capture_output=True, text=True)
+    result = executar_ffmpeg(cmd_concat, rotulo="concat", execucao="copia", check=False)
 
     srt_path = Path(audio).with_suffix('.srt')
     ass_path = temp_dir / "legenda.ass"
@@ -85,13 +90,14 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         "-i", str(saida_conteudo),
         "-i", str(audio_temp),
         "-vf", f"ass='{legenda_esc}'",  # ↩️ aspas dentro do valor do filtro (por causa do espaço em 'Canal Terror')
-        "-c:v", "libx264", "-preset", "fast", "-crf", "21",
+        *perfil_final("x264_rapido").args(),
         "-c:a", "aac", "-b:a", "192k",
         "-shortest",
         str(output_path)
     ]
     print("🔧 Comando FFmpeg:", ' '.join(cmd))
-    subprocess.run(cmd, check=True, capture_output=True)
+    executar_ffmpeg(cmd, duracao=audio_duration, rotulo="final")
+    return output_path
 
 
     #video = criar_video_depth_3d(images_dir[0], temp=40)
@@ -104,5 +110,7 @@ if __name__ == '__main__':
     roteiro_manager = RoteiroManager()
     roteiro = roteiro_manager.buscar_por_id(126)
 
-    result = render(, {}, "teste")
+    # uso: python long_sequencial.py <audio.mp3>
+    audio_teste = sys.argv[1] if len(sys.argv) > 1 else "teste.mp3"
+    result = render(audio_teste, {}, roteiro)
     print(f"Resultado: {result}")
\ No newline at end of file
@@ -3,10 +3,11 @@ import json
 import random
 import re
 import shutil
-import subprocess
 from pathlib import Path
 
 from video_maker.subtitle_tools import srt_to_ass_karaoke
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
 from video_maker.video_engine import aplicar_efeito
 from video_maker.video_utils import (
     get_media_duration, listar_imagens, quebrar_texto,
@@ -91,7 +92,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         duracao_capa = float(config.get("duracao_capa", 3.0))
 
         try:
-            capa_com_efeito = aplicar_efeito('camera_instavel', str(capa_path), duracao_capa)
+            capa_com_efeito = aplicar_efeito('camera_instavel', str(capa_path), duracao_capa, largura=width, altura=height)
             if capa_com_efeito and hasattr(capa_com_efeito, 'filename') and Path(capa_com_efeito.filename).exists():
                 norm = normalizar_duracao(capa_com_efeito.filename, duracao_capa, fps=fps)
                 if norm and Path(norm).exists():
@@ -138,7 +139,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
                 efeito = efeitos[i % len(efeitos)]
                 try:
                     print(f"🎬 [{i+1}/{len(imgs_restantes)}] {Path(img).name} → {efeito} ({duracao_clip:.2f}s)")
-                    raw = aplicar_efeito(efeito, img, duracao_clip)
+                    raw = aplicar_efeito(efeito, img, duracao_clip, largura=width, altura=height)
                     if raw and hasattr(raw, 'filename') and Path(raw.filename).exists():
                         norm = normalizar_duracao(raw.filename, duracao_clip, fps=fps)
                         if norm and Path(norm).exists():
@@ -255,8 +256,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
             "-filter_complex", filter_complex,
             "-map", "[vout]",
             "-map", "[aout]",
-            "-c:v", "libx264", "-preset", "medium", "-crf", "18",
-            "-pix_fmt", "yuv420p",
+            *FINAL.args(),
             "-r", str(fps),
             "-c:a", "aac", "-b:a", "192k",
             "-movflags", "+faststart",
@@ -267,7 +267,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         print(f"🔧 Filter complex: {filter_complex}")
 
         # Execução
-        subprocess.run(cmd_final, check=True, cwd=temp_dir)
+        executar_ffmpeg(cmd_final, duracao=target_total, rotulo="final", cwd=temp_dir)
 
         # Verificação final
         if output_path.exists():
@@ -7,6 +7,8 @@ import subprocess
 from pathlib import Path
 
 from video_maker.subtitle_tools import srt_to_ass_karaoke
+from video_maker.encoder_profiles import FINAL
+from video_maker.ffmpeg_runner import executar_ffmpeg
 from video_maker.video_engine import aplicar_efeito
 from video_maker.video_utils import (
     get_media_duration, listar_imagens, quebrar_texto,
@@ -86,7 +88,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         duracao_capa = min(4.0, max(2.0, audio_duration * 0.10))
 
         try:
-            capa_com_efeito = aplicar_efeito('camera_instavel', str(capa_path), duracao_capa)
+            capa_com_efeito = aplicar_efeito('camera_instavel', str(capa_path), duracao_capa, largura=width, altura=height)
             if capa_com_efeito and hasattr(capa_com_efeito, 'filename') and Path(capa_com_efeito.filename).exists():
                 norm = normalizar_duracao(capa_com_efeito.filename, duracao_capa, fps=fps)
                 if norm and Path(norm).exists():
@@ -130,7 +132,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
                 efeito = efeitos[i % len(efeitos)]
                 try:
                     print(f"🎬 [{i+1}/{len(imgs_restantes)}] {Path(img).name} → {efeito} ({duracao_por_imagem:.2f}s)")
-                    raw = aplicar_efeito(efeito, img, duracao_por_imagem)
+                    raw = aplicar_efeito(efeito, img, duracao_por_imagem, largura=width, altura=height)
                     if raw and hasattr(raw, 'filename') and Path(raw.filename).exists():
                         norm = normalizar_duracao(raw.filename, duracao_clip, fps=fps)
                         if norm and Path(norm).exists():
@@ -252,8 +254,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
             "-filter_complex", filter_complex,
             "-map", "[vout]",
             "-map", "[aout]",
-            "-c:v", "libx264", "-preset", "medium", "-crf", "18",
-            "-pix_fmt", "yuv420p",
+            *FINAL.args(),
             "-r", str(fps),
             "-c:a", "aac", "-b:a", "192k",
             "-movflags", "+faststart",
@@ -266,7 +267,7 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
 
         # Execução
         try:
-            subprocess.run(cmd_final, check=True, cwd=temp_dir)
+            executar_ffmpeg(cmd_final, duracao=audio_duration, rotulo="final", cwd=temp_dir)
         except subprocess.CalledProcessError as e:
             print("❌ Erro no FFmpeg.")
             # Mostra um trecho do erro para debug rápido
@@ -5,6 +5,11 @@ import subprocess
 from pathlib import Path
 
 from video_maker.video_engine import aplicar_efeito
+from video_maker.cache_clipes import clipe_em_cache
+from video_maker.encoder_profiles import INTERMEDIARIO, perfil_final, verificar_espaco_scratch
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.render_paralelo import renderizar_clipes
+from video_maker.render_passo_unico import renderizar_passo_unico, suporta_efeitos
 from video_maker.subtitle_tools import srt_to_ass_karaoke
 from video_maker.video_utils import (
     get_media_duration, listar_imagens, 
@@ -91,153 +96,167 @@ def render(audio_path: str, config: dict, roteiro) -> Path:
         gerar_capa_pillow(imagens_selecionadas[0], hook, capa_path)
         print("🖼️ Capa gerada")
 
-        # 5. Criar clipes
-        video_files = []
-        
-        # Intro com capa (3 segundos)
-        try:
-            print("🎬 Criando intro com capa...")
-            intro = aplicar_efeito('camera_instavel', str(capa_path), 3.0)
-            if intro and hasattr(intro, 'filename'):
-                video_files.append(intro.filename)
-                print("✅ Intro criada")
-        except Exception as e:
-            print(f"❌ Erro na intro: {e}")
-            criar_frame_estatico(capa_path, 3.0, temp_dir / "intro_fallback.mp4")
-            video_files.append(temp_dir / "intro_fallback.mp4")
-
-        # Clipes das imagens restantes
+        # 5. Definir clipes
+        # Intro com capa (3 segundos) + clipes das imagens restantes
         rest_duration = max(0.0, audio_duration - 3.0)
-        remaining_images = imagens_selecionadas[1:]
-        
-        if remaining_images and rest_duration > 0:
-            segment_duration = rest_duration / len(remaining_images)
-            efeitos = ['camera_instavel', 'pan', 'zoom_invertido']
+        remaining_images = imagens_selecionadas[1:] if rest_duration > 0 else []
+        segment_duration = rest_duration / len(remaining_images) if remaining_images else 0.0
+        efeitos = ['camera_instavel', 'pan', 'zoom_invertido']
 
-            print(f"⏱️ Duração por imagem: {segment_duration:.2f}s")
-            
-            for i, img in enumerate(remaining_images):
-                efeito = efeitos[i % len(efeitos)]
-                try:
-                    print(f"🎬 [{i+1}/{len(remaining_images)}] {Path(img).name} → {efeito} ({segment_duration:.2f}s)")
-                    raw_video = aplicar_efeito(efeito, img, segment_duration)
-                    
-                    if raw_video and hasattr(raw_video, 'filename'):
-                        video_files.append(raw_video.filename)
-                        print(f"   ✅ {efeito} aplicado")
-                    else:
-                        raise Exception("Efeito não retornou arquivo")
-                        
-                except Exception as e:
-                    print(f"❌ Erro em {img}: {e}")
-                    # Fallback estático
-                    fallback_path = temp_dir / f"fallback_{i:02d}.mp4"
-                    criar_frame_estatico(img, segment_duration, fallback_path)
-                    video_files.append(fallback_path)
-                    print(f"   ✅ Fallback estático criado")
+        clipes = [('camera_instavel', str(capa_path), 3.0)]
+        clipes += [(efeitos[i % len(efeitos)], img, segment_duration) for i, img in enumerate(remaining_images)]
 
-        print(f"📊 Total de clipes gerados: {len(video_files)}")
+        if remaining_images:
+            print(f"⏱️ Duração por imagem: {segment_duration:.2f}s")
 
-        # 6. Concatenar vídeos
-        print("🔗 Concatenando vídeos...")
         video_id = audio.stem
-        saida_conteudo = temp_dir / f"{video_id}_conteudo.mp4"
+        output_path = output_dir / f"{video_id}.mp4"
+
+        # 6. Passo único: efeitos + concat + legenda + áudio num só encode
+        perfil_video = perfil_final("x264_rapido")
+        renderizado = False
+        if config.get('RENDER_PASSO_UNICO', True) and suporta_efeitos(e for e, _, _ in clipes):
+            print("🎬 Renderizando em passo único (efeitos, concat, legenda e áudio)...")
+            try:
+                renderizar_passo_unico(
+                    clipes, audio, output_path, fps,
+                    legenda=ass_path if tem_legenda else None,
+                    arquivo_grafo=temp_dir / "grafo.txt",
+                    perfil_video=perfil_video
+                )
+                renderizado = True
+                print("✅ Vídeo final renderizado em passo único")
+            except Exception as e:
+                print(f"❌ Passo único falhou, usando clipes separados: {e}")
+
+        if not renderizado:
+            # clipes dos efeitos (60fps) + concat (30fps) no perfil de intermediários
+            verificar_espaco_scratch(
+                temp_dir,
+                INTERMEDIARIO.estimar_bytes(audio_duration, width, height, 60)
+                + INTERMEDIARIO.estimar_bytes(audio_duration, width, height, fps)
+            )
+            print("🎬 Criando intro com capa e clipes das imagens...")
+            video_files = []
+
+            tarefas = [
+                ((efeito, img, dur), lambda efeito=efeito, img=img, dur=dur: aplicar_efeito(efeito, img, dur, largura=width, altura=height))
+                for efeito, img, dur in clipes
+            ]
+            resultados = renderizar_clipes(
+                tarefas,
+                orcamento_cpu=config.get('RENDER_CPU_BUDGET'),
+                max_paralelo=config.get('RENDER_MAX_PARALELO')
+            )
+
+            for i, ((efeito, img, dur), (raw_video, erro)) in enumerate(zip(clipes, resultados)):
+                nome = "intro" if i == 0 else f"[{i}/{len(remaining_images)}] {Path(img).name}"
+                if erro is None and raw_video and hasattr(raw_video, 'filename'):
+                    video_files.append(raw_video.filename)
+                    print(f"   ✅ {nome} → {efeito} ({dur:.2f}s)")
+                    continue
+
+                print(f"❌ Erro em {nome}: {erro or 'Efeito não retornou arquivo'}")
+                # Fallback estático
+                fallback_path = temp_dir / (f"intro_fallback{INTERMEDIARIO.extensao}" if i == 0 else f"fallback_{i-1:02d}{INTERMEDIARIO.extensao}")
+                clipe_em_cache(
+                    'frame_estatico', img, dur,
+                    lambda: criar_frame_estatico(img, dur, fallback_path),
+                    destino=fallback_path, largura=width, altura=height
+                )
+                video_files.append(fallback_path)
+                print(f"   ✅ Fallback estático criado")
+
+            print(f"📊 Total de clipes gerados: {len(video_files)}")
+
+            # 7. Concatenar vídeos
+            print("🔗 Concatenando vídeos...")
+            saida_conteudo = temp_dir / f"{video_id}_conteudo{INTERMEDIARIO.extensao}"
         
-        # Criar lista de vídeos com caminhos absolutos
-        lista_videos = temp_dir / "lista_videos.txt"
-        with open(lista_videos, "w", encoding="utf-8") as f:
-            for video in video_files:
-                if video and Path(video).exists():
-                    # Usar caminho absoluto para evitar problemas
-                    f.write(f"file '{Path(video).resolve()}'\n")
-                    print(f"   ✅ Adicionado: {Path(video).name}")
-                else:
-                    print(f"⚠️  Arquivo de vídeo não encontrado: {video}")
+            # Criar lista de vídeos com caminhos absolutos
+            lista_videos = temp_dir / "lista_videos.txt"
+            with open(lista_videos, "w", encoding="utf-8") as f:
+                for video in video_files:
+                    if video and Path(video).exists():
+                        # Usar caminho absoluto para evitar problemas
+                        f.write(f"file '{Path(video).resolve()}'\n")
+                        print(f"   ✅ Adicionado: {Path(video).name}")
+                    else:
+                        print(f"⚠️  Arquivo de vídeo não encontrado: {video}")
 
-        # Concatenação com re-encode para compatibilidade
-        cmd_concat = [
-            "ffmpeg", "-y", 
-            "-f", "concat", 
-            "-safe", "0",
-            "-i", str(lista_videos.resolve()),
-            "-c:v", "libx264", 
-            "-preset", "fast", 
-            "-crf", "23",
-            "-c:a", "aac", 
-            "-b:a", "192k",
-            "-pix_fmt", "yuv420p",
-            "-r", str(fps),
-            str(saida_conteudo.resolve())
-        ]
+            # Concatenação com re-encode (perfil de intermediários) para uniformizar fps
+            cmd_concat = [
+                "ffmpeg", "-y", 
+                "-f", "concat", 
+                "-safe", "0",
+                "-i", str(lista_videos.resolve()),
+                *INTERMEDIARIO.args(),
+                "-an",
+                "-r", str(fps),
+                str(saida_conteudo.resolve())
+            ]
         
-        print(f"🎥 Executando concatenação...")
-        result = subprocess.run(cmd_concat, capture_output=True, text=True)
+            print(f"🎥 Executando concatenação...")
+            result = executar_ffmpeg(cmd_concat, duracao=audio_duration, rotulo="concat", execucao="efeito", check=False)
         
-        if result.returncode != 0:
-            print(f"❌ Erro na concatenação: {result.stderr}")
-            # Tentar método alternativo
-            print("🔄 Tentando método alternativo de concatenação...")
-            saida_conteudo = _concatenar_metodo_alternativo(video_files, saida_conteudo, fps)
-            if not saida_conteudo or not saida_conteudo.exists():
-                raise Exception("Todos os métodos de concatenação falharam")
+            if result.returncode != 0:
+                print(f"❌ Erro na concatenação: {result.stderr}")
+                # Tentar método alternativo
+                print("🔄 Tentando método alternativo de concatenação...")
+                saida_conteudo = _concatenar_metodo_alternativo(video_files, saida_conteudo, fps)
+                if not saida_conteudo or not saida_conteudo.exists():
+                    raise Exception("Todos os métodos de concatenação falharam")
         
-        print("✅ Vídeos concatenados")
+            print("✅ Vídeos concatenados")
 
-        # 7. Adicionar áudio e legenda ao vídeo final
-        output_path = output_dir / f"{video_id}.mp4"
-
-        # Verificar se a legenda existe e copiar para temp
-        legenda_temp = temp_dir / "legenda.ass"
-        if tem_legenda and ass_path.exists() and not legenda_temp.exists():
-            shutil.copy2(ass_path, legenda_temp)
-            print(f"📝 Legenda copiada para: {legenda_temp}")
+            # 8. Adicionar áudio e legenda ao vídeo final
+            # Verificar se a legenda existe e copiar para temp
+            legenda_temp = temp_dir / "legenda.ass"
+            if tem_legenda and ass_path.exists() and not legenda_temp.exists():
+                shutil.copy2(ass_path, legenda_temp)
+                print(f"📝 Legenda copiada para: {legenda_temp}")
 
-        audio_temp = temp_dir / audio.name
-        safe_copy(audio, audio_temp)
+            audio_temp = temp_dir / audio.name
+            safe_copy(audio, audio_temp)
 
-        # Comando final com ou sem legenda
-        if tem_legenda and legenda_temp.exists():
-            print("🔤 Queimando legenda no vídeo...")
+            # Comando final com ou sem legenda (único encode com perda)
+            filtro_legenda = []
+            if tem_legenda and legenda_temp.exists():
+                print("🔤 Queimando legenda no vídeo...")
                         
-            # caminho absoluto → em formato POSIX
-            legenda_path_abs = legenda_temp.resolve().as_posix()                # E:/Canal Terror/Vídeos/temp/legenda.ass
-            # escapar o ":" do drive (E:)
-            legenda_esc = legenda_path_abs.replace(':', r'\:')                  # E\:/Canal Terror/Vídeos/temp/legenda.ass
+                # caminho absoluto → em formato POSIX
+                legenda_path_abs = legenda_temp.resolve().as_posix()                # E:/Canal Terror/Vídeos/temp/legenda.ass
+                # escapar o ":" do drive (E:)
+                legenda_esc = legenda_path_abs.replace(':', r'\:')                  # E\:/Canal Terror/Vídeos/temp/legenda.ass
+                filtro_legenda = ["-vf", f"ass='{legenda_esc}'"]  # ↩️ aspas dentro do valor do filtro (por causa do espaço em 'Canal Terror')
 
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", str(saida_conteudo),
-                "-i", str(audio_temp),
-                "-vf", f"ass='{legenda_esc}'",  # ↩️ aspas dentro do valor do filtro (por causa do espaço em 'Canal Terror')
-                "-c:v", "libx264", "-preset", "fast", "-crf", "21",
-                "-c:a", "aac", "-b:a", "192k",
-                "-shortest",
-                str(output_path)
-            ]
-            print("🔧 Comando FFmpeg:", ' '.join(cmd))
-            subprocess.run(cmd, check=True, capture_output=True)
-        try:
-            print("🎬 Renderizando vídeo final...")
-            #result = subprocess.run(, capture_output=True, text=True, check=True)
-            print("✅ Vídeo final renderizado com sucesso")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Erro ao renderizar vídeo final: {e}")
-            print(f"📋 Stderr: {e.stderr}")
-            
-            # Tentar fallback sem legenda se houver erro
-            if tem_legenda:
-                print("🔄 Tentando fallback sem legenda...")
-                cmd_fallback = [
+            def _cmd_final(filtro):
+                return [
                     "ffmpeg", "-y",
-                    "-i", str(saida_conteudo.resolve()),
-                    "-i", str(audio.resolve()),
-                    "-c:v", "copy",
+                    "-i", str(saida_conteudo),
+                    "-i", str(audio_temp),
+                    *filtro,
+                    *perfil_video.args(),
                     "-c:a", "aac", "-b:a", "192k",
                     "-shortest",
                     "-movflags", "+faststart",
-                    str(output_path.resolve())
+                    str(output_path)
                 ]
-                subprocess.run(cmd_fallback, capture_output=True, check=True)
+
+            try:
+                print("🎬 Renderizando vídeo final...")
+                cmd = _cmd_final(filtro_legenda)
+                print("🔧 Comando FFmpeg:", ' '.join(cmd))
+                executar_ffmpeg(cmd, duracao=audio_duration, rotulo="final")
+                print("✅ Vídeo final renderizado com sucesso")
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Erro ao renderizar vídeo final: {e}")
+                print(f"📋 Stderr: {e.stderr}")
+            
+                # Tentar fallback sem legenda se houver erro
+                if filtro_legenda:
+                    print("🔄 Tentando fallback sem legenda...")
+                    executar_ffmpeg(_cmd_final([]), duracao=audio_duration, rotulo="final sem legenda")
         
         if output_path.exists():
             duracao_final = get_media_duration(output_path)
@@ -284,16 +303,13 @@ def _concatenar_metodo_alternativo(video_files, saida_conteudo, fps):
             "-f", "concat",
             "-safe", "0", 
             "-i", str(lista_temp.resolve()),
-            "-c:v", "libx264",
-            "-preset", "superfast",
-            "-crf", "25",
+            *INTERMEDIARIO.args(),
             "-r", str(fps),
-            "-pix_fmt", "yuv420p",
             "-an",  # Sem áudio por enquanto
             str(saida_conteudo.resolve())
         ]
         
-        result = subprocess.run(cmd_alt, capture_output=True, text=True)
+        result = executar_ffmpeg(cmd_alt, rotulo="concat alternativo", execucao="efeito", check=False)
         if result.returncode == 0:
             print("✅ Concatenação alternativa bem-sucedida")
             return saida_conteudo
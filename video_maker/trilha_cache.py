@@ -0,0 +1,116 @@
+"""
+CACHE DE TRILHAS - música de fundo já decodificada, com ganho aplicado e loudness medido
+
+A mesma MUSICA_SHORT/MUSICA_LONG era decodificada e colocada em loop (aloop com buffer
+de 2e9 amostras) a cada roteiro. Agora cada trilha vira, uma vez, um PCM s16le estéreo
+na taxa da mixagem e com o ganho já aplicado; a mixagem lê esse PCM com -stream_loop -1
+e o amix (duration=first) para no fim da narração, então o custo da mixagem depende só
+da duração da narração.
+
+A medição de loudness (loudnorm, JSON) de cada trilha também fica em cache: com um alvo
+em LUFS o ganho passa a ser calculado por trilha, e trilhas diferentes ficam no mesmo
+nível sob a voz.
+"""
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from video_maker.cache_disco import CACHE_DIR, CacheDisco, chave_cache, hash_arquivo
+from video_maker.ffmpeg_runner import executar_ffmpeg
+
+# Incrementar se o formato do PCM mudar
+VERSAO_TRILHAS = 1
+TAXA_TRILHA = 48000
+CANAIS_TRILHA = 2
+
+_limite_mb = float(os.getenv("CACHE_TRILHAS_MAX_MB", "2048"))
+_cache = CacheDisco(CACHE_DIR / "trilhas", int(_limite_mb * 1024 ** 2), ".pcm")
+
+
+@dataclass
+class TrilhaDecodificada:
+    path: Path
+    ganho_db: float
+    loudness: dict = field(default_factory=dict)  # medição da trilha original (input_i, input_tp...)
+    taxa: int = TAXA_TRILHA
+    canais: int = CANAIS_TRILHA
+
+    def args_entrada(self) -> list:
+        """Entrada do ffmpeg em loop infinito (o amix com duration=first define o fim)"""
+        return ["-stream_loop", "-1", "-f", "s16le", "-ar", str(self.taxa),
+                "-ac", str(self.canais), "-i", str(self.path)]
+
+
+def medir_loudness(musica_path) -> dict:
+    """Medição EBU R128 da trilha (loudnorm print_format=json), em cache pelo conteúdo"""
+    arquivo = _cache.diretorio / f"{hash_arquivo(musica_path)}.loudness.json"
+    try:
+        return json.loads(arquivo.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner",
+        "-i", str(musica_path), "-vn",
+        "-af", "loudnorm=print_format=json",
+        "-f", "null", "-"
+    ]
+    result = executar_ffmpeg(cmd, rotulo="medir trilha", execucao="audio")
+    texto = result.stderr
+    try:
+        bruto = json.loads(texto[texto.rindex("{"):texto.rindex("}") + 1])
+        medida = {k: float(v) for k, v in bruto.items() if k.startswith("input_")}
+    except ValueError:
+        print(f"⚠️ Não foi possível medir o loudness de {Path(musica_path).name}")
+        return {}
+
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    temp = arquivo.with_name(f".{arquivo.name}.{uuid.uuid4().hex}.tmp")
+    temp.write_text(json.dumps(medida), encoding="utf-8")
+    os.replace(temp, arquivo)
+    return medida
+
+
+def obter_trilha(musica_path, ganho_db: float = -25, lufs_alvo: Optional[float] = None) -> TrilhaDecodificada:
+    """
+    Trilha pronta para a mixagem, decodificada uma única vez por (conteúdo, ganho).
+
+    Args:
+        ganho_db: ganho fixo da música (o mesmo volume=XdB de antes)
+        lufs_alvo: se informado, o ganho é calculado para a trilha ficar neste loudness
+            integrado (ex.: -40), usando a medição em cache
+    """
+    musica_path = Path(musica_path)
+    if not musica_path.exists():
+        raise FileNotFoundError(f"Música não encontrada: {musica_path}")
+
+    loudness = medir_loudness(musica_path)
+    if lufs_alvo is not None and "input_i" in loudness:
+        ganho_db = float(lufs_alvo) - loudness["input_i"]
+    ganho_db = round(float(ganho_db), 2)
+
+    chave = chave_cache(hash_arquivo(musica_path), ganho_db, TAXA_TRILHA, CANAIS_TRILHA, VERSAO_TRILHAS)
+    em_cache = _cache.obter(chave)
+    if em_cache:
+        return TrilhaDecodificada(em_cache, ganho_db, loudness)
+
+    print(f"🎼 Decodificando trilha {musica_path.name} ({ganho_db:+.1f} dB) para o cache...")
+    _cache.diretorio.mkdir(parents=True, exist_ok=True)
+    temp = _cache.diretorio / f".{chave}.{uuid.uuid4().hex}.decod"
+    cmd = [
+        "ffmpeg", "-nostdin", "-y", "-hide_banner", "-loglevel", "error",
+        "-i", str(musica_path), "-vn",
+        "-af", f"volume={ganho_db}dB",
+        "-ac", str(CANAIS_TRILHA), "-ar", str(TAXA_TRILHA),
+        "-f", "s16le", "-c:a", "pcm_s16le",
+        str(temp)
+    ]
+    try:
+        executar_ffmpeg(cmd, rotulo="decodificar trilha", execucao="audio")
+        destino = _cache.guardar(chave, temp, mover=True)
+    finally:
+        temp.unlink(missing_ok=True)
+    return TrilhaDecodificada(destino, ganho_db, loudness)
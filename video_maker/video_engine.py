@@ -1,23 +1,62 @@
 # video_maker/video_engine.py
 
-import sys
-import os
-import inspect
+import importlib
+
+from .cache_clipes import clipe_em_cache
 
 # Factory de efeitos
+# nome -> função já importada ou "modulo:funcao" (importado no primeiro uso)
 _efeitos_registry = {}
+_efeitos_com_tamanho = set()  # efeitos que renderizam direto no tamanho do template
 _templates_registry = {}  # NOVO: Registry para templates
 
-def registrar_efeito(nome, funcao):
-    """Registra um efeito no factory"""
+def registrar_efeito(nome, funcao, recebe_tamanho=False):
+    """
+    Registra um efeito no factory
+
+    Args:
+        funcao: a função do efeito, ou o caminho "modulo:funcao" para importar só
+            quando o efeito for usado (evita carregar cv2/numpy/torch na inicialização)
+        recebe_tamanho: a função aceita largura/altura (aplicar_efeito repassa o
+            tamanho de saída do template)
+    """
     _efeitos_registry[nome] = funcao
+    if recebe_tamanho:
+        _efeitos_com_tamanho.add(nome)
+    else:
+        _efeitos_com_tamanho.discard(nome)
 
-def aplicar_efeito(nome_efeito, imagem_path, duracao):
-    """Aplica um efeito usando o factory - versão simples compatível"""
+def obter_efeito(nome_efeito):
+    """Retorna a função do efeito, importando o módulo na primeira chamada"""
     if nome_efeito not in _efeitos_registry:
         raise ValueError(f"Efeito '{nome_efeito}' não encontrado. Efeitos disponíveis: {list(_efeitos_registry.keys())}")
-    
-    return _efeitos_registry[nome_efeito](imagem_path, duracao)
+
+    funcao = _efeitos_registry[nome_efeito]
+    if isinstance(funcao, str):
+        modulo_path, nome_funcao = funcao.split(':')
+        try:
+            modulo = importlib.import_module(modulo_path)
+        except ImportError as e:
+            raise ImportError(f"Não foi possível carregar o efeito '{nome_efeito}' ({modulo_path}): {e}") from e
+        funcao = getattr(modulo, nome_funcao)
+        _efeitos_registry[nome_efeito] = funcao
+    return funcao
+
+def aplicar_efeito(nome_efeito, imagem_path, duracao, usar_cache=True, largura=None, altura=None):
+    """
+    Aplica um efeito usando o factory - reutiliza o cache de clipes quando possível
+
+    largura/altura: tamanho de saída do template, repassado aos efeitos registrados
+    com recebe_tamanho (os demais já geram no tamanho fixo deles)
+    """
+    funcao = obter_efeito(nome_efeito)
+    tamanho = {}
+    if nome_efeito in _efeitos_com_tamanho and largura and altura:
+        tamanho = {"largura": int(largura), "altura": int(altura)}
+    if not usar_cache:
+        return funcao(imagem_path, duracao, **tamanho)
+    return clipe_em_cache(nome_efeito, imagem_path, duracao,
+                          lambda: funcao(imagem_path, duracao, **tamanho), **tamanho)
 
 def listar_efeitos():
     """Lista todos os efeitos disponíveis"""
@@ -41,74 +80,17 @@ def listar_templates():
     """Lista todos os templates disponíveis"""
     return list(_templates_registry.keys())
 
-# Registrar efeitos disponíveis (usando os nomes das funções originais)
-try:
-    from .efeitos.camera_instavel import criar_video_camera_instavel
-    registrar_efeito('camera_instavel', criar_video_camera_instavel)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar camera_instavel: {e}")
-
-try:
-    from .efeitos.pan import criar_video_pan
-    registrar_efeito('pan', criar_video_pan)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar pan: {e}")
-
-try:
-    from .efeitos.depth_3d import criar_video_depth_3d
-    registrar_efeito('depth_3d', criar_video_depth_3d)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar depth_3d: {e}")
-
-try:
-    from .efeitos.panoramica_vertical import criar_video_panoramica_vertical
-    registrar_efeito('panoramica_vertical', criar_video_panoramica_vertical)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar panoramica_vertical: {e}")
-
-try:
-    from .efeitos.zoom_invertido import criar_video_zoom_invertido
-    registrar_efeito('zoom_invertido', criar_video_zoom_invertido)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar zoom_invertido: {e}")
-
-try:
-    from .efeitos.zoom_pulse import criar_video_pulse
-    registrar_efeito('zoom_pulse', criar_video_pulse)
-except ImportError as e:
-    print(f"⚠️ Não foi possível registrar zoom_pulse: {e}")
-
-# NOVO: Registrar templates disponíveis
-try:
-    registrar_template('short_filosofia', 'video_maker.templates.short_filosofia')
-    print("✅ Template short_filosofia registrado")
-except Exception as e:
-    print(f"⚠️ Não foi possível registrar short_filosofia: {e}")
-
-try:
-    registrar_template('short_sequencial', 'video_maker.templates.short_sequencial')
-    print("✅ Template short_sequencial registrado")
-except Exception as e:
-    print(f"⚠️ Não foi possível registrar short_sequencial: {e}")
-
-
-try:
-    registrar_template('long_estatico', 'video_maker.templates.long_estatico')
-    print("✅ Template long_estatico registrado")
-except Exception as e:
-    print(f"⚠️ Não foi possível registrar long_filosofia: {e}")
-
-
-try:
-    registrar_template('long_filosofia', 'video_maker.templates.long_filosofia')
-    print("✅ Template long_filosofia registrado")
-except Exception as e:
-    print(f"⚠️ Não foi possível registrar long_filosofia: {e}")
-
-try:
-    registrar_template('long_religioso', 'video_maker.templates.long_religioso')
-    print("✅ Template long_religioso registrado")
-except Exception as e:
-    print(f"⚠️ Não foi possível registrar long_filosofia: {e}")
-
-print(f"✅ Video Engine carregada com {len(_efeitos_registry)} efeitos e {len(_templates_registry)} templates")
\ No newline at end of file
+# Registrar efeitos disponíveis (importados só no primeiro uso)
+registrar_efeito('camera_instavel', 'video_maker.efeitos.camera_instavel:criar_video_camera_instavel')
+registrar_efeito('pan', 'video_maker.efeitos.pan:criar_video_pan')
+registrar_efeito('depth_3d', 'video_maker.efeitos.depth_3d:criar_video_depth_3d', recebe_tamanho=True)
+registrar_efeito('panoramica_vertical', 'video_maker.efeitos.panoramica_vertical:criar_video_panoramica_vertical')
+registrar_efeito('zoom_invertido', 'video_maker.efeitos.zoom_invertido:criar_video_zoom_invertido')
+registrar_efeito('zoom_pulse', 'video_maker.efeitos.zoom_pulse:criar_video_pulse')
+
+# NOVO: Registrar templates disponíveis (módulo importado em obter_template)
+registrar_template('short_filosofia', 'video_maker.templates.short_filosofia')
+registrar_template('short_sequencial', 'video_maker.templates.short_sequencial')
+registrar_template('long_estatico', 'video_maker.templates.long_estatico')
+registrar_template('long_filosofia', 'video_maker.templates.long_filosofia')
+registrar_template('long_religioso', 'video_maker.templates.long_religioso')
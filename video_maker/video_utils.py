@@ -8,6 +8,13 @@ from pathlib import Path
 from typing import Any, Dict
 from PIL import Image, ImageDraw, ImageFont
 
+from video_maker.encoder_profiles import INTERMEDIARIO
+from video_maker.ffmpeg_runner import executar_ffmpeg
+from video_maker.media_info import obter_duracao
+from video_maker.render_context import contexto_atual, pasta_temp
+from video_maker.render_paralelo import args_threads
+from video_maker.trilha_cache import obter_trilha
+
 # =============================================================================
 # FUNÇÕES DE ARQUIVO E SISTEMA
 # =============================================================================
@@ -33,10 +40,14 @@ def safe_move(src, dst):
     shutil.move(str(src), str(dst))
 
 def preparar_diretorios_trabalho(output_dir):
-    """Prepara diretórios de trabalho e retorna paths"""
+    """Prepara diretórios de trabalho e retorna paths (temp exclusivo do job dentro de um contexto_render)"""
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    contexto = contexto_atual()
+    if contexto:
+        return output_dir, contexto.subpasta("template")
+    
     temp_dir = output_dir / "temp"
     if temp_dir.exists():
         shutil.rmtree(temp_dir)
@@ -62,17 +73,8 @@ def get_media_duration(path):
         path = Path(path)
         if not path.exists():
             return 0.0
-            
-        resultado = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-             "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-        )
-        if resultado.returncode != 0:
-            return 0.0
-            
-        duration = resultado.stdout.strip()
-        return float(duration) if duration else 0.0
+        # cache persistente por caminho + tamanho + mtime
+        return obter_duracao(path)
             
     except Exception as e:
         print(f"Erro ao obter duração de {path}: {e}")
@@ -155,13 +157,11 @@ def criar_frame_estatico(imagem_path: Path, duracao: float, output_path: Path):
         "-t", str(duracao),
         "-r", "30",
         "-vf", "scale=720:1280:force_original_aspect_ratio=decrease:flags=lanczos,pad=720:1280:(ow-iw)/2:(oh-ih)/2:color=black",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", "21",
-        "-pix_fmt", "yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         str(output_path)
     ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    executar_ffmpeg(cmd, duracao=duracao, rotulo="frame_estatico", execucao="efeito")
     return output_path
 
 def criar_frame_estatico_long(imagem_path: Path, duracao: float, output_path: Path):
@@ -173,13 +173,11 @@ def criar_frame_estatico_long(imagem_path: Path, duracao: float, output_path: Pa
         "-t", str(duracao),
         "-r", "30",
         "-vf", "scale=1280:720:force_original_aspect_ratio=decrease:flags=lanczos,pad=1280:720:(ow-iw)/2:(oh-ih)/2:color=black",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", "21",
-        "-pix_fmt", "yuv420p",
+        *INTERMEDIARIO.args(),
+        *args_threads(),
         str(output_path)
     ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    executar_ffmpeg(cmd, duracao=duracao, rotulo="frame_estatico", execucao="efeito")
     return output_path
 
 
@@ -189,24 +187,22 @@ def normalizar_duracao(in_path, target_s, fps=30):
     if not in_path.exists():
         return None
     
-    out_path = in_path.with_name(in_path.stem + "_norm.mp4")
+    out_path = in_path.with_name(in_path.stem + "_norm" + INTERMEDIARIO.extensao)
     
     cmd = [
         "ffmpeg", "-y",
         "-i", str(in_path),
         "-t", f"{target_s:.3f}",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", "21",
-        "-pix_fmt", "yuv420p",
+        *INTERMEDIARIO.args(),
         "-r", str(fps),
+        *args_threads(),
         str(out_path)
     ]
     
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        executar_ffmpeg(cmd, duracao=target_s, rotulo="normalizar", execucao="efeito")
         return str(out_path)
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         return None
 
 # =============================================================================
@@ -278,7 +274,7 @@ def gerar_capa_pillow(imagem_path, texto, output_path, largura=720, altura=1280)
 def gerar_capa(imagem, titulo, output_path=None, largura=720, altura=1280, cor_texto="#6B10D3", cor_borda="#FFFFFF"):
     """Gera capa com fonte específica usando FFmpeg"""
     if output_path is None:
-        saida = Path("capa.png")
+        saida = pasta_temp() / "capa.png"
     else:
         saida = Path(output_path)
     
@@ -302,12 +298,12 @@ def gerar_capa(imagem, titulo, output_path=None, largura=720, altura=1280, cor_t
         "-update", "1",
         str(saida)
     ]
-    subprocess.run(cmd, check=True, capture_output=True)
+    executar_ffmpeg(cmd, rotulo="capa", execucao="efeito")
     return saida
 
 def gerarCapaPNG(imagem, titulo, w=720, h=1280, usar_fontfile=False, fontfile_path=r"C:\Windows\Fonts\Montserrat-Black.ttf"):
     """Gera capa PNG com opções de fonte"""
-    saida = Path("capa.png")
+    saida = pasta_temp() / "capa.png"
     cor_titulo = "#6B10D3"
     cor_borda = "#FFFFFF"
     txt = str(titulo).replace("\\", "\\\\").replace(":", r"\:").replace("'", r"\'")
@@ -321,7 +317,7 @@ def gerarCapaPNG(imagem, titulo, w=720, h=1280, usar_fontfile=False, fontfile_pa
         f"x=(w-text_w)/2:y=(h-text_h)/2-50"
     )
     comando = ["ffmpeg", "-y", "-i", str(imagem), "-vf", vf, "-frames:v", "1", "-update", "1", str(saida)]
-    subprocess.run(comando, check=True)
+    executar_ffmpeg(comando, rotulo="capa", execucao="efeito")
     return saida
 
 # =============================================================================
@@ -340,14 +336,15 @@ def mixar_audio_com_musica(audio_voz, musica_path, ganho_musica=-19):
 
     saida = audio_path.with_name(f"{audio_path.stem}_com_musica.mp3")
     
+    # trilha pré-decodificada com o ganho aplicado, em loop pela entrada (trilha_cache)
+    trilha = obter_trilha(musica, ganho_musica)
     cmd = [
         "ffmpeg", "-y",
         "-i", str(audio_path),
-        "-i", str(musica),
+        *trilha.args_entrada(),
         "-filter_complex",
         f"[0:a]volume=0dB[a0];"
-        f"[1:a]volume={ganho_musica}dB,aloop=loop=-1:size=2e+09[a1];"
-        f"[a0][a1]amix=inputs=2:duration=first:dropout_transition=2,"
+        f"[a0][1:a]amix=inputs=2:duration=first:dropout_transition=2,"
         f"dynaudnorm=f=250:g=3[a]",
         "-map", "[a]",
         "-c:a", "libmp3lame",
@@ -356,7 +353,7 @@ def mixar_audio_com_musica(audio_voz, musica_path, ganho_musica=-19):
         str(saida)
     ]
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    executar_ffmpeg(cmd, rotulo="mix_musica", execucao="audio")
     return saida
 
 def mixar_audio_voz_trilha(audio_voz, trilha_path, ganho_voz=0, ganho_musica=-15):
@@ -395,7 +392,7 @@ def mixar_audio_voz_trilha(audio_voz, trilha_path, ganho_voz=0, ganho_musica=-15
     ]
 
     print(f"🎧 Mixando: {audio_path.name} + {trilha.name}")
-    subprocess.run(cmd, check=True)
+    executar_ffmpeg(cmd, rotulo="mix_trilha", execucao="audio")
     print(f"✅ Áudio mixado salvo em: {saida}")
     return saida
 